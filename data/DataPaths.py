@@ -0,0 +1,16 @@
+from pathlib import Path
+
+# Data files shared by the API (app_render) and the refresh worker (RefreshWorker)
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+EVENT_CSV = REPO_ROOT / "resources" / "initial_data" / "events.csv"
+EVENT_INFO_CSV = REPO_ROOT / "resources" / "initial_data" / "events-info.csv"
+FIGHT_CSV = REPO_ROOT / "resources" / "initial_data" / "fights.csv"
+FIGHTER_ALIAS_CSV = REPO_ROOT / "resources" / "initial_data" / "fighter-aliases.csv"
+REFRESH_WATERMARK_JSON = REPO_ROOT / "resources" / "initial_data" / "refresh-watermark.json"
+REFRESH_REPORT_JSON = REPO_ROOT / "resources" / "initial_data" / "refresh-report.json"
+REFRESH_REQUEST_JSON = REPO_ROOT / "resources" / "initial_data" / "refresh-request.json"
+UPCOMING_CARDS_CSV = REPO_ROOT / "resources" / "initial_data" / "upcoming-cards.csv"
+DATA_VERSION_JSON = REPO_ROOT / "resources" / "initial_data" / "data-version.json"
+ODDS_DIR = REPO_ROOT / "resources" / "odds"
+FIGHTER_VECTORS_CSV = REPO_ROOT / "resources" / "fighter_vectors" / "fighter_vectors_all.csv"
@@ -0,0 +1,151 @@
+import csv
+import io
+import os
+import threading
+from typing import Dict, List
+
+from cache.DataVersion import DataVersion
+from cache.EventCache import EventCache
+from cache.EventInfoCache import EventInfoCache
+from cache.FightCache import FightCache
+from cache.FightIndex import FightIndex, field_of
+from cache.UpcomingCardCache import UpcomingCardCache
+from FighterIdentityService import FighterIdentityService
+from RatingService import RatingService
+
+
+class DataReloader:
+    """
+    Keeps the API's in-memory caches current while the refresh jobs run in a
+    separate worker process.
+
+    A daemon thread polls the shared DataVersion. When the worker bumps it,
+    only the bytes appended to each CSV since the last read are parsed and
+    applied through the same incremental updates the refresh used to make
+    in-process, so a refresh never triggers a full reload on the API side.
+    Rows already in memory (e.g. saved by an in-process /refresh) are skipped.
+    """
+
+    POLL_SECONDS = 5.0
+
+    def __init__(self,
+                 data_version: DataVersion,
+                 event_cache: EventCache,
+                 event_info_cache: EventInfoCache,
+                 fight_cache: FightCache,
+                 fight_index: FightIndex,
+                 fighter_identity: FighterIdentityService,
+                 rating_service: RatingService,
+                 upcoming_cards: UpcomingCardCache = None,
+                 poll_seconds: float = POLL_SECONDS):
+        self.data_version = data_version
+        self.event_cache = event_cache
+        self.event_info_cache = event_info_cache
+        self.fight_cache = fight_cache
+        self.fight_index = fight_index
+        self.fighter_identity = fighter_identity
+        self.rating_service = rating_service
+        self.upcoming_cards = upcoming_cards
+        self.poll_seconds = poll_seconds
+        # Offsets are taken before the caches load, so rows appended in between are
+        # read twice rather than missed; applying a row twice is a no-op
+        paths = [event_cache.csv_path, event_info_cache.csv_path, fight_cache.csv_path]
+        if upcoming_cards is not None:
+            paths.append(upcoming_cards.csv_path)
+        self._offsets: Dict[str, int] = {path: self._size(path) for path in paths}
+        self._version = data_version.read()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="data-reloader", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_seconds + 1)
+            self._thread = None
+
+    def poll(self) -> Dict[str, int]:
+        """Apply new rows if the worker has bumped the data version; returns rows applied per file."""
+        version = self.data_version.read()
+        if version == self._version:
+            return {}
+        applied = {
+            "events": self._applyEvents(self._tail(self.event_cache.csv_path)),
+            "eventInfo": self._applyEventInfo(self._tail(self.event_info_cache.csv_path)),
+            "fights": self._applyFights(self._tail(self.fight_cache.csv_path)),
+        }
+        if self.upcoming_cards is not None and self._tail(self.upcoming_cards.csv_path):
+            # A handful of rows; cheaper to reload lazily than to merge snapshots
+            self.upcoming_cards.clear()
+        self._version = version
+        print(f"Data version {version}: applied {applied}")
+        return applied
+
+    # -------- helpers --------
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.poll_seconds):
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"Could not apply refreshed data, will retry: {e}")
+
+    def _applyEvents(self, rows: List[Dict]) -> int:
+        for row in rows:
+            self.event_cache.upsert(row)
+            self.fight_index.add_event(row)
+        return len(rows)
+
+    def _applyEventInfo(self, rows: List[Dict]) -> int:
+        applied = 0
+        for row in rows:
+            info = EventInfoCache._row_to_info(row)
+            if not info.fight_id or any(field_of(i, "fight_id") == info.fight_id for i in self.event_info_cache.get_event(info.event_id)):
+                continue
+            self.event_info_cache.upsert_line(info)
+            self.fight_index.add_event_info(info)
+            applied += 1
+        return applied
+
+    def _applyFights(self, rows: List[Dict]) -> int:
+        by_fight: Dict[str, list] = {}
+        for row in rows:
+            line = FightCache._row_to_line(row)
+            by_fight.setdefault(line.fight_id, []).append(line)
+        applied = 0
+        for fight_id, lines in by_fight.items():
+            if not fight_id or self.fight_cache.hasFight(fight_id):
+                continue
+            for line in lines:
+                self.fight_cache.upsert_line(line)
+                self.fighter_identity.learn(line.fighter_id, line.fighter)
+            self.fight_index.add_fight_lines(lines)
+            self.rating_service.apply_fight(fight_id)
+            applied += 1
+        return applied
+
+    def _tail(self, path: str) -> List[Dict]:
+        # Rows appended since the last read; a partly written last line waits for the next poll
+        offset = self._offsets.get(path, 0)
+        if self._size(path) <= offset:
+            return []
+        with open(path, "rb") as f:
+            header = f.readline().decode("utf-8")
+            f.seek(max(offset, f.tell()))
+            chunk = f.read()
+        complete = chunk[:chunk.rfind(b"\n") + 1]
+        self._offsets[path] = max(offset, len(header.encode("utf-8"))) + len(complete)
+        fieldnames = next(csv.reader([header]))
+        return list(csv.DictReader(io.StringIO(complete.decode("utf-8"), newline=""), fieldnames=fieldnames))
+
+    @staticmethod
+    def _size(path: str) -> int:
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return 0
@@ -0,0 +1,180 @@
+from __future__ import annotations
+import os
+from pathlib import Path
+from threading import RLock
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+
+from clean.features import FIGHTER_VECTOR_FEATURES
+
+DEFAULT_VECTORS_CSV = Path(__file__).resolve().parent.parent / "resources" / "fighter_vectors" / "fighter_vectors_all.csv"
+
+METRICS = FIGHTER_VECTOR_FEATURES + ["win_rate", "current_streak"]
+METRIC_ALIASES = {"streak": "current_streak"}
+# Percentiles also cover experience, which is a filter rather than a leaderboard metric
+PERCENTILE_METRICS = METRICS + ["total_fights"]
+
+
+def division_key(weight_class: str) -> str:
+    # "Women's Strawweight" and "womens-strawweight" share one key
+    return str(weight_class or "").strip().lower().replace("'", "").replace(" ", "-")
+
+
+class _Division:
+    # Column arrays for one weight class plus, per metric, the row order from best
+    # to worst and the ascending sorted values used for percentile ranks
+    def __init__(self, name: str, frame: pd.DataFrame):
+        self.name = name
+        self.fighter_ids = frame["fighter_id"].to_numpy(dtype=object)
+        self.fighters = frame["fighter"].to_numpy(dtype=object)
+        self.total_fights = frame["total_fights"].to_numpy(dtype=np.int64)
+        self.values: Dict[str, np.ndarray] = {}
+        self.order: Dict[str, np.ndarray] = {}
+        self.sorted: Dict[str, np.ndarray] = {}
+        for metric in PERCENTILE_METRICS:
+            values = pd.to_numeric(frame[metric], errors="coerce").to_numpy(dtype=np.float64)
+            ranked = np.flatnonzero(~np.isnan(values))
+            # Stable descending sort so ties keep the CSV (alphabetical) order
+            self.order[metric] = ranked[np.argsort(-values[ranked], kind="stable")]
+            self.sorted[metric] = values[self.order[metric]][::-1].copy()
+            self.values[metric] = values
+        self.rows = {fighter_id: i for i, fighter_id in enumerate(self.fighter_ids)}
+
+    def percentile(self, metric: str, value: float) -> Optional[float]:
+        # Mid-rank percentile: ties count half, so a division of equal values sits at 50
+        ranked = self.sorted[metric]
+        if np.isnan(value) or len(ranked) == 0:
+            return None
+        below = np.searchsorted(ranked, value, side="left")
+        at_or_below = np.searchsorted(ranked, value, side="right")
+        return float(100.0 * (below + at_or_below) / (2 * len(ranked)))
+
+
+class DivisionStatsService:
+    """
+    Per-weight-class views over the latest fighter vectors.
+
+    Each division holds its rows as arrays and, per metric, an index array
+    pre-sorted best-first, so a leaderboard is a walk over the head of that
+    array instead of a sort of the whole frame, and a percentile rank is two
+    searchsorted calls on the ascending values. When the vectors CSV is
+    rewritten only divisions whose rows changed are rebuilt.
+    """
+
+    def __init__(self, vectors_csv: str = str(DEFAULT_VECTORS_CSV)):
+        self.vectors_csv = vectors_csv
+        self._lock = RLock()
+        self._mtime: Optional[float] = None
+        self._hashes: Dict[str, bytes] = {}
+        self._divisions: Dict[str, _Division] = {}
+        self._fighter_divisions: Dict[str, str] = {}
+
+    def load(self) -> None:
+        """(Re)read the vectors CSV if it changed on disk since the last read."""
+        with self._lock:
+            try:
+                mtime = os.path.getmtime(self.vectors_csv)
+            except OSError:
+                return
+            if mtime == self._mtime:
+                return
+            self._mtime = mtime
+            self._set_frame(pd.read_csv(self.vectors_csv))
+
+    # ---- Lookups ----
+
+    @staticmethod
+    def metric_of(metric: str) -> Optional[str]:
+        metric = METRIC_ALIASES.get(metric, metric)
+        return metric if metric in METRICS else None
+
+    def divisions(self) -> List[str]:
+        self.load()
+        with self._lock:
+            return sorted(d.name for d in self._divisions.values())
+
+    def leaderboard(self, weight_class: str, metric: str, n: int = 25, min_fights: int = 0) -> Optional[dict]:
+        """
+        Top `n` fighters in a division by `metric`, skipping fighters with fewer
+        than `min_fights` fights. Returns None for an unknown division.
+        """
+        column = self.metric_of(metric)
+        if column is None:
+            raise ValueError(f"Unknown metric '{metric}'")
+        self.load()
+        with self._lock:
+            division = self._divisions.get(division_key(weight_class))
+        if division is None:
+            return None
+
+        order = division.order[column]
+        order = order[division.total_fights[order] >= min_fights][:n]
+        values = division.values[column]
+        return {
+            "weight_class": division.name,
+            "metric": column,
+            "min_fights": min_fights,
+            "fighters": [
+                {
+                    "rank": rank,
+                    "fighter_id": division.fighter_ids[i],
+                    "fighter": division.fighters[i],
+                    "value": float(values[i]),
+                    "total_fights": int(division.total_fights[i]),
+                }
+                for rank, i in enumerate(order, start=1)
+            ],
+        }
+
+    def percentiles(self, fighter_id: str, weight_class: str = None) -> Optional[dict]:
+        """
+        The fighter's percentile rank (0-100) for every vector feature within their
+        division, or within `weight_class` when given. Returns None for an unknown
+        fighter or division.
+        """
+        self.load()
+        with self._lock:
+            home = self._divisions.get(self._fighter_divisions.get(fighter_id))
+            division = self._divisions.get(division_key(weight_class)) if weight_class else home
+        if home is None or division is None:
+            return None
+
+        row = home.rows[fighter_id]
+        return {
+            "fighter_id": fighter_id,
+            "fighter": home.fighters[row],
+            "weight_class": division.name,
+            "division_size": len(division.fighter_ids),
+            "values": {m: _scalar(home.values[m][row]) for m in PERCENTILE_METRICS},
+            "percentiles": {m: division.percentile(m, home.values[m][row]) for m in PERCENTILE_METRICS},
+        }
+
+    # -------- helpers --------
+
+    def _set_frame(self, frame: pd.DataFrame) -> None:
+        frame = frame.dropna(subset=["fighter_id", "weight_class"]).reset_index(drop=True)
+        keys = frame["weight_class"].map(division_key)
+        row_hashes = pd.util.hash_pandas_object(frame, index=False).to_numpy()
+
+        hashes: Dict[str, bytes] = {}
+        divisions: Dict[str, _Division] = {}
+        for key, rows in frame.groupby(keys, sort=False).indices.items():
+            hashes[key] = np.sort(row_hashes[rows]).tobytes()
+            if hashes[key] == self._hashes.get(key) and key in self._divisions:
+                divisions[key] = self._divisions[key]
+            else:
+                divisions[key] = _Division(frame["weight_class"].iat[rows[0]], frame.iloc[rows])
+
+        rebuilt = [d.name for k, d in divisions.items() if d is not self._divisions.get(k)]
+        if rebuilt:
+            print(f"Rebuilt division stats for: {', '.join(sorted(rebuilt))}")
+        self._hashes = hashes
+        self._divisions = divisions
+        self._fighter_divisions = {
+            fighter_id: key for key, d in divisions.items() for fighter_id in d.fighter_ids
+        }
+
+
+def _scalar(value: float) -> Optional[float]:
+    return None if np.isnan(value) else float(value)
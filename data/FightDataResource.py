@@ -1,33 +1,75 @@
 from fastapi import FastAPI, HTTPException, Query
+from fastapi.responses import JSONResponse
 import uvicorn
 from clean.fighter_vectors import latest_vectors
 from FightDataService import FightDataService
-from RefreshDataService import RefreshDataService
+from RefreshDataService import ODDS_SAMPLE_MINUTES, RefreshDataService
+from DataReloader import DataReloader
+from cache.RefreshRequest import RefreshRequest
 
 from contextlib import asynccontextmanager
 from apscheduler.schedulers.background import BackgroundScheduler
 import datetime
 import os
+import subprocess
+import sys
+from dataclasses import asdict
+from pathlib import Path
+
+REFRESH_WORKER = Path(__file__).resolve().parent / "RefreshWorker.py"
 
 class FightDataResource:
 
-    def __init__(self, fightDataService: FightDataService, refreshDataService: RefreshDataService, enable_background_refresh: bool = True):
+    def __init__(self, fightDataService: FightDataService, refreshDataService: RefreshDataService, enable_background_refresh: bool = True, dataReloader: DataReloader = None, refreshRequest: RefreshRequest = None):
         self.fightDataService = fightDataService
         self.refreshDataService = refreshDataService
+        self.dataReloader = dataReloader
+        self.refreshRequest = refreshRequest
+        # Manage refresh lifecycle when background refresh is enabled.
+        #   REFRESH_MODE=process  (default) run the jobs in a RefreshWorker subprocess
+        #   REFRESH_MODE=external a RefreshWorker runs elsewhere; only pick up its data
+        #   REFRESH_MODE=inline   run the jobs on a scheduler thread inside the API
+        self.refreshMode = os.getenv("REFRESH_MODE", "process").lower() if enable_background_refresh else "inline"
+        self.refreshWorker = None
 
         if enable_background_refresh:
-            # Manage scheduler lifecycle when background refresh is enabled.
             @asynccontextmanager
             async def lifespan(app: FastAPI):
-                scheduler = BackgroundScheduler()
+                refresh_mode = self.refreshMode
                 # Control whether to run refresh jobs immediately using env var REFRESH_ON_START
                 refresh_on_start = os.getenv("REFRESH_ON_START", "true").lower() in ("1", "true", "yes")
-                if refresh_on_start:
-                    scheduler.add_job(refreshDataService.refreshFightData, 'interval', hours=1, next_run_time=datetime.datetime.now())
-                    scheduler.add_job(refreshDataService.reloadIncompleteData, 'interval', hours=24, next_run_time=datetime.datetime.now())
-                scheduler.start()
+                scheduler = None
+                worker = None
+                if refresh_mode == "inline":
+                    scheduler = BackgroundScheduler()
+                    if refresh_on_start:
+                        scheduler.add_job(refreshDataService.refreshFightData, 'interval', hours=1, next_run_time=datetime.datetime.now())
+                        scheduler.add_job(refreshDataService.reloadIncompleteData, 'interval', hours=24, next_run_time=datetime.datetime.now())
+                        # Upcoming cards change as bouts are added or fall through; event pages are cached for 6 hours
+                        scheduler.add_job(refreshDataService.refreshUpcomingCards, 'interval', hours=6, next_run_time=datetime.datetime.now())
+                        scheduler.add_job(refreshDataService.recordOdds, 'interval', minutes=ODDS_SAMPLE_MINUTES, next_run_time=datetime.datetime.now())
+                        scheduler.add_job(refreshDataService.downsampleOdds, 'interval', hours=24)
+                    scheduler.start()
+                else:
+                    if refresh_mode == "process" and refresh_on_start:
+                        # Scraping and CSV writes happen in the worker, off the request-serving GIL
+                        worker = subprocess.Popen([sys.executable, str(REFRESH_WORKER)], cwd=str(REFRESH_WORKER.parent))
+                        print(f"Started refresh worker (pid {worker.pid})")
+                        self.refreshWorker = worker
+                    if self.dataReloader is not None:
+                        self.dataReloader.start()
                 yield
-                scheduler.shutdown()
+                self.refreshWorker = None
+                if scheduler is not None:
+                    scheduler.shutdown()
+                if self.dataReloader is not None:
+                    self.dataReloader.stop()
+                if worker is not None:
+                    worker.terminate()
+                    try:
+                        worker.wait(timeout=10)
+                    except subprocess.TimeoutExpired:
+                        worker.kill()
 
             self.app = FastAPI(title="UFC Fight Data API", lifespan=lifespan)
         else:
@@ -45,6 +87,13 @@ class FightDataResource:
         )
         print(f"Starting FightDataResource on 0.0.0.0:8000")
 
+    def _hasRefreshWorker(self) -> bool:
+        # Without a live worker (process mode with REFRESH_ON_START=false, or the worker
+        # exited) a queued request would never be picked up, so /refresh runs inline
+        if self.refreshMode == "external":
+            return True
+        return self.refreshMode == "process" and self.refreshWorker is not None and self.refreshWorker.poll() is None
+
     def _registerEndpoints(self):
 
         @self.app.get("/")
@@ -60,7 +109,19 @@ class FightDataResource:
             enable_scraping = os.getenv("ENABLE_SCRAPING", "true").lower() in ("1", "true", "yes")
             if not enable_scraping:
                 raise HTTPException(status_code=403, detail="Scraping disabled (ENABLE_SCRAPING=false). Refresh disallowed.")
+            if self.refreshRequest is not None and self._hasRefreshWorker():
+                # The worker owns scraping and the CSV writes; the DataReloader picks up its rows
+                request = self.refreshRequest.request("api")
+                return JSONResponse(status_code=202, content={"status": "queued", **request})
             return self.refreshDataService.refreshFightData()
+
+        @self.app.get("/refresh/report")
+        def get_refresh_report():
+            # What the last reconciliation run examined and fetched, here or in the refresh worker
+            report = self.refreshDataService.lastReport()
+            if report is None:
+                raise HTTPException(status_code=404, detail="No reconciliation report has been written yet.")
+            return asdict(report)
         
         @self.app.get("/latest")
         def get_latest_fights():
@@ -79,6 +140,22 @@ class FightDataResource:
         def get_fighter_metadata(fighter_id: str):
             return self.fightDataService.getFighterMetadata(fighter_id)
 
+        @self.app.get("/rating/{fighter_id}")
+        def get_fighter_rating(fighter_id: str, as_of: str = Query(None, description="YYYY-MM-DD; rating going into this date"), history: bool = False):
+            return self.fightDataService.getFighterRating(fighter_id, as_of, history)
+
+        @self.app.get("/odds/history")
+        def get_odds_history(fighter_id: str = None, event_id: str = None, start: str = Query(None, description="YYYY-MM-DD, inclusive"), end: str = Query(None, description="YYYY-MM-DD, exclusive")):
+            return self.fightDataService.getOddsHistory(fighter_id, event_id, start, end)
+
+        @self.app.get("/leaderboard/{weight_class}")
+        def get_leaderboard(weight_class: str, metric: str = "sig_str_per_min", n: int = Query(25, ge=1, le=500), min_fights: int = Query(0, ge=0)):
+            return self.fightDataService.getLeaderboard(weight_class, metric, n, min_fights)
+
+        @self.app.get("/percentile/{fighter_id}")
+        def get_fighter_percentiles(fighter_id: str, weight_class: str = Query(None, description="Compare against another division instead of the fighter's own")):
+            return self.fightDataService.getPercentiles(fighter_id, weight_class)
+
         @self.app.get("/fights/{name}")
         def get_fights_by_fighter(name: str):
             return self.fightDataService.get_fights_by_fighter(name)
@@ -1,22 +1,36 @@
 import pandas as pd
 from dataclasses import asdict, is_dataclass
-from datetime import datetime
+from datetime import datetime, timezone
 
 from fastapi import HTTPException
 
 from cache.EventCache import EventCache
 from cache.EventInfoCache import EventInfoCache
 from cache.FightCache import FightCache
+from cache.FightIndex import FightIndex
+from cache.NameUtil import normalize_name
+from cache.OddsStore import OddsStore
+from cache.UpcomingCardCache import UpcomingCardCache
+from FighterIdentityService import FighterIdentityService
+from RatingService import RatingService
+from DivisionStatsService import DivisionStatsService
 from scrapers.EventInfoScraper import scrapeEventInfo
-from clients.KalshiClient import KalshiClient
+from clients.KalshiClient import KalshiClient, OddsSnapshot
 
 class FightDataService:
 
-    def __init__(self, eventCache: EventCache, eventInfoCache: EventInfoCache, fightCache: FightCache):
+    def __init__(self, eventCache: EventCache, eventInfoCache: EventInfoCache, fightCache: FightCache, fightIndex: FightIndex = None, fighterIdentity: FighterIdentityService = None, ratingService: RatingService = None, divisionStats: DivisionStatsService = None, upcomingCards: UpcomingCardCache = None, kalshiClient: KalshiClient = None, oddsStore: OddsStore = None):
         self.eventCache = eventCache
         self.eventInfoCache = eventInfoCache
         self.fightCache = fightCache
-        self.kalshiClient = KalshiClient()
+        self.fightIndex = fightIndex or FightIndex(eventCache, eventInfoCache, fightCache)
+        self.fighterIdentity = fighterIdentity or FighterIdentityService(fightCache, fight_index=self.fightIndex)
+        self.ratingService = ratingService or RatingService(self.fightIndex)
+        self.divisionStats = divisionStats or DivisionStatsService()
+        self.upcomingCards = upcomingCards or UpcomingCardCache()
+        # Holds the odds for a TTL shared by every request
+        self.kalshiClient = kalshiClient or KalshiClient()
+        self.oddsStore = oddsStore or OddsStore()
 
     def get_next_event(self):
         # Convert all entries to a DF
@@ -35,25 +49,28 @@ class FightDataService:
         event = next_event.drop(labels=["event_date_parsed"]).to_dict()
         
         print(f"Latest Event: {event}")
-        # Use cached event info first; fall back to live scrape only if cache is empty
-        cached_info = self.eventInfoCache.get_event(event["event_id"])
-        if cached_info:
-            event_info = [asdict(ei) if is_dataclass(ei) else dict(ei) for ei in cached_info]
+        # Served from the caches only; the upcoming card ingestor keeps the card current.
+        # An event it has not reached yet shows an empty card instead of scraping here.
+        card = self.upcomingCards.get_card(event["event_id"])
+        if card:
+            event_info = [self._scheduledBoutRow(bout) for bout in card]
         else:
-            event_info = scrapeEventInfo(event["event_id"]) or []
+            event_info = [asdict(ei) if is_dataclass(ei) else dict(ei) for ei in self.eventInfoCache.get_event(event["event_id"])]
         # Enrich event info with betting info
-        latest_lines = pd.DataFrame(self.kalshiClient.getLatest())
-        print(f"Latest odds from Kalshi: {latest_lines}")
+        latest_lines = self.kalshiClient.getSnapshot()
         for fight in event_info:
             fight["fighter_a"] = fight["winner_name"]
             del fight["winner_name"]
-            fight["fighter_a_id"] = self.fightCache.get_fighter_id(fight["fighter_a"])
-            fight["fighter_a_odds"] = self._getOdds(fight["fighter_a"], latest_lines)
+            fight["fighter_a_id"] = self.fighterIdentity.resolve(fight["fighter_a"]) or ""
 
             fight["fighter_b"] = fight["loser_name"]
             del fight["loser_name"]
-            fight["fighter_b_id"] = self.fightCache.get_fighter_id(fight["fighter_b"])
-            fight["fighter_b_odds"] = self._getOdds(fight["fighter_b"], latest_lines)
+            fight["fighter_b_id"] = self.fighterIdentity.resolve(fight["fighter_b"]) or ""
+
+        odds = self._getOddsByFighter(latest_lines, event_info)
+        for fight in event_info:
+            fight["fighter_a_odds"] = odds.get(fight["fighter_a_id"] or normalize_name(fight["fighter_a"]), -1)
+            fight["fighter_b_odds"] = odds.get(fight["fighter_b_id"] or normalize_name(fight["fighter_b"]), -1)
 
             # Clean up if odds were not offered to one fighter
             if fight["fighter_a_odds"] != -1 and fight["fighter_b_odds"] == -1:
@@ -65,22 +82,37 @@ class FightDataService:
             "event": event,
             "fights": event_info
         }
-    
-    def _getOdds(self, fighter_name: str, df: pd.DataFrame):
-        try:
-            odds = df[df["fighter"] == fighter_name]["yes_money"]
-            return odds.iloc[0] if not odds.empty else self._getOddsFromLastName(fighter_name, df)
-        except IndexError:
-            # Probably a name mismatch from Kalshi to UFC stats, search for just last name
-            return self._getOddsFromLastName(fighter_name, df)
-            
-
-    def _getOddsFromLastName(self, fighter_name: str, df: pd.DataFrame):
-        last_name = fighter_name.split(" ")[-1]
-        print(f"Could not find odds from fighter {fighter_name}, attempting to match last name {last_name}")
-        odds = df[df["fighter"].str.contains(last_name)]["yes_money"]
-        print(f"last name: {last_name}, odds: {odds}")
-        return odds.iloc[0] if not odds.empty else -1
+
+    @staticmethod
+    def _scheduledBoutRow(bout) -> dict:
+        # Same shape as an EventInfo row so /event/next looks the same for either source
+        return {
+            "event_id": bout.event_id,
+            "fight_id": "",
+            "winner_name": bout.fighter_a,
+            "loser_name": bout.fighter_b,
+            "weight_class": bout.weight_class,
+            "method": "",
+            "round": "",
+            "time": "",
+            "fight_url": "",
+        }
+
+    def _getOddsByFighter(self, snapshot: OddsSnapshot, card: list) -> dict:
+        # Kalshi names are resolved against the fighters on the card, so a bare or
+        # differently spelled name still lands on the right fighter_id. Debuting
+        # fighters have no fighter_id yet and are keyed by normalized name instead.
+        if not len(snapshot):
+            return {}
+        candidates = {f[k] for f in card for k in ("fighter_a_id", "fighter_b_id") if f[k]}
+        odds = {}
+        for fighter, yes_money in zip(snapshot.fighter, snapshot.yes_money.tolist()):
+            if pd.isna(yes_money):
+                # Not quoted; the opponent's price fills it in
+                continue
+            key = self.fighterIdentity.resolve(fighter, candidates) or normalize_name(fighter)
+            odds.setdefault(key, yes_money)
+        return odds
 
     def get_fights_by_fighter(self, name: str):
         """
@@ -149,20 +181,15 @@ class FightDataService:
         ])
 
     def getFighterMetadata(self, fighter_id: str):
-        # Flatten the list of lists into a list of dictionaries
-        df = pd.DataFrame([
-            asdict(f) if is_dataclass(f) else f
-            for sublist in self.fightCache.all() 
-            for f in sublist
-        ])
-        relevant_fights = df.loc[df["fighter_id"] == fighter_id]
-        name = None
-        fight_ids = []
-        fights = []
-        if len(relevant_fights) > 0:
-            name = relevant_fights.iloc[0]["fighter"]
-            fight_ids = relevant_fights["fight_id"].tolist()
-            fights = relevant_fights.to_dict(orient="records")
+        # Resolve the fighter's fights through the join index rather than flattening every fight
+        fight_ids = [f.fight_id for f in self.fightIndex.fights_of(fighter_id)]
+        fights = [
+            asdict(line)
+            for fight_id in fight_ids
+            for line in self.fightCache.get_fight(fight_id)
+            if line.fighter_id == fighter_id
+        ]
+        name = fights[0]["fighter"] if fights else None
 
         return {
             "name": name,
@@ -171,6 +198,78 @@ class FightDataService:
             "fights": fights
         }
         
+    def getFighterRating(self, fighter_id: str, as_of: str = None, include_history: bool = False):
+        try:
+            rating = self.ratingService.rating(fighter_id, as_of)
+        except ValueError:
+            raise HTTPException(
+                status_code=400,
+                detail="as_of must be YYYY-MM-DD"
+            )
+        if rating is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"No rated fights found for fighter '{fighter_id}'"
+            )
+        result = {
+            "fighter_id": fighter_id,
+            "as_of": as_of,
+            "rating": rating,
+            "fights_rated": self.ratingService.fights_rated(fighter_id, as_of),
+        }
+        if include_history:
+            result["history"] = self.ratingService.history(fighter_id)
+        return result
+
+    def getOddsHistory(self, fighter_id: str = None, event_id: str = None, start: str = None, end: str = None):
+        if not fighter_id and not event_id:
+            raise HTTPException(
+                status_code=400,
+                detail="Give a fighter_id or an event_id"
+            )
+        try:
+            # Days are UTC, like the store's day partitions
+            start_at = datetime.strptime(start, "%Y-%m-%d").replace(tzinfo=timezone.utc) if start else None
+            end_at = datetime.strptime(end, "%Y-%m-%d").replace(tzinfo=timezone.utc) if end else None
+        except ValueError:
+            raise HTTPException(
+                status_code=400,
+                detail="start and end must be YYYY-MM-DD"
+            )
+        samples = self.oddsStore.history(fighter_id=fighter_id or None, event_id=event_id or None, start=start_at, end=end_at)
+        samples["ts"] = samples["ts"].map(lambda ts: ts.isoformat())
+        # NaN (not quoted) is not valid JSON
+        samples = samples.astype(object).where(samples.notna(), None)
+        return {
+            "fighter_id": fighter_id,
+            "event_id": event_id,
+            "totalSamples": len(samples),
+            "samples": samples.to_dict("records"),
+        }
+
+    def getLeaderboard(self, weight_class: str, metric: str, n: int = 25, min_fights: int = 0):
+        if self.divisionStats.metric_of(metric) is None:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown metric '{metric}'"
+            )
+        leaderboard = self.divisionStats.leaderboard(weight_class, metric, n, min_fights)
+        if leaderboard is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"No fighters found in weight class '{weight_class}'"
+            )
+        return leaderboard
+
+    def getPercentiles(self, fighter_id: str, weight_class: str = None):
+        percentiles = self.divisionStats.percentiles(fighter_id, weight_class)
+        if percentiles is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"No fighter vector found for '{fighter_id}'" + (f" in weight class '{weight_class}'" if weight_class else "")
+            )
+        return percentiles
+
     # For the fighter comparison page, we need a list of all fighters with their IDs and fight IDs to populate the dropdowns    
     def getAllFighters(self) -> list:
         df = pd.DataFrame([
@@ -0,0 +1,150 @@
+from __future__ import annotations
+from pathlib import Path
+from threading import RLock
+from typing import Dict, Iterable, List, Optional, Set
+
+from cache.FightCache import FightCache
+from cache.FightIndex import FightIndex, field_of
+from cache.FighterAliasCache import FighterAliasCache
+from cache.NameUtil import normalize_name, token_key
+from data_model.FighterAlias import FighterAlias
+
+DEFAULT_ALIAS_CSV = Path(__file__).resolve().parent.parent / "resources" / "initial_data" / "fighter-aliases.csv"
+
+class FighterIdentityService:
+    """
+    Resolves any fighter name variant (case, accents, nicknames, word order,
+    Kalshi market titles) to a canonical ufcstats fighter_id.
+
+    Names are learned from the fight stat lines and the event-info winner/loser
+    names; FighterAliasCache entries override anything learned. Every lookup is a
+    dict hit on a normalized key, falling back to the last-name token when the
+    caller can narrow the answer down with a set of candidate fighter_ids. A name
+    shared by several fighters (e.g. two Bruno Silvas) only resolves when the
+    candidates single one of them out.
+    """
+
+    def __init__(self, fight_cache: FightCache, alias_cache: FighterAliasCache = None, fight_index: FightIndex = None):
+        self.fight_cache = fight_cache
+        self.alias_cache = alias_cache or FighterAliasCache(str(DEFAULT_ALIAS_CSV))
+        self.fight_index = fight_index
+        self._lock = RLock()
+        self._loaded = False
+        self._by_name: Dict[str, Set[str]] = {}
+        self._by_tokens: Dict[str, Set[str]] = {}
+        self._by_last: Dict[str, Set[str]] = {}
+        self._names: Dict[str, str] = {}
+
+    @classmethod
+    def from_csv(cls, event_csv: str, event_info_csv: str, fight_csv: str, alias_csv: str) -> "FighterIdentityService":
+        fight_index = FightIndex.from_csv(event_csv, event_info_csv, fight_csv)
+        return cls(fight_index.fight_cache, FighterAliasCache(alias_csv), fight_index)
+
+    def load(self) -> None:
+        with self._lock:
+            if self._loaded:
+                return
+            for lines in self.fight_cache.all():
+                for line in lines:
+                    self._learn(line.fighter_id, line.fighter)
+            if self.fight_index is not None:
+                for lines in self.fight_cache.all():
+                    self._learn_from_event_info(lines)
+            self._loaded = True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._by_name.clear()
+            self._by_tokens.clear()
+            self._by_last.clear()
+            self._names.clear()
+            self._loaded = False
+
+    # ---- Lookups ----
+
+    def resolve(self, name: str, candidates: Optional[Iterable[str]] = None) -> Optional[str]:
+        """
+        Return the fighter_id for a name, or None when it cannot be resolved or
+        matches several fighters equally well. `candidates` restricts the answer (e.g. the two fighters in a fight, or a card)
+        and is what allows a bare last name to resolve.
+        """
+        key = normalize_name(name)
+        if not key:
+            return None
+        alias = self.alias_cache.get(key)
+        if alias is not None:
+            return alias.fighter_id
+        self.load()
+        allowed = set(candidates) if candidates is not None else None
+        with self._lock:
+            for index, lookup in (
+                (self._by_name, key),
+                (self._by_tokens, token_key(name)),
+                (self._by_last, key.split()[-1]),
+            ):
+                ids = index.get(lookup, set())
+                if allowed is not None:
+                    ids = ids & allowed
+                elif index is self._by_last:
+                    # A bare last name is only trusted inside a candidate set
+                    continue
+                if len(ids) > 1:
+                    return None
+                if ids:
+                    return next(iter(ids))
+        return None
+
+    def resolve_all(self, names: Iterable[str], candidates: Optional[Iterable[str]] = None) -> Dict[str, Optional[str]]:
+        allowed = set(candidates) if candidates is not None else None
+        return {name: self.resolve(name, allowed) for name in names}
+
+    def name_of(self, fighter_id: str) -> Optional[str]:
+        self.load()
+        with self._lock:
+            return self._names.get(fighter_id)
+
+    def candidates_for(self, name: str) -> List[str]:
+        self.load()
+        with self._lock:
+            return sorted(self._by_name.get(normalize_name(name), set()) | self._by_tokens.get(token_key(name), set()))
+
+    # ---- Updates ----
+
+    def learn(self, fighter_id: str, name: str) -> None:
+        with self._lock:
+            if self._loaded:
+                self._learn(fighter_id, name)
+
+    def add_alias(self, alias: str, fighter_id: str) -> None:
+        """Persist a manual override to the alias table."""
+        self.alias_cache.save(FighterAlias(alias=alias, fighter_id=fighter_id, fighter=self.name_of(fighter_id) or ""))
+
+    # -------- helpers --------
+
+    def _learn(self, fighter_id: str, name: str) -> None:
+        key = normalize_name(name)
+        if not fighter_id or not key:
+            return
+        self._by_name.setdefault(key, set()).add(fighter_id)
+        self._by_tokens.setdefault(token_key(name), set()).add(fighter_id)
+        self._by_last.setdefault(key.split()[-1], set()).add(fighter_id)
+        # Later stat lines are newer appends; keep the latest spelling
+        self._names[fighter_id] = name
+
+    def _learn_from_event_info(self, lines) -> None:
+        # When event-info spells one fighter differently from the stat lines,
+        # the other fighter pins down who the unmatched name belongs to.
+        if len(lines) != 2:
+            return
+        info = self.fight_index.event_info_of(lines[0].fight_id)
+        if info is None:
+            return
+        info_names = [field_of(info, "winner_name"), field_of(info, "loser_name")]
+        line_keys = [normalize_name(line.fighter) for line in lines]
+        for i, info_name in enumerate(info_names):
+            other = normalize_name(info_names[1 - i])
+            if normalize_name(info_name) in line_keys or other not in line_keys:
+                continue
+            unmatched = lines[1 - line_keys.index(other)]
+            self._by_name.setdefault(normalize_name(info_name), set()).add(unmatched.fighter_id)
+            self._by_tokens.setdefault(token_key(info_name), set()).add(unmatched.fighter_id)
@@ -0,0 +1,175 @@
+from __future__ import annotations
+from bisect import bisect_left
+from datetime import date
+from threading import RLock
+from typing import Dict, List, Optional, Set
+import numpy as np
+import pandas as pd
+
+from cache.FightIndex import Bout, FightIndex, parse_event_date
+
+class RatingService:
+    """
+    Elo ratings over the fight history, processed in event-date order.
+
+    State is array-backed: each fighter_id maps to a slot in the rating/count
+    arrays, and every applied bout appends its pre-fight ratings to a history
+    so ratings can be read as of any date. Results that arrive in date order
+    are applied incrementally; an out-of-order result triggers one replay.
+    """
+
+    INITIAL_RATING = 1500.0
+    K_FACTOR = 32.0
+    # Debuting fighters move faster until their rating has settled
+    PROVISIONAL_FIGHTS = 5
+    PROVISIONAL_K_FACTOR = 48.0
+
+    def __init__(self, fight_index: FightIndex):
+        self.fight_index = fight_index
+        self._lock = RLock()
+        self._loaded = False
+        self._reset()
+
+    def load(self) -> None:
+        with self._lock:
+            if self._loaded:
+                return
+            self._replay(self.fight_index.bouts())
+            self._loaded = True
+
+    def replay(self) -> None:
+        """Rebuild every rating from scratch."""
+        with self._lock:
+            self._replay(self.fight_index.bouts())
+            self._loaded = True
+
+    # ---- Lookups ----
+
+    def rating(self, fighter_id: str, as_of=None) -> Optional[float]:
+        """
+        Current rating, or the rating going into `as_of` (fights on that date excluded).
+        Returns None for unknown fighters; raises ValueError for an unparseable `as_of`.
+        """
+        self.load()
+        with self._lock:
+            slot = self._slots.get(fighter_id)
+            if slot is None:
+                return None
+            if as_of is None:
+                return float(self._ratings[slot])
+            dates = self._history_dates[slot]
+            i = bisect_left(dates, _cutoff(as_of))
+            return self._history_ratings[slot][i] if i < len(dates) else float(self._ratings[slot])
+
+    def fights_rated(self, fighter_id: str, as_of=None) -> int:
+        self.load()
+        with self._lock:
+            slot = self._slots.get(fighter_id)
+            if slot is None:
+                return 0
+            if as_of is None:
+                return int(self._counts[slot])
+            return bisect_left(self._history_dates[slot], _cutoff(as_of))
+
+    def history(self, fighter_id: str) -> List[dict]:
+        """Pre-fight rating for each rated fight, oldest first."""
+        self.load()
+        with self._lock:
+            slot = self._slots.get(fighter_id)
+            if slot is None:
+                return []
+            return [
+                {"event_date": date.fromordinal(d).isoformat(), "fight_id": f, "rating": r}
+                for d, f, r in zip(self._history_dates[slot], self._history_fights[slot], self._history_ratings[slot])
+            ]
+
+    def pre_fight_ratings(self) -> pd.DataFrame:
+        """One row per (fight_id, fighter_id) with the rating going into that fight."""
+        self.load()
+        with self._lock:
+            ids = {slot: fid for fid, slot in self._slots.items()}
+            rows = [
+                (fight_id, ids[slot], rating)
+                for slot in range(len(self._history_fights))
+                for fight_id, rating in zip(self._history_fights[slot], self._history_ratings[slot])
+            ]
+        return pd.DataFrame(rows, columns=["fight_id", "fighter_id", "elo"])
+
+    # ---- Updates ----
+
+    def apply_fight(self, fight_id: str) -> bool:
+        """
+        Apply one newly saved result. Returns False when the fight is not yet
+        complete in the index (no date, stats or winner) or was already applied.
+        """
+        with self._lock:
+            if not self._loaded:
+                # The first load will pick it up from the index
+                return False
+            if fight_id in self._applied:
+                return False
+            bout = self.fight_index.bout(fight_id)
+            if bout is None:
+                return False
+            if self._last_date is not None and bout.event_date.toordinal() < self._last_date:
+                print(f"Fight {fight_id} on {bout.event_date} predates the latest rated fight; replaying ratings")
+                self.replay()
+                return True
+            self._apply(bout)
+            return True
+
+    # -------- helpers --------
+
+    def _reset(self) -> None:
+        self._slots: Dict[str, int] = {}
+        self._ratings = np.full(1024, self.INITIAL_RATING, dtype=np.float64)
+        self._counts = np.zeros(1024, dtype=np.int32)
+        self._history_dates: List[List[int]] = []
+        self._history_fights: List[List[str]] = []
+        self._history_ratings: List[List[float]] = []
+        self._applied: Set[str] = set()
+        self._last_date: Optional[int] = None
+
+    def _replay(self, bouts: List[Bout]) -> None:
+        self._reset()
+        for bout in bouts:
+            self._apply(bout)
+
+    def _slot(self, fighter_id: str) -> int:
+        slot = self._slots.get(fighter_id)
+        if slot is None:
+            slot = len(self._slots)
+            if slot == len(self._ratings):
+                self._ratings = np.concatenate([self._ratings, np.full(slot, self.INITIAL_RATING)])
+                self._counts = np.concatenate([self._counts, np.zeros(slot, dtype=np.int32)])
+            self._slots[fighter_id] = slot
+            self._history_dates.append([])
+            self._history_fights.append([])
+            self._history_ratings.append([])
+        return slot
+
+    def _k(self, slot: int) -> float:
+        return self.PROVISIONAL_K_FACTOR if self._counts[slot] < self.PROVISIONAL_FIGHTS else self.K_FACTOR
+
+    def _apply(self, bout: Bout) -> None:
+        w, l = self._slot(bout.winner_id), self._slot(bout.loser_id)
+        day = bout.event_date.toordinal()
+        rw, rl = float(self._ratings[w]), float(self._ratings[l])
+        expected_w = 1.0 / (1.0 + 10.0 ** ((rl - rw) / 400.0))
+        for slot, rating in ((w, rw), (l, rl)):
+            self._history_dates[slot].append(day)
+            self._history_fights[slot].append(bout.fight_id)
+            self._history_ratings[slot].append(rating)
+        self._ratings[w] = rw + self._k(w) * (1.0 - expected_w)
+        self._ratings[l] = rl - self._k(l) * (1.0 - expected_w)
+        self._counts[w] += 1
+        self._counts[l] += 1
+        self._applied.add(bout.fight_id)
+        self._last_date = day if self._last_date is None else max(self._last_date, day)
+
+
+def _cutoff(as_of) -> int:
+    cutoff = parse_event_date(as_of)
+    if cutoff is None:
+        raise ValueError(f"Unparseable as_of date '{as_of}'")
+    return cutoff.toordinal()
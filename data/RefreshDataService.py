@@ -1,27 +1,88 @@
-from typing import Dict, List
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+import json
 import os
 
+import numpy as np
+
 from scrapers.ScraperService import ScraperService
+from clients.KalshiClient import KalshiClient
 
 from cache.FightCache import FightCache
 from cache.EventCache import EventCache
 from cache.EventInfoCache import EventInfoCache
+from cache.FightIndex import FightIndex, field_of, parse_event_date
+from cache.OddsStore import OddsMarket, OddsSample, OddsStore
+from cache.RefreshWatermark import RefreshWatermark
+from cache.UpcomingCardCache import UpcomingCardCache
+from FighterIdentityService import FighterIdentityService
+from RatingService import RatingService
 
 from data_model.Event import Event
-from data_model.EventInfo import EventInfo
-from data_model.FightStatLine import FightStatLine
+from data_model.ScheduledBout import ScheduledBout
+
+DEFAULT_WATERMARK_JSON = Path(__file__).resolve().parent.parent / "resources" / "initial_data" / "refresh-watermark.json"
+DEFAULT_REPORT_JSON = Path(__file__).resolve().parent.parent / "resources" / "initial_data" / "refresh-report.json"
+# How often the open Kalshi markets are sampled into the odds store
+ODDS_SAMPLE_MINUTES = float(os.getenv("ODDS_SAMPLE_MINUTES", "1"))
+
+
+@dataclass
+class RefreshReport:
+    started_at: str
+    finished_at: Optional[str] = None
+    watermark_before: Optional[str] = None
+    watermark_after: Optional[str] = None
+    events_checked: int = 0
+    fights_checked: int = 0
+    event_info_fetched: List[str] = field(default_factory=list)
+    fights_fetched: List[str] = field(default_factory=list)
+    failures: Dict[str, str] = field(default_factory=dict)
+    given_up: List[str] = field(default_factory=list)
+
 
 class RefreshDataService:
 
-    def __init__(self, 
-                 fight_cache: FightCache, 
-                 event_cache: EventCache, 
-                 event_info_cache: EventInfoCache, 
-                 scraper_service: ScraperService):
+    # Events this close behind the watermark are re-checked in case ufcstats posts stats late
+    RECENT_WINDOW_DAYS = 14
+    # Failed fetches before an id is marked unavailable and stops holding the watermark back
+    MAX_ATTEMPTS = 3
+    # Odds samples older than this are thinned to one per market per ODDS_DOWNSAMPLE_SECONDS
+    ODDS_FULL_RESOLUTION_DAYS = 7
+    ODDS_DOWNSAMPLE_SECONDS = 3600
+
+    def __init__(self,
+                 fight_cache: FightCache,
+                 event_cache: EventCache,
+                 event_info_cache: EventInfoCache,
+                 scraper_service: ScraperService,
+                 fight_index: FightIndex = None,
+                 fighter_identity: FighterIdentityService = None,
+                 rating_service: RatingService = None,
+                 watermark: RefreshWatermark = None,
+                 upcoming_cards: UpcomingCardCache = None,
+                 kalshi_client: KalshiClient = None,
+                 odds_store: OddsStore = None,
+                 report_json: str = None):
         self.fight_cache = fight_cache
         self.event_cache = event_cache
         self.event_info_cache = event_info_cache
         self.scraper_service = scraper_service
+        self.fight_index = fight_index or FightIndex(event_cache, event_info_cache, fight_cache)
+        self.fighter_identity = fighter_identity or FighterIdentityService(fight_cache, fight_index=self.fight_index)
+        self.rating_service = rating_service or RatingService(self.fight_index)
+        self.watermark = watermark or RefreshWatermark(str(DEFAULT_WATERMARK_JSON))
+        self.upcoming_cards = upcoming_cards or UpcomingCardCache()
+        # No TTL: every sample is its own pull
+        self.kalshi_client = kalshi_client or KalshiClient(ttl=0)
+        self.odds_store = odds_store or OddsStore()
+        self._last_odds_pull = None
+        # The last reconciliation's report, also written next to the watermark so an
+        # API whose refresh jobs run in a worker process can serve it
+        self.report_json = report_json or str(DEFAULT_REPORT_JSON)
+        self.last_report: Optional[RefreshReport] = None
 
     def refreshFightData(self):
         # Respect global env guard to avoid any scraping when disabled.
@@ -33,115 +94,290 @@ class RefreshDataService:
         # Find new events.
         #   1. Add new events to events.csv database
         #   2. Scrape event and fight info
-        events: List[Event] = self.scraper_service.scrape_all_events()
-        new_event_ids = self._findNewEvents(self._getEventIdsFromDict(events))
+        #   The listing is read newest-first and stops at the first known event
+        known_event_ids = self._knownEventIds()
+        events: List[Event] = self.scraper_service.scrape_new_events(known_event_ids)
+        events_by_id = {event["event_id"]: event for event in events if "event_id" in event}
+        new_event_ids = [event_id for event_id in events_by_id if event_id not in known_event_ids]
 
         print(f"Found {len(new_event_ids)} new event ids when refreshing data: {new_event_ids}")
         for event_id in new_event_ids:
-            new_event = self._getEvent(event_id, events)
+            new_event = events_by_id[event_id]
             # Add new event to the events.csv database
             print(f"Found new event: {new_event}")
             self.event_cache.save(new_event)
+            self.fight_index.add_event(new_event)
 
             # Scrape for the corresponding Event Info rows that need to be added
             self._scrapeEventInfo(event_id)
         return new_event_ids
 
-    def reloadIncompleteData(self) -> None:
-        self._reloadIncompleteEventInfo()
-        self._reloadIncompleteFightData()
+    def refreshUpcomingCards(self) -> List[str]:
+        """
+        Re-scrape the cards of events that have not happened yet so /event/next
+        is served from the upcoming card cache. Returns the event ids whose
+        card changed.
+        """
+        enable_scraping = os.getenv("ENABLE_SCRAPING", "true").lower() in ("1", "true", "yes")
+        if not enable_scraping:
+            print("ENABLE_SCRAPING is false; aborting refreshUpcomingCards (no network calls will be made)")
+            return []
 
-    def _reloadIncompleteEventInfo(self) -> None:
-        allEventIds: List[str] = self._getEventIdsFromEvent(self._loadEvents())
-        allEventInfoIDs: List[str] = self._getEventIdsFromEventInfo(self._loadEventInfo())
-        incompleteEventInfoIDs: List[str] = [x for x in allEventIds if x not in allEventInfoIDs]
-        print(f"Found {len(incompleteEventInfoIDs)} incomplete event info data: {incompleteEventInfoIDs}")
-        for event_id in incompleteEventInfoIDs:
-            self._scrapeEventInfo(event_id)
-    
-    def _reloadIncompleteFightData(self) -> None:
-        allFightIds: List[str] = self._getFightIdsFromEventInfo(self._loadEventInfo())
-        existingFightIds: List[str] = self._getFightIdsFromFightData(self._loadFights())
-        incompleteFightIDs: List[str] = [x for x in allFightIds if x not in existingFightIds and x != None]
-        print(f"Found {len(incompleteFightIDs)} incomplete fight info data: {incompleteFightIDs}")
-        for fight_id in incompleteFightIDs:
-            if fight_id != None:
-                self._scrapeFightData(fight_id)
-
-    def _scrapeEventInfo(self, event_id: str):
+        today = date.today()
+        upcoming = [
+            field_of(event, "event_id")
+            for event in self.event_cache.all()
+            if (parse_event_date(field_of(event, "event_date")) or date.min) >= today
+        ]
+        # Revalidate so a card cached within the event-details TTL is still checked every run
+        changed = [
+            event_id
+            for event_id, event_info in self.scraper_service.scrape_event_infos(upcoming, revalidate=True).items()
+            if self._saveUpcomingCard(event_id, event_info)
+        ]
+        print(f"Checked {len(upcoming)} upcoming cards, {len(changed)} changed: {changed}")
+        return changed
+
+    def recordOdds(self) -> int:
+        """Append one sample per open Kalshi market to the odds store; returns the samples written."""
+        snapshot = self.kalshi_client.getSnapshot()
+        if not len(snapshot) or snapshot.fetched_at == self._last_odds_pull:
+            # Nothing open, or the pull failed and the previous one is being served again
+            return 0
+        self._last_odds_pull = snapshot.fetched_at
+        events_by_date = None
+        samples = []
+        fight_dates = np.datetime_as_string(snapshot.fight_date, unit="D")
+        for ticker, fighter, fight_date, yes, no in zip(snapshot.ticker, snapshot.fighter, fight_dates, snapshot.yes_money.tolist(), snapshot.no_money.tolist()):
+            market = self.odds_store.market(ticker)
+            if market is None or not market.event_id or not market.fighter_id:
+                if events_by_date is None:
+                    events_by_date = self._upcomingEventsByDate()
+                market = self._oddsMarket(ticker, fighter, fight_date, events_by_date.get(fight_date, ""), market)
+            samples.append(OddsSample(market, None if np.isnan(yes) else yes, None if np.isnan(no) else no))
+        return self.odds_store.append(samples, snapshot.fetched_at)
+
+    def downsampleOdds(self) -> int:
+        return self.odds_store.downsample(timedelta(days=self.ODDS_FULL_RESOLUTION_DAYS), self.ODDS_DOWNSAMPLE_SECONDS)
+
+    def reloadIncompleteData(self) -> Optional[RefreshReport]:
+        """
+        Fill in missing event info and fight stats. Only events after the
+        persisted watermark (less RECENT_WINDOW_DAYS) and explicitly flagged
+        ids are examined, so the daily run scales with new data.
+        """
+        # Without this, every id would count a failed attempt and soon be given up on
+        enable_scraping = os.getenv("ENABLE_SCRAPING", "true").lower() in ("1", "true", "yes")
+        if not enable_scraping:
+            print("ENABLE_SCRAPING is false; aborting reloadIncompleteData (no network calls will be made)")
+            return None
+
+        self.watermark.load()
+        report = RefreshReport(
+            started_at=datetime.now().isoformat(timespec="seconds"),
+            watermark_before=self._isoformat(self.watermark.complete_through),
+        )
+        today = date.today()
+        window = self._eventsInWindow(today)
+        flagged_events = set(self.watermark.flagged["events"])
+        flagged_fights = set(self.watermark.flagged["fights"])
+        print(f"Reconciling {len(window)} events since the watermark, {len(flagged_events)} flagged events and {len(flagged_fights)} flagged fights")
+
+        event_ids = [e for _, e in window] + sorted(flagged_events - {e for _, e in window})
+        for event_id in event_ids:
+            report.events_checked += 1
+            self._reloadIncompleteEventInfo(event_id, report)
+
+        fight_ids = list(dict.fromkeys(
+            [fight_id for event_id in event_ids for fight_id in self._fightIdsOf(event_id)] + sorted(flagged_fights)
+        ))
+        report.fights_checked = len(fight_ids)
+        self._reloadIncompleteFightData(fight_ids, report)
+
+        self.watermark.complete_through = self._advanceWatermark(window, today)
+        self.watermark.save()
+
+        report.watermark_after = self._isoformat(self.watermark.complete_through)
+        report.finished_at = datetime.now().isoformat(timespec="seconds")
+        print(
+            f"Reconciliation done: {len(report.event_info_fetched)} event info and {len(report.fights_fetched)} fights fetched, "
+            f"{len(report.failures)} failures, watermark {report.watermark_before} -> {report.watermark_after}"
+        )
+        self.last_report = report
+        self._saveReport(report)
+        return report
+
+    def lastReport(self) -> Optional[RefreshReport]:
+        """The most recent reconciliation report, from this process or the refresh worker."""
+        try:
+            with open(self.report_json, "r", encoding="utf-8") as f:
+                return RefreshReport(**json.load(f))
+        except FileNotFoundError:
+            return self.last_report
+        except (OSError, TypeError, ValueError) as e:
+            print(f"Could not read refresh report {self.report_json}: {e}")
+            return self.last_report
+
+    def flagGap(self, event_id: str = None, fight_id: str = None) -> None:
+        """Force an event or fight to be re-checked on the next reconciliation."""
+        if event_id:
+            self.watermark.flag("events", event_id)
+        if fight_id:
+            self.watermark.flag("fights", fight_id)
+        self.watermark.save()
+
+    def _reloadIncompleteEventInfo(self, event_id: str, report: RefreshReport) -> None:
+        if self.event_info_cache.get_event(event_id) or self.watermark.is_unavailable("events", event_id):
+            self.watermark.record_success("events", event_id)
+            return
+        try:
+            report.fights_fetched.extend(self._scrapeEventInfo(event_id))
+        except Exception as e:
+            report.failures[event_id] = str(e)
+        if self.event_info_cache.get_event(event_id):
+            report.event_info_fetched.append(event_id)
+            self.watermark.record_success("events", event_id)
+        else:
+            report.failures.setdefault(event_id, "no event info returned")
+            if self.watermark.record_failure("events", event_id, self.MAX_ATTEMPTS):
+                report.given_up.append(event_id)
+
+    def _reloadIncompleteFightData(self, fight_ids: List[str], report: RefreshReport) -> None:
+        missing = [f for f in fight_ids if not self.fight_cache.hasFight(f) and not self.watermark.is_unavailable("fights", f)]
+        try:
+            report.fights_fetched.extend(self._scrapeFights(missing))
+        except Exception as e:
+            for fight_id in missing:
+                report.failures[fight_id] = str(e)
+        for fight_id in fight_ids:
+            if self.fight_cache.hasFight(fight_id) or self.watermark.is_unavailable("fights", fight_id):
+                self.watermark.record_success("fights", fight_id)
+                continue
+            report.failures.setdefault(fight_id, "no fight stats returned")
+            if self.watermark.record_failure("fights", fight_id, self.MAX_ATTEMPTS):
+                report.given_up.append(fight_id)
+
+    def _scrapeEventInfo(self, event_id: str) -> List[str]:
         new_event_info = self.scraper_service.scrape_event_info(event_id)
         print(f"Found new event info: {new_event_info}")
+        fight_ids: List[str] = []
+        # Bouts without a fight_id have not happened yet; they go to the upcoming card cache
+        self._saveUpcomingCard(event_id, new_event_info)
         for event_info in new_event_info:
             if event_info.get("fight_id", "") == '':
-                # This is a future event, we will not process it this way
-                # TODO process future fights
-                fighter1: str = event_info.get("winner_name", "?")
-                fighter2: str = event_info.get("loser_name", "?")
-                print(f"Fight {fighter1} vs {fighter2} is in the future, will process separately")
                 continue
 
             # Save this new event info object
             self.event_info_cache.save(event_info)
+            self.fight_index.add_event_info(event_info)
+            fight_ids.append(event_info.get("fight_id"))
+
+        # Scrape the card's fights together so the fetch engine can overlap them
+        return self._scrapeFights(fight_ids)
 
-            # Scrape fight data for this event_info only (guarded non-empty fight_id)
-            fight_id = event_info.get("fight_id")
-            if fight_id:
-                self._scrapeFightData(fight_id)
+    def _scrapeFights(self, fight_ids: List[str]) -> List[str]:
+        # Returns the fight ids that were fetched and saved
+        missing = [fight_id for fight_id in fight_ids if fight_id and not self.fight_cache.hasFight(fight_id)]
+        if not missing:
+            return []
+        return [
+            fight_id
+            for fight_id, new_fights in self.scraper_service.scrape_fight_infos(missing).items()
+            if self._saveFightData(fight_id, new_fights)
+        ]
 
-    def _scrapeFightData(self, fight_id: str) -> None:
-        new_fights = self.scraper_service.scrape_fight_info(fight_id)
+    def _saveFightData(self, fight_id: str, new_fights: List[Dict]) -> bool:
         # Save all fights
-        if not self.fight_cache.hasFight(fight_id):
-            self.fight_cache.saveAll(new_fights)
-
-    def _getEventIdsFromDict(self, events: List[Dict]) -> List[str]:
-        return [event["event_id"] for event in events if "event_id" in event]
-
-    def _getEventIdsFromEvent(self, events: List[Event]) -> List[str]:
-        event_ids: List[str] = []
-        for event in events:
-            event_ids.append(event.getEventId())
-        return event_ids
-    
-    def _getEventIdsFromEventInfo(self, events: List[List[EventInfo]]) -> List[str]:
-        # print(f"{len(eventInfos[0])}")
-        event_ids: List[str] = []
-        for event in events:
-            for eventInfo in event:
-                event_ids.append(eventInfo.getEventId())
-        return event_ids
-    
-    def _getFightIdsFromEventInfo(self, events: List[List[EventInfo]]) -> List[str]:
-        fight_ids: List[str] = []
-        for event in events:
-            for eventInfo in event:
-                if isinstance(eventInfo, EventInfo):
-                    fight_ids.append(eventInfo.getFightId())
-                else:
-                    print(f"EventInfo was not of the expected type: {eventInfo}")
-        return fight_ids
-    
-    def _getFightIdsFromFightData(self, fights: List[List[FightStatLine]]) -> List[str]:
-        fight_ids: List[str] = []
-        for fight in fights:
-            for fightData in fight:
-                fight_ids.append(fightData.getFightId())
-        return fight_ids
-
-    def _findNewEvents(self, current_event_ids: List[str]) -> List[str]:
-        existing_events: List[Event] = self.event_cache.all()
-        print(f"Existing events in cache: {len(existing_events)}")
-        existing_event_ids = self._getEventIdsFromEvent(existing_events)
-        return [x for x in current_event_ids if x not in existing_event_ids]
-    
-    def _getEvent(self, target_id: str, events: List[Event]) -> Event:
-        return next((e for e in events if e["event_id"] == target_id),None)
-
-    def _loadFights(self):
-        return self.fight_cache.all()
-    
-    def _loadEvents(self):
-        return self.event_cache.all()
-    
-    def _loadEventInfo(self):
-        return self.event_info_cache.all()
+        if not new_fights or self.fight_cache.hasFight(fight_id):
+            return False
+        self.fight_cache.saveAll(new_fights)
+        self.fight_index.add_fight_lines(new_fights)
+        for fight in new_fights:
+            self.fighter_identity.learn(fight.get("fighter_id"), fight.get("fighter"))
+        self.rating_service.apply_fight(fight_id)
+        return True
+
+    def _saveUpcomingCard(self, event_id: str, event_info: List[Dict]) -> bool:
+        scraped_at = datetime.now().isoformat(timespec="seconds")
+        scheduled = [row for row in event_info if not row.get("fight_id")]
+        bouts = [
+            ScheduledBout(
+                event_id=event_id,
+                bout_order=order,
+                fighter_a=row.get("winner_name", ""),
+                fighter_b=row.get("loser_name", ""),
+                weight_class=row.get("weight_class", ""),
+                scraped_at=scraped_at,
+            )
+            for order, row in enumerate(scheduled)
+        ]
+        return self.upcoming_cards.save_card(bouts, event_id=event_id, scraped_at=scraped_at)
+
+    def _oddsMarket(self, ticker: str, fighter: str, fight_date: str, event_id: str, known: OddsMarket = None) -> OddsMarket:
+        # Resolved when the market is first seen and again on each pull until its card is
+        # scraped and the fighter is found; the card narrows bare or odd spellings
+        event_id = event_id or (known.event_id if known else "")
+        card = self.upcoming_cards.get_card(event_id) if event_id else []
+        candidates = {
+            fighter_id
+            for bout in card
+            for fighter_id in self.fighter_identity.resolve_all([bout.fighter_a, bout.fighter_b]).values()
+            if fighter_id
+        }
+        fighter_id = self.fighter_identity.resolve(fighter, candidates or None) or (known.fighter_id if known else "")
+        return OddsMarket(ticker, ticker.rsplit("-", 1)[0], event_id, fight_date, fighter, fighter_id)
+
+    def _upcomingEventsByDate(self) -> Dict[str, str]:
+        today = date.today()
+        by_date = {}
+        for event in self.event_cache.all():
+            event_date = parse_event_date(field_of(event, "event_date"))
+            if event_date is not None and event_date >= today:
+                by_date[event_date.isoformat()] = field_of(event, "event_id")
+        return by_date
+
+    def _knownEventIds(self) -> Set[str]:
+        existing_event_ids: Set[str] = {field_of(event, "event_id") for event in self.event_cache.all()}
+        print(f"Existing events in cache: {len(existing_event_ids)}")
+        return existing_event_ids
+
+    def _eventsInWindow(self, today: date) -> List[tuple]:
+        # Past events newer than the watermark less the recent window, oldest first
+        start = self.watermark.complete_through - timedelta(days=self.RECENT_WINDOW_DAYS) if self.watermark.complete_through else date.min
+        dated = (
+            (parse_event_date(field_of(event, "event_date")), field_of(event, "event_id"))
+            for event in self.event_cache.all()
+        )
+        return sorted((d, e) for d, e in dated if d is not None and start < d < today)
+
+    def _fightIdsOf(self, event_id: str) -> List[str]:
+        return [field_of(info, "fight_id") for info in self.event_info_cache.get_event(event_id) if field_of(info, "fight_id")]
+
+    def _isSettled(self, event_id: str) -> bool:
+        # Complete, or every missing piece has been given up on
+        if not self.event_info_cache.get_event(event_id):
+            return self.watermark.is_unavailable("events", event_id)
+        return all(
+            self.fight_cache.hasFight(fight_id) or self.watermark.is_unavailable("fights", fight_id)
+            for fight_id in self._fightIdsOf(event_id)
+        )
+
+    def _advanceWatermark(self, window: List[tuple], today: date) -> Optional[date]:
+        # The watermark moves up to the last event before the first unsettled one
+        through = self.watermark.complete_through
+        for event_date, event_id in window:
+            if not self._isSettled(event_id):
+                break
+            through = event_date if through is None else max(through, event_date)
+        return through
+
+    def _saveReport(self, report: RefreshReport) -> None:
+        # Write then rename so a reader never sees a half-written report
+        tmp_path = f"{self.report_json}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(asdict(report), f, indent=2)
+        os.replace(tmp_path, self.report_json)
+
+    @staticmethod
+    def _isoformat(value: Optional[date]) -> Optional[str]:
+        return value.isoformat() if value else None
@@ -0,0 +1,155 @@
+"""
+Refresh worker: runs the scheduled scrape/refresh jobs outside the API process.
+
+The API launches it as a subprocess (REFRESH_MODE=process, the default), or it
+runs standalone, e.g. as its own service next to an API started with
+REFRESH_MODE=external:
+
+    cd data && PYTHONPATH=.:../data_model/src python RefreshWorker.py [--once]
+
+After a job appends rows to the CSVs the worker bumps the shared data version
+file; the API's DataReloader then applies just the new rows. A /refresh call on
+the API leaves a refresh request file, which the worker picks up within
+REQUEST_POLL_SECONDS.
+"""
+
+import argparse
+import datetime
+import os
+import signal
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, List
+
+BASE_DIR = Path(__file__).resolve().parent
+REPO_ROOT = BASE_DIR.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from apscheduler.schedulers.blocking import BlockingScheduler
+
+from DataPaths import (
+    DATA_VERSION_JSON, EVENT_CSV, EVENT_INFO_CSV, FIGHT_CSV, FIGHTER_ALIAS_CSV, ODDS_DIR,
+    REFRESH_REPORT_JSON, REFRESH_REQUEST_JSON, REFRESH_WATERMARK_JSON, UPCOMING_CARDS_CSV,
+)
+from cache.DataVersion import DataVersion
+from cache.EventCache import EventCache
+from cache.EventInfoCache import EventInfoCache
+from cache.FightCache import FightCache
+from cache.FightIndex import FightIndex
+from cache.FighterAliasCache import FighterAliasCache
+from cache.OddsStore import OddsStore
+from cache.RefreshRequest import RefreshRequest
+from cache.RefreshWatermark import RefreshWatermark
+from cache.UpcomingCardCache import UpcomingCardCache
+from FighterIdentityService import FighterIdentityService
+from RatingService import RatingService
+from RefreshDataService import ODDS_SAMPLE_MINUTES, RefreshDataService
+from scrapers.ScraperService import ScraperService
+
+WATCHED_FILES = [EVENT_CSV, EVENT_INFO_CSV, FIGHT_CSV, UPCOMING_CARDS_CSV]
+# How often the worker checks for a refresh requested through the API
+REQUEST_POLL_SECONDS = 10
+
+
+class RefreshWorker:
+
+    def __init__(self, refresh_service: RefreshDataService, data_version: DataVersion,
+                 refresh_request: RefreshRequest = None, watched_files: List[Path] = None):
+        self.refresh_service = refresh_service
+        self.data_version = data_version
+        self.refresh_request = refresh_request
+        self.watched_files = watched_files or WATCHED_FILES
+        # A requested refresh must not overlap the scheduled run of the same job
+        self._job_locks: Dict[str, threading.Lock] = {name: threading.Lock() for name in self.jobs()}
+
+    def run_job(self, name: str, job) -> None:
+        with self._job_locks.setdefault(name, threading.Lock()):
+            before = self._sizes()
+            try:
+                job()
+            except Exception as e:
+                print(f"Refresh job {name} failed: {e}")
+            # Also after a failure: whatever was appended before it is complete rows
+            if self._sizes() != before:
+                version = self.data_version.bump(name)
+                print(f"Refresh job {name} changed the data; data version is now {version}")
+
+    def run_requested(self) -> bool:
+        """Run refreshFightData if the API has requested it; returns whether it ran."""
+        request = self.refresh_request.take() if self.refresh_request is not None else None
+        if request is None:
+            return False
+        print(f"Refresh requested at {request.get('requested_at')}")
+        self.run_job("refreshFightData", self.refresh_service.refreshFightData)
+        return True
+
+    def jobs(self) -> Dict[str, object]:
+        return {
+            "refreshFightData": self.refresh_service.refreshFightData,
+            "reloadIncompleteData": self.refresh_service.reloadIncompleteData,
+            "refreshUpcomingCards": self.refresh_service.refreshUpcomingCards,
+            "recordOdds": self.refresh_service.recordOdds,
+            "downsampleOdds": self.refresh_service.downsampleOdds,
+        }
+
+    def run_once(self) -> None:
+        # refreshFightData runs below anyway, which answers any pending request
+        if self.refresh_request is not None:
+            self.refresh_request.take()
+        for name, job in self.jobs().items():
+            self.run_job(name, job)
+
+    def run_forever(self) -> None:
+        scheduler = BlockingScheduler()
+        now = datetime.datetime.now()
+        jobs = self.jobs()
+        scheduler.add_job(self.run_job, 'interval', args=["refreshFightData", jobs["refreshFightData"]], hours=1, next_run_time=now)
+        scheduler.add_job(self.run_job, 'interval', args=["reloadIncompleteData", jobs["reloadIncompleteData"]], hours=24, next_run_time=now)
+        # Upcoming cards change as bouts are added or fall through; event pages are cached for 6 hours
+        scheduler.add_job(self.run_job, 'interval', args=["refreshUpcomingCards", jobs["refreshUpcomingCards"]], hours=6, next_run_time=now)
+        # The API reads the odds store directly; samples need no data version bump
+        scheduler.add_job(self.run_job, 'interval', args=["recordOdds", jobs["recordOdds"]], minutes=ODDS_SAMPLE_MINUTES, next_run_time=now)
+        scheduler.add_job(self.run_job, 'interval', args=["downsampleOdds", jobs["downsampleOdds"]], hours=24)
+        if self.refresh_request is not None:
+            scheduler.add_job(self.run_requested, 'interval', seconds=REQUEST_POLL_SECONDS)
+
+        # The API stops the worker with SIGTERM on shutdown
+        signal.signal(signal.SIGTERM, lambda *_: scheduler.shutdown(wait=False))
+        print(f"Refresh worker started (pid {os.getpid()})")
+        try:
+            scheduler.start()
+        except (KeyboardInterrupt, SystemExit):
+            pass
+
+    def _sizes(self) -> Dict[str, int]:
+        return {str(path): path.stat().st_size if path.exists() else 0 for path in self.watched_files}
+
+
+def build_worker() -> RefreshWorker:
+    event_cache = EventCache(str(EVENT_CSV))
+    event_info_cache = EventInfoCache(str(EVENT_INFO_CSV))
+    fight_cache = FightCache(str(FIGHT_CSV))
+    fight_index = FightIndex(event_cache, event_info_cache, fight_cache)
+    fighter_identity = FighterIdentityService(fight_cache, FighterAliasCache(str(FIGHTER_ALIAS_CSV)), fight_index)
+    refresh_service = RefreshDataService(
+        fight_cache, event_cache, event_info_cache, ScraperService(), fight_index, fighter_identity,
+        RatingService(fight_index), RefreshWatermark(str(REFRESH_WATERMARK_JSON)), UpcomingCardCache(str(UPCOMING_CARDS_CSV)),
+        odds_store=OddsStore(str(ODDS_DIR)), report_json=str(REFRESH_REPORT_JSON),
+    )
+    return RefreshWorker(refresh_service, DataVersion(str(DATA_VERSION_JSON)), RefreshRequest(str(REFRESH_REQUEST_JSON)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the scheduled data refresh jobs")
+    parser.add_argument("--once", action="store_true", help="run every job once and exit")
+    args = parser.parse_args()
+
+    worker = build_worker()
+    if args.once:
+        worker.run_once()
+    else:
+        worker.run_forever()
@@ -15,12 +15,28 @@ from fastapi import HTTPException
 from fastapi.responses import PlainTextResponse
 
 from FightDataResource import FightDataResource
+from DataPaths import (
+    DATA_VERSION_JSON, EVENT_CSV, EVENT_INFO_CSV, FIGHT_CSV, FIGHTER_ALIAS_CSV, FIGHTER_VECTORS_CSV, ODDS_DIR,
+    REFRESH_REPORT_JSON, REFRESH_REQUEST_JSON, REFRESH_WATERMARK_JSON, UPCOMING_CARDS_CSV,
+)
 from cache.EventCache import EventCache
 from cache.EventInfoCache import EventInfoCache
 from cache.FightCache import FightCache
+from cache.FightIndex import FightIndex
+from cache.FighterAliasCache import FighterAliasCache
+from cache.DataVersion import DataVersion
+from cache.OddsStore import OddsStore
+from cache.RefreshRequest import RefreshRequest
+from cache.RefreshWatermark import RefreshWatermark
+from cache.UpcomingCardCache import UpcomingCardCache
+from FighterIdentityService import FighterIdentityService
+from RatingService import RatingService
+from DivisionStatsService import DivisionStatsService
 from FightDataService import FightDataService
 from RefreshDataService import RefreshDataService
+from DataReloader import DataReloader
 from scrapers.ScraperService import ScraperService
+from scrapers.ScraperUtil import scrape_stats
 
 # Make model subpackages importable as top-level "style" / "fight" packages
 MODEL_DIR = REPO_ROOT / "model"
@@ -28,19 +44,25 @@ if str(MODEL_DIR) not in sys.path:
     sys.path.insert(0, str(MODEL_DIR))
 
 
-EVENT_CSV = REPO_ROOT / "resources" / "initial_data" / "events.csv"
-EVENT_INFO_CSV = REPO_ROOT / "resources" / "initial_data" / "events-info.csv"
-FIGHT_CSV = REPO_ROOT / "resources" / "initial_data" / "fights.csv"
-
-
 event_cache = EventCache(str(EVENT_CSV))
 event_info_cache = EventInfoCache(str(EVENT_INFO_CSV))
 fight_cache = FightCache(str(FIGHT_CSV))
-
-fight_service = FightDataService(event_cache, event_info_cache, fight_cache)
+# One join index shared by the read endpoints and the refresh jobs
+fight_index = FightIndex(event_cache, event_info_cache, fight_cache)
+fighter_identity = FighterIdentityService(fight_cache, FighterAliasCache(str(FIGHTER_ALIAS_CSV)), fight_index)
+rating_service = RatingService(fight_index)
+division_stats = DivisionStatsService(str(FIGHTER_VECTORS_CSV))
+upcoming_cards = UpcomingCardCache(str(UPCOMING_CARDS_CSV))
+# Written by the refresh jobs, read by /odds/history
+odds_store = OddsStore(str(ODDS_DIR))
+
+fight_service = FightDataService(event_cache, event_info_cache, fight_cache, fight_index, fighter_identity, rating_service, division_stats, upcoming_cards, oddsStore=odds_store)
 scraper_service = ScraperService()
-refresh_service = RefreshDataService(fight_cache, event_cache, event_info_cache, scraper_service)
-resource = FightDataResource(fight_service, refresh_service, enable_background_refresh=True)
+refresh_service = RefreshDataService(fight_cache, event_cache, event_info_cache, scraper_service, fight_index, fighter_identity, rating_service, RefreshWatermark(str(REFRESH_WATERMARK_JSON)), upcoming_cards, odds_store=odds_store, report_json=str(REFRESH_REPORT_JSON))
+# Applies rows written by the refresh worker process to the caches above
+data_reloader = DataReloader(DataVersion(str(DATA_VERSION_JSON)), event_cache, event_info_cache, fight_cache, fight_index, fighter_identity, rating_service, upcoming_cards)
+# /refresh hands off to the refresh worker through this file unless REFRESH_MODE=inline
+resource = FightDataResource(fight_service, refresh_service, enable_background_refresh=True, dataReloader=data_reloader, refreshRequest=RefreshRequest(str(REFRESH_REQUEST_JSON)))
 app = resource.app
 
 # Register prediction endpoints with lazy model loading to reduce startup memory.
@@ -153,6 +175,10 @@ def get_meta():
             "eventInfoGroups": len(event_info_cache.all()),
             "fightGroups": len(fight_cache.all()),
         },
+        # Bumped by the refresh worker each time it appends rows
+        "dataVersion": data_reloader.data_version.read(),
+        # Scraper request, retry and HTML cache counters since startup
+        "scraper": scrape_stats.snapshot(),
     }
 
 
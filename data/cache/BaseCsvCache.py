@@ -24,6 +24,10 @@ class BaseCsvCache(ABC, Generic[K, T]):
         self._data: Dict[K, T] = {}
         self._df: pd.DataFrame = pd.DataFrame()
 
+    @property
+    def csv_path(self) -> str:
+        return self._csv_path
+
     def load(self) -> None:
         with self._lock:
             if self._loaded:
@@ -1,4 +1,6 @@
 import csv
+import os
+from typing import Dict, Iterable, List
 
 def dedupe_csv(input_path: str, output_path: str) -> None:
     seen = set()
@@ -17,3 +19,31 @@ def dedupe_csv(input_path: str, output_path: str) -> None:
             if row_tuple not in seen:
                 seen.add(row_tuple)
                 writer.writerow(row)
+
+
+def ensure_trailing_newline(path: str) -> None:
+    """
+    Appending to a file whose last row has no line break glues the next row
+    onto it (fights.csv once lost a row this way), so add the break first.
+    """
+    try:
+        with open(path, "rb+") as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() == 0:
+                return
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) not in (b"\n", b"\r"):
+                f.write(b"\n")
+    except FileNotFoundError:
+        pass
+
+
+def append_rows(path: str, fieldnames: List[str], rows: Iterable[Dict]) -> None:
+    """Append rows to a CSV in one write, adding the header to a new or empty file."""
+    ensure_trailing_newline(path)
+    file_empty = (not os.path.exists(path)) or os.path.getsize(path) == 0
+    with open(path, "a", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        if file_empty:
+            writer.writeheader()
+        writer.writerows(rows)
@@ -0,0 +1,52 @@
+from __future__ import annotations
+import json
+import os
+from datetime import datetime
+from threading import RLock
+from typing import Optional
+
+
+class DataVersion:
+    """
+    Data version shared by the refresh worker and the API through a small
+    JSON file. The worker bumps it once a job has finished appending rows;
+    the API polls it (one stat per poll) and picks up the new rows when it
+    moves.
+    """
+
+    def __init__(self, json_path: str):
+        self._json_path = json_path
+        self._lock = RLock()
+        self._mtime_ns: Optional[int] = None
+        self._version = 0
+
+    @property
+    def path(self) -> str:
+        return self._json_path
+
+    def read(self) -> int:
+        with self._lock:
+            try:
+                mtime_ns = os.stat(self._json_path).st_mtime_ns
+            except FileNotFoundError:
+                return self._version
+            if mtime_ns != self._mtime_ns:
+                try:
+                    with open(self._json_path, "r", encoding="utf-8") as f:
+                        self._version = int(json.load(f).get("version", 0))
+                    self._mtime_ns = mtime_ns
+                except (OSError, ValueError):
+                    # Caught mid-replace; the next poll reads it
+                    pass
+            return self._version
+
+    def bump(self, reason: str = "") -> int:
+        with self._lock:
+            version = self.read() + 1
+            state = {"version": version, "updated_at": datetime.now().isoformat(timespec="seconds"), "reason": reason}
+            tmp_path = f"{self._json_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self._json_path)
+            self._version = version
+            return version
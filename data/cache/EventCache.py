@@ -1,5 +1,7 @@
 import csv
+from typing import List
 from cache.BaseCsvCache import BaseCsvCache
+from cache.CsvUtil import append_rows
 from data_model.Event import Event
 
 class EventCache(BaseCsvCache[str, Event]):
@@ -25,22 +27,22 @@ class EventCache(BaseCsvCache[str, Event]):
 
     def append_to_csv(self, value: Event) -> None:
         # append-only persist (no rewrite)
+        self.append_all_to_csv([value])
+
+    def append_all_to_csv(self, events: List[Event]) -> None:
         with self._lock:
-            file_has_rows = False
-            try:
-                with open(self._csv_path, "r", newline="", encoding="utf-8") as f:
-                    file_has_rows = f.read(1) != ""
-            except FileNotFoundError:
-                pass
+            append_rows(self._csv_path, self.FIELDS, (
+                {
+                    "event_id": event["event_id"],
+                    "event_name": event["event_name"],
+                    "event_date": event["event_date"],
+                    "event_location": event["event_location"],
+                    "event_url": event["event_url"],
+                }
+                for event in events
+            ))
 
-            with open(self._csv_path, "a", newline="", encoding="utf-8") as f:
-                writer = csv.DictWriter(f, fieldnames=self.FIELDS)
-                if not file_has_rows:
-                    writer.writeheader()
-                writer.writerow({
-                    "event_id": value["event_id"],
-                    "event_name": value["event_name"],
-                    "event_date": value["event_date"],
-                    "event_location": value["event_location"],
-                    "event_url": value["event_url"],
-                })
+    def saveAll(self, events: List[Event]) -> None:
+        for event in events:
+            self.upsert(event)
+        self.append_all_to_csv(events)
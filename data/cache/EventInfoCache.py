@@ -1,8 +1,8 @@
 from __future__ import annotations
 from typing import Dict, List, Optional
 import csv
-import os
 from cache.BaseCsvCache import BaseCsvCache
+from cache.CsvUtil import append_rows
 from data_model.EventInfo import EventInfo
 
 class EventInfoCache(BaseCsvCache[str, List[EventInfo]]):
@@ -35,7 +35,7 @@ class EventInfoCache(BaseCsvCache[str, List[EventInfo]]):
         """
         self.load()
         with self._lock:
-            self._data.setdefault(info["event_id"], []).append(info)
+            self._data.setdefault(info.event_id, []).append(info)
 
     def get_event(self, event_id: str) -> List[EventInfo]:
         """
@@ -65,37 +65,35 @@ class EventInfoCache(BaseCsvCache[str, List[EventInfo]]):
         """
         Append a batch of EventInfo rows to the CSV (append-only).
         """
-        self.load()
-        with self._lock:
-            file_exists = os.path.exists(self._csv_path)
-            file_empty = (not file_exists) or (os.path.getsize(self._csv_path) == 0)
-
-            with open(self._csv_path, "a", newline="", encoding="utf-8") as f:
-                writer = csv.DictWriter(f, fieldnames=self.FIELDS)
-                if file_empty:
-                    writer.writeheader()
-
-                writer.writerow(self._info_to_row(value))
+        self.append_lines_to_csv([value])
 
     def append_line_to_csv(self, info: EventInfo) -> None:
         """
         Convenience: append a single EventInfo row to the CSV (append-only).
         """
+        self.append_lines_to_csv([info])
+
+    def append_lines_to_csv(self, infos: List[EventInfo]) -> None:
+        """
+        Append many EventInfo rows in one write (append-only).
+        """
         self.load()
         with self._lock:
-            file_exists = os.path.exists(self._csv_path)
-            file_empty = (not file_exists) or (os.path.getsize(self._csv_path) == 0)
+            append_rows(self._csv_path, self.FIELDS, (self._info_to_row(info) for info in infos))
 
-            with open(self._csv_path, "a", newline="", encoding="utf-8") as f:
-                writer = csv.DictWriter(f, fieldnames=self.FIELDS)
-                if file_empty:
-                    writer.writeheader()
-                writer.writerow(self._info_to_row(info))
+    def save(self, value) -> None:
+        # List-per-key: append into the event bucket instead of replacing it.
+        # Scrapers hand us dicts, so convert to EventInfo like FightCache.saveAll does.
+        info = value if isinstance(value, EventInfo) else self._row_to_info(value)
+        self.upsert_line(info)
+        self.append_line_to_csv(info)
 
     def saveAll(self, events: List[Dict]) -> None:
-        for event in events:
-            print(f"Saving event info {event} to EventInfoCache")
-            self.save(event)
+        print(f"Saving {len(events)} event info rows to EventInfoCache")
+        infos = [event if isinstance(event, EventInfo) else self._row_to_info(event) for event in events]
+        for info in infos:
+            self.upsert_line(info)
+        self.append_lines_to_csv(infos)
 
     # -------- helpers --------
 
@@ -133,13 +131,13 @@ class EventInfoCache(BaseCsvCache[str, List[EventInfo]]):
     @staticmethod
     def _info_to_row(info: EventInfo) -> Dict[str, object]:
         return {
-            "event_id": info["event_id"],
-            "fight_id": info["fight_id"] or "",
-            "winner_name": info["winner_name"],
-            "loser_name": info["loser_name"],
-            "weight_class": info["weight_class"],
-            "method": info["method"] or "",
-            "round": "" if info["round"] is None else info["round"],
-            "time": info["time"] or "",
-            "fight_url": info["fight_url"] or "",
+            "event_id": info.event_id,
+            "fight_id": info.fight_id or "",
+            "winner_name": info.winner_name,
+            "loser_name": info.loser_name,
+            "weight_class": info.weight_class,
+            "method": info.method or "",
+            "round": "" if info.round is None else info.round,
+            "time": info.time or "",
+            "fight_url": info.fight_url or "",
         }
@@ -2,9 +2,8 @@ from __future__ import annotations
 from typing import Dict, List, Optional
 from data_model.FightStatLine import FightStatLine
 import csv
-import os
 from cache.BaseCsvCache import BaseCsvCache
-import pandas as pd
+from cache.CsvUtil import append_rows
 
 
 class FightCache(BaseCsvCache[str, List[FightStatLine]]):
@@ -19,10 +18,6 @@ class FightCache(BaseCsvCache[str, List[FightStatLine]]):
         "leg", "distance", "clinch", "ground",
     ]
 
-    FIGHTER_NAME_MAP = {
-        "patricio pitbull": "Patricio Freire"
-    }
-
     def key_of(self, value: FightStatLine) -> str:
         if not value:
             raise ValueError("Cannot cache an empty list of FightStatLine")
@@ -45,14 +40,6 @@ class FightCache(BaseCsvCache[str, List[FightStatLine]]):
         self.load()
         with self._lock:
             return list(self._data.get(fight_id, []))
-        
-    def get_fighter_id(self, fighter_name: str) -> str:
-        self.load()
-        with self._lock:
-            if fighter_name.lower() in self.FIGHTER_NAME_MAP:
-                fighter_name = self.FIGHTER_NAME_MAP[fighter_name.lower()]
-            rows = self._df.loc[self._df['fighter'] == fighter_name, 'fighter_id']
-            return rows.values[0] if len(rows) > 0 else ""
 
     def _load_from_csv(self, csv_path: str) -> None:
         with open(csv_path, "r", newline="", encoding="utf-8") as f:
@@ -63,53 +50,38 @@ class FightCache(BaseCsvCache[str, List[FightStatLine]]):
             if missing:
                 raise ValueError(f"CSV missing required columns: {sorted(missing)}")
 
-            lines = []
             for row in reader:
                 fight_id = (row.get("fight_id") or "").strip()
                 if not fight_id:
                     continue
-                line = self._row_to_line(row)
-                lines.append(line)
-                self._data.setdefault(fight_id, []).append(line)
-            self._df = pd.DataFrame(lines)
+                self._data.setdefault(fight_id, []).append(self._row_to_line(row))
 
     def append_to_csv(self, value: FightStatLine) -> None:
         """
         Append a batch of stat lines to the CSV (append-only).
         """
-        self.load()
-        with self._lock:
-            file_exists = os.path.exists(self._csv_path)
-            file_empty = (not file_exists) or (os.path.getsize(self._csv_path) == 0)
-
-            with open(self._csv_path, "a", newline="", encoding="utf-8") as f:
-                writer = csv.DictWriter(f, fieldnames=self.FIELDS)
-                if file_empty:
-                    writer.writeheader()
-
-                writer.writerow(self._line_to_row(value))
+        self.append_lines_to_csv([value])
 
     def append_line_to_csv(self, line: FightStatLine) -> None:
         """
         Convenience: append a single line to the CSV (append-only).
         """
+        self.append_lines_to_csv([line])
+
+    def append_lines_to_csv(self, lines: List[FightStatLine]) -> None:
+        """
+        Append many lines in one write (append-only).
+        """
         self.load()
         with self._lock:
-            file_exists = os.path.exists(self._csv_path)
-            file_empty = (not file_exists) or (os.path.getsize(self._csv_path) == 0)
-
-            with open(self._csv_path, "a", newline="", encoding="utf-8") as f:
-                writer = csv.DictWriter(f, fieldnames=self.FIELDS)
-                if file_empty:
-                    writer.writeheader()
-                writer.writerow(self._line_to_row(line))
+            append_rows(self._csv_path, self.FIELDS, (self._line_to_row(line) for line in lines))
 
     def saveAll(self, fights: List[Dict]) -> None:
-        for fight in fights:
-            print(f"Saving fight {fight} to FightCache")
-            line = self._row_to_line(fight)
+        print(f"Saving {len(fights)} fight lines to FightCache")
+        lines = [self._row_to_line(fight) for fight in fights]
+        for line in lines:
             self.upsert_line(line)
-            self.append_line_to_csv(line)
+        self.append_lines_to_csv(lines)
 
     def hasFight(self, fight_id: str) -> bool:
         return len(self.get_fight(fight_id)) > 0
@@ -157,22 +129,22 @@ class FightCache(BaseCsvCache[str, List[FightStatLine]]):
     @staticmethod
     def _line_to_row(line: FightStatLine) -> Dict[str, object]:
         return {
-            "fight_id": line["fight_id"],
-            "fighter_id": line["fighter_id"],
-            "fighter": line["fighter"],
-            "kd": "" if line["kd"] is None else line["kd"],
-            "sig_str": line["sig_str"],
-            "sig_str_pct": line["sig_str_pct"],
-            "total_str": line["total_str"],
-            "td": line["td"],
-            "td_pct": line["td_pct"],
-            "sub_att": "" if line["sub_att"] is None else line["sub_att"],
-            "rev": "" if line["rev"] is None else line["rev"],
-            "ctrl": line["ctrl"],
-            "head": line["head"],
-            "body": line["body"],
-            "leg": line["leg"],
-            "distance": line["distance"],
-            "clinch": line["clinch"],
-            "ground": line["ground"],
+            "fight_id": line.fight_id,
+            "fighter_id": line.fighter_id,
+            "fighter": line.fighter,
+            "kd": "" if line.kd is None else line.kd,
+            "sig_str": line.sig_str,
+            "sig_str_pct": line.sig_str_pct,
+            "total_str": line.total_str,
+            "td": line.td,
+            "td_pct": line.td_pct,
+            "sub_att": "" if line.sub_att is None else line.sub_att,
+            "rev": "" if line.rev is None else line.rev,
+            "ctrl": line.ctrl,
+            "head": line.head,
+            "body": line.body,
+            "leg": line.leg,
+            "distance": line.distance,
+            "clinch": line.clinch,
+            "ground": line.ground,
         }
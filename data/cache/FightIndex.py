@@ -0,0 +1,299 @@
+from __future__ import annotations
+from bisect import insort
+from datetime import date, datetime
+from threading import RLock
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+import pandas as pd
+
+from cache.EventCache import EventCache
+from cache.EventInfoCache import EventInfoCache
+from cache.FightCache import FightCache
+from cache.NameUtil import normalize_name
+
+EVENT_DATE_FORMAT = "%B %d, %Y"
+
+
+class FighterFight(NamedTuple):
+    event_date: Optional[date]
+    fight_id: str
+    outcome: Optional[int]
+
+
+class Bout(NamedTuple):
+    event_date: date
+    fight_id: str
+    winner_id: str
+    loser_id: str
+
+
+def parse_event_date(value) -> Optional[date]:
+    """Parse ufcstats event dates ("January 24, 2026"); ISO dates are also accepted."""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    s = str(value).strip()
+    if not s:
+        return None
+    for fmt in (EVENT_DATE_FORMAT, "%Y-%m-%d"):
+        try:
+            return datetime.strptime(s, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def field_of(obj, name: str):
+    # Caches hold dataclasses when loaded from CSV but dicts when saved from scrapers
+    if isinstance(obj, dict):
+        return obj.get(name)
+    return getattr(obj, name, None)
+
+
+def _as_rows(bucket) -> list:
+    if bucket is None:
+        return []
+    if isinstance(bucket, list):
+        return bucket
+    return [bucket]
+
+
+class FightIndex:
+    """
+    Relational index across the Event, EventInfo and Fight caches.
+
+      fight_id   -> event_id -> event_date
+      event_id   -> {fight_id}
+      fight_id   -> EventInfo row
+      fighter_id -> [(event_date, fight_id, outcome)] sorted by date
+
+    Built lazily from the caches on first access and kept current through the
+    add_* methods, so the API and the cleaning pipeline answer joins with dict
+    lookups instead of scanning the CSVs.
+    """
+
+    def __init__(self, event_cache: EventCache, event_info_cache: EventInfoCache, fight_cache: FightCache):
+        self.event_cache = event_cache
+        self.event_info_cache = event_info_cache
+        self.fight_cache = fight_cache
+        self._lock = RLock()
+        self._loaded = False
+        self._event_dates: Dict[str, Optional[date]] = {}
+        self._fight_events: Dict[str, str] = {}
+        self._event_fights: Dict[str, Set[str]] = {}
+        self._fight_infos: Dict[str, object] = {}
+        self._fight_fighters: Dict[str, List[Tuple[str, str]]] = {}
+        self._fighter_fights: Dict[str, List[FighterFight]] = {}
+        self._fighter_dates: Dict[Tuple[str, date], str] = {}
+
+    @classmethod
+    def from_csv(cls, event_csv: str, event_info_csv: str, fight_csv: str) -> "FightIndex":
+        return cls(EventCache(event_csv), EventInfoCache(event_info_csv), FightCache(fight_csv))
+
+    def load(self) -> None:
+        with self._lock:
+            if self._loaded:
+                return
+            for event in self.event_cache.all():
+                self._index_event(event)
+            for bucket in self.event_info_cache.all():
+                for info in _as_rows(bucket):
+                    self._index_event_info(info)
+            for lines in self.fight_cache.all():
+                self._index_fight_lines(_as_rows(lines))
+            self._loaded = True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._event_dates.clear()
+            self._fight_events.clear()
+            self._event_fights.clear()
+            self._fight_infos.clear()
+            self._fight_fighters.clear()
+            self._fighter_fights.clear()
+            self._fighter_dates.clear()
+            self._loaded = False
+
+    # ---- Lookups ----
+
+    def event_of(self, fight_id: str) -> Optional[str]:
+        self.load()
+        with self._lock:
+            return self._fight_events.get(fight_id)
+
+    def event_date(self, event_id: str) -> Optional[date]:
+        self.load()
+        with self._lock:
+            return self._event_dates.get(event_id)
+
+    def fight_date(self, fight_id: str) -> Optional[date]:
+        self.load()
+        with self._lock:
+            return self._event_dates.get(self._fight_events.get(fight_id))
+
+    def event_info_of(self, fight_id: str):
+        self.load()
+        with self._lock:
+            return self._fight_infos.get(fight_id)
+
+    def fights_of(self, fighter_id: str) -> List[FighterFight]:
+        self.load()
+        with self._lock:
+            return list(self._fighter_fights.get(fighter_id, []))
+
+    def fight_id_for(self, fighter_id: str, on_date) -> Optional[str]:
+        """Return the fight a fighter had on a given event date, if any."""
+        self.load()
+        with self._lock:
+            return self._fighter_dates.get((fighter_id, parse_event_date(on_date)))
+
+    def bout(self, fight_id: str) -> Optional[Bout]:
+        """The dated, decided result of a fight, or None (no date, stats or clear winner)."""
+        self.load()
+        with self._lock:
+            return self._bout(fight_id)
+
+    def bouts(self) -> List[Bout]:
+        """Every dated, decided fight in (event_date, fight_id) order."""
+        self.load()
+        with self._lock:
+            bouts = [self._bout(fight_id) for fight_id in self._fight_events]
+        return sorted((b for b in bouts if b is not None), key=lambda b: (b.event_date, b.fight_id))
+
+    def fight_event_frame(self) -> pd.DataFrame:
+        """
+        One row per fight_id with its event_id, event_date (datetime64) and result
+        columns, for pipeline code that joins with a vectorized merge.
+        """
+        self.load()
+        with self._lock:
+            rows = [
+                {
+                    "fight_id": fight_id,
+                    "event_id": event_id,
+                    "event_date": self._event_dates.get(event_id),
+                    "winner_name": field_of(self._fight_infos.get(fight_id), "winner_name"),
+                    "loser_name": field_of(self._fight_infos.get(fight_id), "loser_name"),
+                    "weight_class": field_of(self._fight_infos.get(fight_id), "weight_class"),
+                    "method": field_of(self._fight_infos.get(fight_id), "method"),
+                }
+                for fight_id, event_id in self._fight_events.items()
+            ]
+        df = pd.DataFrame(rows, columns=["fight_id", "event_id", "event_date", "winner_name", "loser_name", "weight_class", "method"])
+        df["event_date"] = pd.to_datetime(df["event_date"])
+        return df
+
+    def fighter_date_frame(self) -> pd.DataFrame:
+        """
+        One row per (fighter_id, event_date) with the fight_id fight_id_for
+        returns for it, for joining dated per-fighter rows to their fights.
+        """
+        self.load()
+        with self._lock:
+            rows = [(fighter_id, fight_date, fight_id) for (fighter_id, fight_date), fight_id in self._fighter_dates.items()]
+        df = pd.DataFrame(rows, columns=["fighter_id", "event_date", "fight_id"])
+        df["event_date"] = pd.to_datetime(df["event_date"])
+        return df
+
+    # ---- Incremental updates (call after the owning cache has saved the row) ----
+
+    def add_event(self, event) -> None:
+        with self._lock:
+            if self._loaded:
+                self._index_event(event)
+
+    def add_event_info(self, info) -> None:
+        with self._lock:
+            if self._loaded:
+                self._index_event_info(info)
+
+    def add_fight_lines(self, lines) -> None:
+        with self._lock:
+            if self._loaded:
+                self._index_fight_lines(_as_rows(lines))
+
+    # -------- helpers --------
+
+    def _index_event(self, event) -> None:
+        event_id = field_of(event, "event_id")
+        if not event_id:
+            return
+        self._event_dates[event_id] = parse_event_date(field_of(event, "event_date"))
+        # Fights indexed before their event row arrived now have a date
+        for fight_id in self._event_fights.get(event_id, ()):
+            self._reindex_fight(fight_id)
+
+    def _index_event_info(self, info) -> None:
+        fight_id = field_of(info, "fight_id")
+        event_id = field_of(info, "event_id")
+        if not fight_id or not event_id:
+            return
+        previous = self._fight_events.get(fight_id)
+        if previous is not None and previous != event_id:
+            self._event_fights[previous].discard(fight_id)
+        self._fight_events[fight_id] = event_id
+        self._event_fights.setdefault(event_id, set()).add(fight_id)
+        self._fight_infos[fight_id] = info
+        self._reindex_fight(fight_id)
+
+    def _index_fight_lines(self, lines: list) -> None:
+        for line in lines:
+            fight_id = field_of(line, "fight_id")
+            fighter_id = field_of(line, "fighter_id")
+            if not fight_id or not fighter_id:
+                continue
+            fighters = self._fight_fighters.setdefault(fight_id, [])
+            if all(fid != fighter_id for fid, _ in fighters):
+                fighters.append((fighter_id, field_of(line, "fighter") or ""))
+            self._reindex_fight(fight_id)
+
+    def _reindex_fight(self, fight_id: str) -> None:
+        fighters = self._fight_fighters.get(fight_id)
+        if not fighters:
+            return
+        fight_date = self._event_dates.get(self._fight_events.get(fight_id))
+        info = self._fight_infos.get(fight_id)
+        for fighter_id, name in fighters:
+            entries = self._fighter_fights.setdefault(fighter_id, [])
+            old_dates = {e.event_date for e in entries if e.fight_id == fight_id and e.event_date is not None}
+            entries[:] = [e for e in entries if e.fight_id != fight_id]
+            # A rescheduled event must not leave the old date resolving to this fight
+            for old_date in old_dates:
+                if self._fighter_dates.get((fighter_id, old_date)) == fight_id:
+                    others = [e.fight_id for e in entries if e.event_date == old_date]
+                    if others:
+                        self._fighter_dates[(fighter_id, old_date)] = others[-1]
+                    else:
+                        del self._fighter_dates[(fighter_id, old_date)]
+            insort(entries, FighterFight(fight_date, fight_id, self._outcome_of(name, info)), key=_sort_key)
+            if fight_date is not None:
+                self._fighter_dates[(fighter_id, fight_date)] = fight_id
+
+    def _bout(self, fight_id: str) -> Optional[Bout]:
+        fight_date = self._event_dates.get(self._fight_events.get(fight_id))
+        fighters = self._fight_fighters.get(fight_id, [])
+        info = self._fight_infos.get(fight_id)
+        if fight_date is None or len(fighters) != 2:
+            return None
+        outcomes = [self._outcome_of(name, info) for _, name in fighters]
+        if set(outcomes) != {0, 1}:
+            return None
+        winner, loser = (fighters[0], fighters[1]) if outcomes[0] == 1 else (fighters[1], fighters[0])
+        return Bout(fight_date, fight_id, winner[0], loser[0])
+
+    @staticmethod
+    def _outcome_of(fighter_name: str, info) -> Optional[int]:
+        if info is None:
+            return None
+        name = normalize_name(fighter_name)
+        if name == normalize_name(field_of(info, "winner_name")):
+            return 1
+        if name == normalize_name(field_of(info, "loser_name")):
+            return 0
+        return None
+
+
+def _sort_key(entry: FighterFight):
+    return (entry.event_date or date.min, entry.fight_id)
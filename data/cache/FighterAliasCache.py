@@ -0,0 +1,44 @@
+import csv
+import os
+from cache.BaseCsvCache import BaseCsvCache
+from cache.CsvUtil import append_rows
+from cache.NameUtil import normalize_name
+from data_model.FighterAlias import FighterAlias
+
+class FighterAliasCache(BaseCsvCache[str, FighterAlias]):
+    """
+    Manual fighter name overrides.
+    Key: normalized alias
+    Value: FighterAlias pointing the alias at a canonical fighter_id
+    """
+
+    FIELDS = ["alias", "fighter_id", "fighter"]
+
+    def key_of(self, value: FighterAlias) -> str:
+        return normalize_name(value.alias)
+
+    def _load_from_csv(self, csv_path) -> None:
+        if not os.path.exists(csv_path):
+            return
+        with open(csv_path, "r", newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                alias = (row.get("alias") or "").strip()
+                fighter_id = (row.get("fighter_id") or "").strip()
+                if not alias or not fighter_id:
+                    continue
+                value = FighterAlias(
+                    alias=alias,
+                    fighter_id=fighter_id,
+                    fighter=(row.get("fighter") or "").strip(),
+                )
+                self._data[self.key_of(value)] = value
+
+    def append_to_csv(self, value: FighterAlias) -> None:
+        # append-only persist (no rewrite)
+        with self._lock:
+            append_rows(self._csv_path, self.FIELDS, [{
+                "alias": value.alias,
+                "fighter_id": value.fighter_id,
+                "fighter": value.fighter,
+            }])
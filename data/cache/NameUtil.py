@@ -0,0 +1,26 @@
+import re
+import unicodedata
+
+NICKNAME_RE = re.compile(r"[\"“”].*?[\"“”]")
+NON_ALNUM_RE = re.compile(r"[^a-z0-9 ]+")
+SUFFIXES = {"jr", "sr", "ii", "iii", "iv"}
+# Letters NFKD does not decompose into an ASCII base
+TRANSLITERATE = str.maketrans({"ł": "l", "Ł": "L", "ø": "o", "Ø": "O", "đ": "d", "Đ": "D", "ß": "ss", "æ": "ae", "œ": "oe"})
+
+def normalize_name(name: str) -> str:
+    """
+    Canonical form used to join fighter names across sources:
+    accents folded, lowercased, quoted nicknames, punctuation and suffixes dropped.
+      'José "Shorty" Aldo Jr.' -> 'jose aldo'
+    """
+    if not name:
+        return ""
+    s = NICKNAME_RE.sub(" ", str(name))
+    s = unicodedata.normalize("NFKD", s.translate(TRANSLITERATE)).encode("ascii", "ignore").decode("ascii").lower()
+    s = s.replace("'", "").replace("-", " ").replace(".", " ")
+    s = NON_ALNUM_RE.sub(" ", s)
+    return " ".join(t for t in s.split() if t not in SUFFIXES)
+
+def token_key(name: str) -> str:
+    """Order-insensitive key so 'Zhang Weili' and 'Weili Zhang' collide."""
+    return " ".join(sorted(normalize_name(name).split()))
@@ -0,0 +1,291 @@
+from __future__ import annotations
+import csv
+import os
+import shutil
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+from cache.CsvUtil import append_rows
+
+DEFAULT_ODDS_DIR = Path(__file__).resolve().parents[2] / "resources" / "odds"
+
+# Column files of a day partition: name -> on-disk dtype
+COLUMNS = {
+    "ts": np.dtype("<u4"),      # epoch seconds (UTC)
+    "market": np.dtype("<i4"),  # row number in markets.csv
+    "yes": np.dtype("<f4"),     # yes ask, dollars; NaN when not quoted
+    "no": np.dtype("<f4"),      # no ask, dollars; NaN when not quoted
+}
+DOWNSAMPLED_MARKER = "downsampled"
+
+
+class OddsMarket(NamedTuple):
+    ticker: str
+    event_ticker: str
+    event_id: str
+    fight_date: str
+    fighter: str
+    fighter_id: str
+
+
+class OddsSample(NamedTuple):
+    market: OddsMarket
+    yes: Optional[float]
+    no: Optional[float]
+
+
+class OddsStore:
+    """
+    Append-only time series of Kalshi odds, one sample per market per pull.
+
+    Layout under root_dir:
+      markets.csv               one row per market; a market's code is its row number, and a
+                                later row for the same ticker updates its fields
+      YYYY-MM-DD/<column>.bin   one file per column of COLUMNS, samples of that UTC day
+
+    A sample is 16 bytes, so a card's markets sampled every minute cost about
+    a megabyte a day before downsampling. Days are read through np.memmap, so
+    range queries touch only the days and rows they return, and readers in
+    other processes see new samples without reloading. There must be a single
+    writer (the refresh worker).
+    """
+
+    FIELDS = list(OddsMarket._fields)
+
+    def __init__(self, root_dir: str = str(DEFAULT_ODDS_DIR)):
+        self.root_dir = Path(root_dir)
+        self._markets_path = self.root_dir / "markets.csv"
+        self._lock = threading.RLock()
+        self._markets: List[OddsMarket] = []
+        self._codes: Dict[str, int] = {}
+        self._markets_offset = 0
+        self._recovered = False
+
+    # ---- Lookups ----
+
+    def market(self, ticker: str) -> Optional[OddsMarket]:
+        with self._lock:
+            self._loadMarkets()
+            code = self._codes.get(ticker)
+            return self._markets[code] if code is not None else None
+
+    def markets(self) -> List[OddsMarket]:
+        with self._lock:
+            self._loadMarkets()
+            return [self._markets[code] for code in self._codes.values()]
+
+    def history(self,
+                fighter_id: str = None,
+                event_id: str = None,
+                ticker: str = None,
+                start: datetime = None,
+                end: datetime = None) -> pd.DataFrame:
+        """
+        Samples in [start, end) for the markets matching every given filter,
+        oldest first, with the market's fields alongside each sample.
+        """
+        with self._lock:
+            self._loadMarkets()
+            markets = list(self._markets)
+        codes = np.array([
+            code for code, m in enumerate(markets)
+            if (fighter_id is None or m.fighter_id == fighter_id)
+            and (event_id is None or m.event_id == event_id)
+            and (ticker is None or m.ticker == ticker)
+        ], dtype=np.int32)
+        columns = {name: [] for name in COLUMNS}
+        if len(codes):
+            lo_ts = int(start.timestamp()) if start else 0
+            hi_ts = int(end.timestamp()) if end else np.iinfo(np.uint32).max
+            for day in self._days(start, end):
+                part = self._readDay(day)
+                if part is None:
+                    continue
+                lo, hi = np.searchsorted(part["ts"], [lo_ts, hi_ts])
+                keep = lo + np.flatnonzero(np.isin(part["market"][lo:hi], codes))
+                for name in COLUMNS:
+                    columns[name].append(np.asarray(part[name][keep]))
+
+        data = {name: np.concatenate(parts) if parts else np.array([], dtype=COLUMNS[name]) for name, parts in columns.items()}
+        frame = pd.DataFrame({
+            "ts": pd.to_datetime(data["ts"].astype(np.int64), unit="s", utc=True),
+            # float32 on disk; prices have at most 4 decimals
+            "yes": data["yes"].astype(np.float64).round(4),
+            "no": data["no"].astype(np.float64).round(4),
+        })
+        for field in ("ticker", "event_id", "fighter", "fighter_id"):
+            values = np.array([getattr(m, field) for m in markets], dtype=object)
+            frame[field] = values[data["market"]] if len(data["market"]) else np.array([], dtype=object)
+        return frame
+
+    # ---- Updates ----
+
+    def append(self, samples: Iterable[OddsSample], ts: float = None) -> int:
+        """Append one pull's samples at time ts (default now); returns the number written."""
+        samples = list(samples)
+        if not samples:
+            return 0
+        ts = int(ts if ts is not None else datetime.now(timezone.utc).timestamp())
+        with self._lock:
+            self._recover()
+            self._loadMarkets()
+            new_markets = []
+            for sample in samples:
+                code = self._codes.get(sample.market.ticker)
+                if code is None or self._markets[code] != sample.market:
+                    self._addMarket(sample.market)
+                    new_markets.append(sample.market)
+            # Markets before samples: a crash in between leaves an unused market, never a dangling code
+            if new_markets:
+                self.root_dir.mkdir(parents=True, exist_ok=True)
+                append_rows(str(self._markets_path), self.FIELDS, [m._asdict() for m in new_markets])
+                self._markets_offset = self._markets_path.stat().st_size
+
+            day_dir = self.root_dir / self._dayOf(ts)
+            day_dir.mkdir(parents=True, exist_ok=True)
+            self._truncateToCommonLength(day_dir)
+            values = {
+                "ts": np.full(len(samples), ts, dtype=COLUMNS["ts"]),
+                "market": np.array([self._codes[s.market.ticker] for s in samples], dtype=COLUMNS["market"]),
+                "yes": np.array([np.nan if s.yes is None else s.yes for s in samples], dtype=COLUMNS["yes"]),
+                "no": np.array([np.nan if s.no is None else s.no for s in samples], dtype=COLUMNS["no"]),
+            }
+            for name, column in values.items():
+                with open(day_dir / f"{name}.bin", "ab") as f:
+                    f.write(column.tobytes())
+            return len(samples)
+
+    def downsample(self, older_than: timedelta, bucket_seconds: int) -> int:
+        """
+        Keep only the last sample per market per bucket_seconds in days that
+        ended more than older_than ago. Each day is rewritten once per bucket
+        size, into a new directory swapped in for the old one.
+        Returns the number of samples dropped.
+        """
+        cutoff = datetime.now(timezone.utc) - older_than
+        dropped = 0
+        with self._lock:
+            self._recover()
+            for day in self._days(None, cutoff - timedelta(days=1)):
+                marker = self.root_dir / day / DOWNSAMPLED_MARKER
+                if marker.exists() and int(marker.read_text() or 0) >= bucket_seconds:
+                    continue
+                part = self._readDay(day)
+                if part is None:
+                    continue
+                frame = pd.DataFrame({name: np.asarray(column) for name, column in part.items()})
+                frame["bucket"] = frame["ts"] // bucket_seconds
+                kept = frame.drop_duplicates(subset=["market", "bucket"], keep="last")
+                dropped += len(frame) - len(kept)
+                self._replaceDay(day, kept, bucket_seconds)
+        if dropped:
+            print(f"Downsampled odds older than {older_than}: dropped {dropped} samples")
+        return dropped
+
+    # -------- helpers --------
+
+    def _loadMarkets(self) -> None:
+        # markets.csv only grows; read the rows added since the last call
+        if not self._markets_path.exists():
+            return
+        size = self._markets_path.stat().st_size
+        if size <= self._markets_offset:
+            return
+        with open(self._markets_path, "rb") as f:
+            f.seek(self._markets_offset)
+            chunk = f.read(size - self._markets_offset)
+        complete = chunk[:chunk.rfind(b"\n") + 1]
+        lines = complete.decode("utf-8").splitlines()
+        if self._markets_offset == 0 and lines:
+            lines = lines[1:]
+        for row in csv.reader(lines):
+            if len(row) != len(self.FIELDS):
+                continue
+            self._addMarket(OddsMarket(*row))
+        self._markets_offset += len(complete)
+
+    def _addMarket(self, market: OddsMarket) -> None:
+        # Every row takes a row number; a repeated ticker keeps its first code with the new fields
+        code = self._codes.get(market.ticker)
+        if code is None:
+            self._codes[market.ticker] = len(self._markets)
+        else:
+            self._markets[code] = market
+        self._markets.append(market)
+
+    def _days(self, start: Optional[datetime], end: Optional[datetime]) -> List[str]:
+        if not self.root_dir.exists():
+            return []
+        first = self._dayOf(start.timestamp()) if start else ""
+        last = self._dayOf(end.timestamp()) if end else "9999"
+        return sorted(
+            p.name for p in self.root_dir.iterdir()
+            if p.is_dir() and len(p.name) == 10 and first <= p.name <= last
+        )
+
+    def _readDay(self, day: str) -> Optional[Dict[str, np.ndarray]]:
+        day_dir = self.root_dir / day
+        rows = self._commonLength(day_dir)
+        if rows == 0:
+            return None
+        try:
+            return {
+                name: np.memmap(day_dir / f"{name}.bin", dtype=dtype, mode="r", shape=(rows,))
+                for name, dtype in COLUMNS.items()
+            }
+        except (OSError, ValueError):
+            # Swapped out by a concurrent downsample; the next query sees the new files
+            return None
+
+    def _replaceDay(self, day: str, kept: pd.DataFrame, bucket_seconds: int) -> None:
+        day_dir = self.root_dir / day
+        tmp_dir = self.root_dir / f"{day}.tmp"
+        old_dir = self.root_dir / f"{day}.old"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        tmp_dir.mkdir(parents=True)
+        for name, dtype in COLUMNS.items():
+            kept[name].to_numpy(dtype=dtype).tofile(tmp_dir / f"{name}.bin")
+        (tmp_dir / DOWNSAMPLED_MARKER).write_text(str(bucket_seconds))
+        os.replace(day_dir, old_dir)
+        os.replace(tmp_dir, day_dir)
+        shutil.rmtree(old_dir, ignore_errors=True)
+
+    def _recover(self) -> None:
+        # Finish or roll back a day swap interrupted by a crash
+        if self._recovered or not self.root_dir.exists():
+            return
+        for path in self.root_dir.iterdir():
+            if path.name.endswith(".old"):
+                day_dir = path.with_name(path.name[:-len(".old")])
+                if day_dir.exists():
+                    shutil.rmtree(path, ignore_errors=True)
+                else:
+                    os.replace(path, day_dir)
+            elif path.name.endswith(".tmp"):
+                shutil.rmtree(path, ignore_errors=True)
+        self._recovered = True
+
+    def _truncateToCommonLength(self, day_dir: Path) -> None:
+        # A crash mid-append can leave some columns a sample longer than others
+        rows = self._commonLength(day_dir)
+        for name, dtype in COLUMNS.items():
+            path = day_dir / f"{name}.bin"
+            if path.exists() and path.stat().st_size != rows * dtype.itemsize:
+                os.truncate(path, rows * dtype.itemsize)
+
+    @staticmethod
+    def _commonLength(day_dir: Path) -> int:
+        sizes = []
+        for name, dtype in COLUMNS.items():
+            path = day_dir / f"{name}.bin"
+            sizes.append(path.stat().st_size // dtype.itemsize if path.exists() else 0)
+        return min(sizes)
+
+    @staticmethod
+    def _dayOf(ts: float) -> str:
+        return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%d")
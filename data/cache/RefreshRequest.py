@@ -0,0 +1,55 @@
+from __future__ import annotations
+import json
+import os
+from datetime import datetime
+from threading import RLock
+from typing import Optional
+
+
+class RefreshRequest:
+    """
+    A pending on-demand refresh, handed from the API to the refresh worker
+    through a small JSON file. The API writes it when /refresh is called; the
+    worker polls for it, removes it and runs the refresh. Several requests
+    before the worker picks one up collapse into one refresh.
+    """
+
+    def __init__(self, json_path: str):
+        self._json_path = json_path
+        self._lock = RLock()
+
+    @property
+    def path(self) -> str:
+        return self._json_path
+
+    def request(self, reason: str = "") -> dict:
+        with self._lock:
+            state = self.pending() or {"requested_at": datetime.now().isoformat(timespec="seconds"), "reason": reason}
+            tmp_path = f"{self._json_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self._json_path)
+            return state
+
+    def pending(self) -> Optional[dict]:
+        with self._lock:
+            try:
+                with open(self._json_path, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            except FileNotFoundError:
+                return None
+            except ValueError:
+                # Not a complete request (writes are atomic, so only a hand edit); still a request
+                return {"requested_at": None, "reason": ""}
+
+    def take(self) -> Optional[dict]:
+        """Remove and return the pending request, or None when there is none."""
+        with self._lock:
+            state = self.pending()
+            if state is None:
+                return None
+            try:
+                os.remove(self._json_path)
+            except FileNotFoundError:
+                return None
+            return state
@@ -0,0 +1,101 @@
+from __future__ import annotations
+import json
+import os
+from datetime import date
+from threading import RLock
+from typing import Dict, Optional, Set
+
+
+class RefreshWatermark:
+    """
+    Persisted reconciliation state for RefreshDataService (a small JSON file).
+
+      complete_through   every event on or before this date is complete
+      flagged_*          ids to re-check regardless of the watermark
+      attempts_*         failed fetches per id
+      unavailable_*      ids given up on after repeated failures; they count
+                         as settled so they do not hold the watermark back
+    """
+
+    KINDS = ("events", "fights")
+
+    def __init__(self, json_path: str):
+        self._json_path = json_path
+        self._lock = RLock()
+        self._loaded = False
+        self.complete_through: Optional[date] = None
+        self.flagged: Dict[str, Set[str]] = {}
+        self.attempts: Dict[str, Dict[str, int]] = {}
+        self.unavailable: Dict[str, Set[str]] = {}
+        self._reset()
+
+    def load(self) -> None:
+        with self._lock:
+            if self._loaded:
+                return
+            if os.path.exists(self._json_path):
+                with open(self._json_path, "r", encoding="utf-8") as f:
+                    state = json.load(f)
+                through = state.get("complete_through")
+                self.complete_through = date.fromisoformat(through) if through else None
+                for kind in self.KINDS:
+                    self.flagged[kind] = set(state.get(f"flagged_{kind}", []))
+                    self.attempts[kind] = dict(state.get(f"attempts_{kind}", {}))
+                    self.unavailable[kind] = set(state.get(f"unavailable_{kind}", []))
+            self._loaded = True
+
+    def save(self) -> None:
+        with self._lock:
+            state = {"complete_through": self.complete_through.isoformat() if self.complete_through else None}
+            for kind in self.KINDS:
+                state[f"flagged_{kind}"] = sorted(self.flagged[kind])
+                state[f"attempts_{kind}"] = dict(sorted(self.attempts[kind].items()))
+                state[f"unavailable_{kind}"] = sorted(self.unavailable[kind])
+            # Write then rename so a crash never leaves a half-written file
+            tmp_path = f"{self._json_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(state, f, indent=2)
+            os.replace(tmp_path, self._json_path)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._reset()
+            self._loaded = False
+
+    # ---- Gap bookkeeping ----
+
+    def flag(self, kind: str, item_id: str) -> None:
+        """Mark an event or fight id to be re-checked on the next run."""
+        self.load()
+        with self._lock:
+            self.flagged[kind].add(item_id)
+            self.unavailable[kind].discard(item_id)
+            self.attempts[kind].pop(item_id, None)
+
+    def record_success(self, kind: str, item_id: str) -> None:
+        with self._lock:
+            self.flagged[kind].discard(item_id)
+            self.attempts[kind].pop(item_id, None)
+
+    def record_failure(self, kind: str, item_id: str, max_attempts: int) -> bool:
+        """Count a failed fetch; returns True once the id is given up on."""
+        with self._lock:
+            self.attempts[kind][item_id] = self.attempts[kind].get(item_id, 0) + 1
+            if self.attempts[kind][item_id] < max_attempts:
+                return False
+            self.unavailable[kind].add(item_id)
+            self.flagged[kind].discard(item_id)
+            self.attempts[kind].pop(item_id, None)
+            return True
+
+    def is_unavailable(self, kind: str, item_id: str) -> bool:
+        with self._lock:
+            return item_id in self.unavailable[kind]
+
+    # -------- helpers --------
+
+    def _reset(self) -> None:
+        self.complete_through = None
+        self.flagged = {kind: set() for kind in self.KINDS}
+        self.attempts = {kind: {} for kind in self.KINDS}
+        self.unavailable = {kind: set() for kind in self.KINDS}
@@ -0,0 +1,116 @@
+from __future__ import annotations
+import csv
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import List
+
+from cache.BaseCsvCache import BaseCsvCache
+from cache.CsvUtil import append_rows
+from data_model.ScheduledBout import ScheduledBout
+
+DEFAULT_UPCOMING_CARDS_CSV = Path(__file__).resolve().parents[2] / "resources" / "initial_data" / "upcoming-cards.csv"
+
+
+class UpcomingCardCache(BaseCsvCache[str, List[ScheduledBout]]):
+    """
+    Scheduled bouts of upcoming events.
+    Key: event_id
+    Value: the card's bouts in listed order (main event first)
+
+    The CSV is an append-only log of card snapshots, each stamped with
+    scraped_at; on load the latest snapshot per event wins. A card whose
+    bouts are all gone is logged as a single EMPTY_CARD_ORDER row.
+    """
+
+    FIELDS = ["event_id", "bout_order", "fighter_a", "fighter_b", "weight_class", "scraped_at"]
+    # bout_order of the row that records an empty snapshot
+    EMPTY_CARD_ORDER = -1
+
+    def __init__(self, csv_path: str = str(DEFAULT_UPCOMING_CARDS_CSV)):
+        super().__init__(csv_path)
+
+    def key_of(self, value: List[ScheduledBout]) -> str:
+        if not value:
+            raise ValueError("Cannot cache an empty card")
+        return value[0].event_id
+
+    def get_card(self, event_id: str) -> List[ScheduledBout]:
+        """
+        Convenience: returns [] if event_id not found.
+        """
+        self.load()
+        with self._lock:
+            return list(self._data.get(event_id, []))
+
+    def save_card(self, bouts: List[ScheduledBout], event_id: str = None, scraped_at: str = None) -> bool:
+        """
+        Store a freshly scraped card. Only a card that differs from the cached
+        one is written, so re-scraping an unchanged card costs nothing.
+        An empty card (every bout cancelled or fought) needs event_id and
+        replaces the cached one. Returns whether the card changed.
+        """
+        event_id = bouts[0].event_id if bouts else event_id
+        if not event_id:
+            return False
+        self.load()
+        with self._lock:
+            if self._lineup(self.get_card(event_id)) == self._lineup(bouts):
+                return False
+            if bouts:
+                self.upsert(list(bouts))
+                self.append_to_csv(bouts)
+            else:
+                stamp = scraped_at or datetime.now().isoformat(timespec="seconds")
+                self._data[event_id] = []
+                self.append_to_csv([ScheduledBout(event_id, self.EMPTY_CARD_ORDER, "", "", "", stamp)])
+            return True
+
+    def _load_from_csv(self, csv_path: str) -> None:
+        if not os.path.exists(csv_path):
+            return
+        latest = {}
+        with open(csv_path, "r", newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                event_id = (row.get("event_id") or "").strip()
+                if not event_id:
+                    continue
+                bout = ScheduledBout(
+                    event_id=event_id,
+                    bout_order=int(row.get("bout_order") or 0),
+                    fighter_a=(row.get("fighter_a") or "").strip(),
+                    fighter_b=(row.get("fighter_b") or "").strip(),
+                    weight_class=(row.get("weight_class") or "").strip(),
+                    scraped_at=(row.get("scraped_at") or "").strip(),
+                )
+                # Rows of an older snapshot are dropped once a newer one shows up
+                if bout.scraped_at > latest.get(event_id, ""):
+                    latest[event_id] = bout.scraped_at
+                    self._data[event_id] = []
+                if bout.scraped_at == latest[event_id] and bout.bout_order != self.EMPTY_CARD_ORDER:
+                    self._data[event_id].append(bout)
+        for bouts in self._data.values():
+            bouts.sort(key=lambda b: b.bout_order)
+
+    def append_to_csv(self, value: List[ScheduledBout]) -> None:
+        # append-only persist (no rewrite); one row per bout of the snapshot
+        with self._lock:
+            append_rows(self._csv_path, self.FIELDS, (
+                {
+                    "event_id": bout.event_id,
+                    "bout_order": bout.bout_order,
+                    "fighter_a": bout.fighter_a,
+                    "fighter_b": bout.fighter_b,
+                    "weight_class": bout.weight_class,
+                    "scraped_at": bout.scraped_at,
+                }
+                for bout in value
+            ))
+
+    # -------- helpers --------
+
+    @staticmethod
+    def _lineup(bouts: List[ScheduledBout]) -> List[tuple]:
+        # What makes two snapshots the same card: everything but scraped_at
+        return [(b.bout_order, b.fighter_a, b.fighter_b, b.weight_class) for b in bouts]
@@ -28,83 +28,109 @@
 #       E. Calculate ctrl share
 #           1. ctrl time per min
 
-import csv
+import sys
+from pathlib import Path
+import numpy as np
 import pandas as pd
-from fighter_vectors import latest_vectors
-from datetime import datetime, timedelta
+
+BASE_DIR = Path(__file__).resolve().parent
+REPO_ROOT = BASE_DIR.parents[1]
+for path in (REPO_ROOT, REPO_ROOT / "data"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from cache.FightIndex import FightIndex
+from clean.fighter_vectors import FEATURE_COLS, add_fight_features, trailing_sums
 
 FIGHT_CSV = "../../resources/initial_data/fights.csv"
 EVENT_CSV = "../../resources/initial_data/events.csv"
 EVENT_INFO_CSV = "../../resources/initial_data/events-info.csv"
 
 TRAINING_CSV = "../../resources/clean_data/training_data.csv"
-
-def getEventInfo(fight_id: str):
-    with open(EVENT_INFO_CSV, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            if row["fight_id"] == fight_id:
-                return row
-
-def getEvent(event_id: str):
-    with open(EVENT_CSV, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            if row["event_id"] == event_id:
-                return row
-            
-def subtractDay(date_str: str):
-    # Convert string to datetime
-    date_obj = datetime.strptime(date_str, "%B %d, %Y")
-
-    # Subtract one day
-    new_date = date_obj - timedelta(days=1)
-
-    # Convert back to string if needed
-    return new_date.strftime("%B %d, %Y")
-
-def isDateOld(date_str: str):
-    date_obj = datetime.strptime(date_str, "%B %d, %Y")
-    return date_obj.year < 2015
-
-
-df = pd.read_csv(EVENT_INFO_CSV)
-
-unique_values = df["method"].unique()
-
-print(f"Unique fight outcomes: {unique_values}")
-
-
-counter = 0
-with open(FIGHT_CSV, newline="", encoding="utf-8") as f:
-    reader = csv.DictReader(f)   # rows as dictionaries
-    for row in reader:
-        counter = counter + 1
-        try:
-            fight_id = row["fight_id"]
-            fighter_id = row["fighter_id"]
-            fighter = row["fighter"]
-            event_info = getEventInfo(fight_id)
-            event = getEvent(event_info["event_id"])
-            date = subtractDay(event["event_date"])
-            if (isDateOld(date)):
-                print(f"Date {date} is too far in the past, not processing for fighter {fighter}")
-                continue
-            print(f"{counter}. Getting fight vector for {fighter} on {date}")
-            method = event_info["method"]
-            if method == "CNC":
-                print(f"Fight was no contest, refusing to further process")
-                continue
-                
-            vector = latest_vectors(None, date, training_data_path=TRAINING_CSV, fighter_id=fighter_id)
-            if vector.empty:
-                print("Fighter had no prior experience, refusing to further process")
-                continue
-
-            winner_name = event_info["winner_name"]
-            vector["win"] = winner_name == fighter
-
-            vector.to_csv("test.csv", mode="a", index=False, header=False)
-
-        except Exception as e:
-            print(f"Encountered exception: {e}")
+OUTPUT_CSV = "../../resources/fighter_vectors/fight_vectors_dated_2.csv"
+
+# Fights before this year are too old to train on
+MIN_YEAR = 2015
+
+OUTPUT_COLUMNS = ['fighter', 'fighter_id', 'event_date', 'weight_class', 'win_rate', 'total_fights', 'current_streak'] + FEATURE_COLS + ['win']
+
+
+def history_vectors(training_data: pd.DataFrame) -> pd.DataFrame:
+    """
+    For every row of training_data, the fighter's vector over all of their fights
+    up to and including that one, as latest_vectors(fighter_id=...) computes it:
+    durations come from the fighter's own control time and fights are averaged
+    whether or not the opponent's row is present.
+    """
+    td = training_data.copy()
+    td['event_date'] = pd.to_datetime(td['event_date'])
+    add_fight_features(td, by=('fighter_id', 'fight_id'))
+    td = td.sort_values(['fighter_id', 'event_date'], kind='mergesort').reset_index(drop=True)
+
+    fight_count = td.groupby('fighter_id').cumcount().to_numpy() + 1
+    last_row = np.arange(len(td))
+    outcomes = td['outcome'].to_numpy(dtype=np.float64)
+    outcome_sums = trailing_sums(outcomes[:, None], last_row, fight_count)[:, 0]
+    feature_sums = trailing_sums(td[FEATURE_COLS].to_numpy(dtype=np.float64), last_row, fight_count)
+
+    # current streak: length of the run of equal outcomes ending at the row, negative for losses
+    fighter_ids = td['fighter_id'].to_numpy()
+    run_start = np.r_[True, (outcomes[1:] != outcomes[:-1]) | (fighter_ids[1:] != fighter_ids[:-1])]
+    run_length = pd.Series(run_start).groupby(np.cumsum(run_start)).cumcount().to_numpy() + 1
+    streak = np.where(outcomes == 0, -run_length, np.where(np.isnan(outcomes), 0, run_length))
+
+    vectors = td[['fighter', 'fighter_id', 'event_date', 'weight_class']].copy()
+    vectors['win_rate'] = outcome_sums / fight_count
+    vectors['total_fights'] = fight_count
+    vectors['current_streak'] = streak
+    means = feature_sums / fight_count[:, None]
+    for i, col in enumerate(FEATURE_COLS):
+        vectors[col] = means[:, i]
+    return vectors
+
+
+def build_fight_vectors(fights: pd.DataFrame, fight_events: pd.DataFrame, training_data: pd.DataFrame, min_year: int = MIN_YEAR) -> pd.DataFrame:
+    """
+    One row per row of fights (in order) with the fighter's vector as of the day
+    before the fight, built from their fights strictly before that day, and
+    whether they won. Fights without event info or a date, before min_year, no
+    contests, and debuts are left out.
+
+    fight_events is FightIndex.fight_event_frame().
+    """
+    queries = fights[['fight_id', 'fighter_id', 'fighter']].merge(
+        fight_events[['fight_id', 'event_date', 'winner_name', 'method']], on='fight_id', how='inner', sort=False
+    )
+    queries['as_of'] = queries['event_date'] - pd.Timedelta(days=1)
+    queries = queries[queries['as_of'].notna() & (queries['as_of'].dt.year >= min_year) & (queries['method'] != 'CNC')]
+    queries['win'] = queries['winner_name'] == queries['fighter']
+    queries['_row'] = np.arange(len(queries))
+
+    # Each fight takes the fighter's running vector at their last fight before as_of
+    history = history_vectors(training_data).rename(columns={'event_date': 'fought_on', 'fighter': 'vector_fighter'})
+    matched = pd.merge_asof(
+        queries[['_row', 'fighter_id', 'as_of', 'win']].sort_values('as_of', kind='mergesort'),
+        history.sort_values('fought_on', kind='mergesort'),
+        left_on='as_of', right_on='fought_on', by='fighter_id',
+        allow_exact_matches=False, direction='backward',
+    )
+    matched = matched[matched['fought_on'].notna()].sort_values('_row')
+    matched = matched.rename(columns={'vector_fighter': 'fighter', 'as_of': 'event_date'})
+    matched['total_fights'] = matched['total_fights'].astype(int)
+    matched['current_streak'] = matched['current_streak'].astype(int)
+    return matched[OUTPUT_COLUMNS].reset_index(drop=True)
+
+
+def main(output_csv: str = OUTPUT_CSV):
+    fights = pd.read_csv(FIGHT_CSV, usecols=['fight_id', 'fighter_id', 'fighter'], dtype=str, keep_default_na=False)
+    fight_events = FightIndex.from_csv(EVENT_CSV, EVENT_INFO_CSV, FIGHT_CSV).fight_event_frame()
+    training_data = pd.read_csv(TRAINING_CSV)
+    print(f"Building pre-fight vectors for {len(fights)} fight rows from {len(training_data)} training rows")
+
+    vectors = build_fight_vectors(fights, fight_events, training_data)
+    vectors.to_csv(output_csv, index=False)
+    print(f"Wrote {output_csv} ({len(vectors)} rows)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import hashlib
+import json
+import os
+from typing import Dict, Optional
+
+MANIFEST_NAME = "clean-manifest.json"
+CHUNK_SIZE = 1 << 20
+
+
+def fingerprint(path: str) -> Dict:
+    """Size and sha256 of a file, as recorded in the manifest."""
+    return {"size": os.path.getsize(path), "sha256": _sha256(path)}
+
+
+def appended_since(path: str, previous: Optional[Dict]) -> bool:
+    """
+    True when the file still starts with exactly the bytes it had when
+    `previous` was taken, i.e. it has only been appended to since. Any edit or
+    rewrite of earlier rows makes an incremental update unsafe.
+    """
+    if not previous or not os.path.exists(path):
+        return False
+    if os.path.getsize(path) < previous["size"]:
+        return False
+    return _sha256(path, previous["size"]) == previous["sha256"]
+
+
+def _sha256(path: str, limit: Optional[int] = None) -> str:
+    digest = hashlib.sha256()
+    remaining = limit
+    with open(path, "rb") as f:
+        while remaining is None or remaining > 0:
+            chunk = f.read(CHUNK_SIZE if remaining is None else min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            digest.update(chunk)
+            if remaining is not None:
+                remaining -= len(chunk)
+    return digest.hexdigest()
+
+
+class CleanManifest:
+    """
+    What the clean pipeline has already processed (a small JSON file next to
+    training_data.csv), one section per stage:
+
+      process_data      fight_ids cleaned and merged so far, fingerprints of the
+                        raw inputs and of training_data.csv
+      fighter_vectors   fingerprint and row count of training_data.csv, the
+                        cutoff date, fingerprint of fighter_vectors_all.csv
+
+    A stage runs incrementally only when every file it fingerprinted has just
+    been appended to since; otherwise it rebuilds from scratch.
+    """
+
+    def __init__(self, json_path: str):
+        self.json_path = json_path
+        self.stages: Dict[str, Dict] = {}
+
+    def load(self) -> "CleanManifest":
+        if os.path.exists(self.json_path):
+            with open(self.json_path, "r", encoding="utf-8") as f:
+                self.stages = json.load(f)
+        return self
+
+    def stage(self, name: str) -> Dict:
+        return self.stages.setdefault(name, {})
+
+    def reset(self, name: str) -> Dict:
+        self.stages[name] = {}
+        return self.stages[name]
+
+    def save(self) -> None:
+        # Write then rename so a crash never leaves a half-written file
+        tmp_path = f"{self.json_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.stages, f, indent=1)
+        os.replace(tmp_path, self.json_path)
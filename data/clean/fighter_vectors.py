@@ -2,154 +2,195 @@ import pandas as pd
 import os
 from pathlib import Path
 import numpy as np
+import sys
 
 BASE_DIR = Path(__file__).resolve().parent
 REPO_ROOT = BASE_DIR.parents[1]
+if str(REPO_ROOT / "data") not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT / "data"))
+
+from clean.clean_manifest import MANIFEST_NAME, CleanManifest, appended_since, fingerprint
+from clean.features import FIGHTER_VECTOR_FEATURES
+
 DATA_DIR = str(REPO_ROOT / "resources" / "clean_data")
 OUTPUT_DIR = "../resources/fighter_vectors/"
-os.makedirs(OUTPUT_DIR, exist_ok=True)
 
-# Define the feature columns 
-FEATURE_COLS = [
-    'sig_str_per_min', 'td_att_per_min', 'td_success_per_min', 'ctrl_sec_per_min',
-    'kd_per_min', 'distance_str_per_min', 'clinch_str_per_min', 'ground_str_per_min',
-    'sub_att_per_min', 'distance_strike_ratio', 'clinch_strike_ratio', 'ground_strike_ratio',
-    'head_target_ratio', 'body_target_ratio', 'leg_target_ratio'
-]
+# The feature columns live in clean.features so the API can import them without this module's setup
+FEATURE_COLS = FIGHTER_VECTOR_FEATURES
+
+def add_fight_features(td: pd.DataFrame, by=('fight_id',)) -> pd.DataFrame:
+    """
+    Adds the per-fight FEATURE_COLS to every row of td, in place. Fight duration
+    is estimated from the largest control seconds among the rows sharing the
+    `by` columns (at least 5 minutes): both fighters' rows by default, so td
+    must hold both rows of each fight it should count.
+    """
+    max_ctrl = td.groupby(list(by))['ctrl_seconds'].transform('max').fillna(0)
+    td['duration_min'] = (max_ctrl / 60.0).clip(lower=5.0)
+
+    # per-minute features
+    td['sig_str_per_min'] = td['sig_str_landed'].fillna(0) / td['duration_min']
+    td['td_att_per_min'] = td['td_attempted'].fillna(0) / td['duration_min']
+    td['td_success_per_min'] = td['td_landed'].fillna(0) / td['duration_min']
+    td['ctrl_sec_per_min'] = td['ctrl_seconds'].fillna(0) / td['duration_min']
+    td['kd_per_min'] = td['kd'].fillna(0) / td['duration_min']
+    td['distance_str_per_min'] = td['distance_landed'].fillna(0) / td['duration_min']
+    td['clinch_str_per_min'] = td['clinch_landed'].fillna(0) / td['duration_min']
+    td['ground_str_per_min'] = td['ground_landed'].fillna(0) / td['duration_min']
+    td['sub_att_per_min'] = td['sub_att'].fillna(0) / td['duration_min']
+
+    # strike-target ratios (guard against zero sig landed)
+    sig_landed = td['sig_str_landed'].fillna(0)
+    mask = sig_landed > 0
+    td['distance_strike_ratio'] = 0.0
+    td['clinch_strike_ratio'] = 0.0
+    td['ground_strike_ratio'] = 0.0
+    td['head_target_ratio'] = 0.0
+    td['body_target_ratio'] = 0.0
+    td['leg_target_ratio'] = 0.0
+
+    td.loc[mask, 'distance_strike_ratio'] = td.loc[mask, 'distance_landed'].fillna(0) / sig_landed[mask]
+    td.loc[mask, 'clinch_strike_ratio'] = td.loc[mask, 'clinch_landed'].fillna(0) / sig_landed[mask]
+    td.loc[mask, 'ground_strike_ratio'] = td.loc[mask, 'ground_landed'].fillna(0) / sig_landed[mask]
+    td.loc[mask, 'head_target_ratio'] = td.loc[mask, 'head_landed'].fillna(0) / sig_landed[mask]
+    td.loc[mask, 'body_target_ratio'] = td.loc[mask, 'body_landed'].fillna(0) / sig_landed[mask]
+    td.loc[mask, 'leg_target_ratio'] = td.loc[mask, 'leg_landed'].fillna(0) / sig_landed[mask]
+    return td
+
 
 def create_fighter_profiles(training_data: pd.DataFrame, window: int = 10) -> pd.DataFrame:
-    profiles = []
-
-    # Process each fight into per-fight numeric stats
-    for fight_id in training_data['fight_id'].unique():
-
-        fight_rows = training_data[training_data['fight_id'] == fight_id]
-
-        if len(fight_rows) < 2:
-            continue
-
-        # estimate fight duration from max control seconds (fallback to 5 minutes)
-        max_ctrl = fight_rows['ctrl_seconds'].fillna(0).max()
-        duration = max(max_ctrl / 60, 5.0)
-
-        for _, row in fight_rows.iterrows():
-            profile = {
-                'fighter': row['fighter'],
-                'fighter_id': row['fighter_id'],
-                'fight_id': row['fight_id'],
-                'event_date': pd.to_datetime(row['event_date']),
-                'weight_class': row.get('weight_class', None),
-                'outcome': row.get('outcome', None),
-            }
-
-            profile['sig_str_per_min'] = row.get('sig_str_landed', 0) / duration if pd.notna(row.get('sig_str_landed', 0)) else 0
-            profile['td_att_per_min'] = row.get('td_attempted', 0) / duration if pd.notna(row.get('td_attempted', 0)) else 0
-            profile['td_success_per_min'] = row.get('td_landed', 0) / duration if pd.notna(row.get('td_landed', 0)) else 0
-            profile['ctrl_sec_per_min'] = row.get('ctrl_seconds', 0) / duration if pd.notna(row.get('ctrl_seconds', 0)) else 0
-            profile['kd_per_min'] = row.get('kd', 0) / duration if pd.notna(row.get('kd', 0)) else 0
-            profile['distance_str_per_min'] = row.get('distance_landed', 0) / duration if pd.notna(row.get('distance_landed', 0)) else 0
-            profile['clinch_str_per_min'] = row.get('clinch_landed', 0) / duration if pd.notna(row.get('clinch_landed', 0)) else 0
-            profile['ground_str_per_min'] = row.get('ground_landed', 0) / duration if pd.notna(row.get('ground_landed', 0)) else 0
-            profile['sub_att_per_min'] = row.get('sub_att', 0) / duration if pd.notna(row.get('sub_att', 0)) else 0
-
-            sig_landed = row.get('sig_str_landed', 0) if pd.notna(row.get('sig_str_landed', 0)) and row.get('sig_str_landed', 0) > 0 else 0
-
-            if sig_landed > 0:
-                profile['distance_strike_ratio'] = row.get('distance_landed', 0) / sig_landed if pd.notna(row.get('distance_landed', 0)) else 0
-                profile['clinch_strike_ratio'] = row.get('clinch_landed', 0) / sig_landed if pd.notna(row.get('clinch_landed', 0)) else 0
-                profile['ground_strike_ratio'] = row.get('ground_landed', 0) / sig_landed if pd.notna(row.get('ground_landed', 0)) else 0
-                profile['head_target_ratio'] = row.get('head_landed', 0) / sig_landed if pd.notna(row.get('head_landed', 0)) else 0
-                profile['body_target_ratio'] = row.get('body_landed', 0) / sig_landed if pd.notna(row.get('body_landed', 0)) else 0
-                profile['leg_target_ratio'] = row.get('leg_landed', 0) / sig_landed if pd.notna(row.get('leg_landed', 0)) else 0
-            else:
-                profile['distance_strike_ratio'] = 0
-                profile['clinch_strike_ratio'] = 0
-                profile['ground_strike_ratio'] = 0
-                profile['head_target_ratio'] = 0
-                profile['body_target_ratio'] = 0
-                profile['leg_target_ratio'] = 0
-
-            profiles.append(profile)
-
-    fight_level_df = pd.DataFrame(profiles).sort_values(['fighter_id', 'event_date']).reset_index(drop=True)
-
-    per_fight_profiles = []
-
-    # For each fighter, compute SMA over prior N fights for every fight they had
-    for fighter_id in fight_level_df['fighter_id'].unique():
-        fighter_fights = fight_level_df[fight_level_df['fighter_id'] == fighter_id].sort_values('event_date').reset_index(drop=True)
-
-        for idx in range(len(fighter_fights)):
-            current = fighter_fights.loc[idx]
-            # use only prior fights (exclude the current fight)
-            start = max(0, idx - window)
-            prior = fighter_fights.iloc[start:idx]
-
-            if prior.shape[0] == 0:
-                # no prior data; skip or include with defaults (here we skip)
-                continue
-
-            agg = {
-                'fighter': current['fighter'],
-                'fighter_id': current['fighter_id'],
-                'fight_id': current['fight_id'],
-                'event_date': current['event_date'],
-                'weight_class': current['weight_class'],
-                'outcome': current.get('outcome', None),
-            }
-
-            outcomes = prior['outcome'].values
-            agg['win_rate'] = outcomes.mean()
-            agg['total_fights'] = len(outcomes)
-
-            # current streak computed from prior fights
-            streak = 0
-            if len(outcomes) > 0:
-                most_recent = outcomes[-1]
-                for o in reversed(outcomes):
-                    if o == most_recent:
-                        streak += 1
-                    else:
-                        break
-                if most_recent == 0:
-                    streak = -streak
-
-            agg['current_streak'] = streak
-
-            for col in FEATURE_COLS:
-                agg[col] = prior[col].mean()
-
-            per_fight_profiles.append(agg)
-
-    return pd.DataFrame(per_fight_profiles).sort_values(['fighter', 'event_date']).reset_index(drop=True)
-
-def main():
+    """
+    One row per fighter per fight, averaging the fighter's previous `window`
+    fights (the fight itself excluded). A fighter's first fight has no row.
+    """
+    # Keep only fights that have two rows (two fighters)
+    td = training_data[training_data.groupby('fight_id')['fight_id'].transform('size') >= 2].copy()
+    td['event_date'] = pd.to_datetime(td['event_date'])
+    add_fight_features(td)
+
+    fight_level_df = td[['fighter', 'fighter_id', 'fight_id', 'event_date', 'weight_class', 'outcome'] + FEATURE_COLS]
+    fight_level_df = fight_level_df.sort_values(['fighter_id', 'event_date'], kind='mergesort').reset_index(drop=True)
+
+    # Each row's prior fights are the rows just above it within its fighter
+    prior_count = np.minimum(fight_level_df.groupby('fighter_id').cumcount().to_numpy(), window)
+    outcomes = fight_level_df['outcome'].to_numpy(dtype=np.float64)
+    features = fight_level_df[FEATURE_COLS].to_numpy(dtype=np.float64)
+    previous_row = np.arange(len(fight_level_df)) - 1
+    outcome_sums = trailing_sums(outcomes[:, None], previous_row, prior_count)[:, 0]
+    feature_sums = trailing_sums(features, previous_row, prior_count)
+
+    # current streak: length of the run the previous fight ends, negative for losses
+    fighter_ids = fight_level_df['fighter_id'].to_numpy()
+    run_start = np.r_[True, (outcomes[1:] != outcomes[:-1]) | (fighter_ids[1:] != fighter_ids[:-1])]
+    run_length = pd.Series(run_start).groupby(np.cumsum(run_start)).cumcount().to_numpy() + 1
+    last_outcome = np.r_[np.nan, outcomes[:-1]]
+    streak = np.minimum(np.r_[0, run_length[:-1]], prior_count)
+    streak = np.where(last_outcome == 0, -streak, np.where(np.isnan(last_outcome), 0, streak))
+
+    has_prior = prior_count > 0
+    profiles = fight_level_df.loc[has_prior, ['fighter', 'fighter_id', 'fight_id', 'event_date', 'weight_class', 'outcome']].copy()
+    profiles['win_rate'] = outcome_sums[has_prior] / prior_count[has_prior]
+    profiles['total_fights'] = prior_count[has_prior]
+    profiles['current_streak'] = streak[has_prior]
+    means = feature_sums[has_prior] / prior_count[has_prior, None]
+    for i, col in enumerate(FEATURE_COLS):
+        profiles[col] = means[:, i]
+
+    return profiles.sort_values(['fighter', 'event_date'], kind='mergesort').reset_index(drop=True)
+
+
+def trailing_sums(values: np.ndarray, last_rows: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """
+    Per column of values, the sum of the counts[i] rows ending at last_rows[i]
+    (0 where counts[i] is 0). Sums of the same length are taken together, each
+    over exactly its rows in order, so they round the same way as mean() over
+    that slice does.
+    """
+    sums = np.zeros((len(last_rows), values.shape[1]))
+    for count in np.unique(counts[counts > 0]):
+        rows = np.flatnonzero(counts == count)
+        window_rows = last_rows[rows, None] + np.arange(1 - count, 1)
+        sums[rows] = np.ascontiguousarray(values[window_rows].transpose(0, 2, 1)).sum(axis=-1)
+    return sums
+
+
+def dated_vectors(profiles: pd.DataFrame) -> pd.DataFrame:
+    """
+    Profiles in the fight_vectors_dated layout: dated the day before the fight
+    they lead into, with whether the fighter won it.
+    """
+    dated = profiles.drop(columns=['fight_id', 'outcome'])
+    dated['event_date'] = profiles['event_date'] - pd.Timedelta(days=1)
+    dated['win'] = profiles['outcome'] == 1
+    return dated
+
+
+def main(full: bool = False):
     print("=" * 14)
     print("FIGHTER PROFILE BUILDER (LATEST PER FIGHTER)")
     print("=" * 14)
 
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    training_path = os.path.join(DATA_DIR, "training_data.csv")
+    out_path = os.path.join(OUTPUT_DIR, 'fighter_vectors_all.csv')
+    manifest = CleanManifest(os.path.join(DATA_DIR, MANIFEST_NAME)).load()
+    state = manifest.stage("fighter_vectors")
+
     print("\nLoading training data...")
-    training_data = pd.read_csv(os.path.join(DATA_DIR, "training_data.csv"))
+    training_data = pd.read_csv(training_path)
     training_data['event_date'] = pd.to_datetime(training_data['event_date'])
     print(f"\t{len(training_data)} fight records")
 
     # compute latest vectors as of the last available date in the data
     cutoff = training_data['event_date'].max()
-    print(f"\nComputing latest vectors with end_date = {cutoff.date()}")
-    latest = latest_vectors(start_date=None, end_date=cutoff, training_data_path=training_data, window=10, include_no_history=False)
+    incremental = (
+        not full
+        and os.path.exists(out_path)
+        and appended_since(training_path, state.get("training_data"))
+        and appended_since(out_path, state.get("output"))
+    )
+    if incremental:
+        # Only fighters with new rows, or with fights the moved cutoff now includes, change
+        new_rows = training_data.iloc[state["rows"]:]
+        previous_cutoff = pd.Timestamp(state["cutoff"])
+        touched = set(new_rows['fighter_id'])
+        if cutoff > previous_cutoff:
+            touched |= set(training_data.loc[training_data['event_date'] >= previous_cutoff, 'fighter_id'])
+        print(f"\nUpdating {len(touched)} fighters touched by {len(new_rows)} new rows, end_date = {cutoff.date()}")
+        previous = pd.read_csv(out_path, float_precision="round_trip")
+        updated = latest_vectors(start_date=None, end_date=cutoff, training_data_path=training_data, window=10, include_no_history=False, fighter_ids=touched)
+        latest = pd.concat([previous[~previous['fighter_id'].isin(touched)], updated], ignore_index=True)
+        latest['event_date'] = cutoff
+    else:
+        print(f"\nComputing latest vectors with end_date = {cutoff.date()}")
+        latest = latest_vectors(start_date=None, end_date=cutoff, training_data_path=training_data, window=10, include_no_history=False)
 
-    out_path = os.path.join(OUTPUT_DIR, 'fighter_vectors_all.csv')
-    latest = latest.sort_values('fighter')
+    latest = latest.sort_values(['fighter', 'fighter_id'])
     latest.to_csv(out_path, index=False)
     print(f"\nWrote latest vectors: {out_path} ({len(latest)} rows × {len(latest.columns)} cols)")
 
+    # Rebuilt in full every run; it takes well under a second
+    dated_path = os.path.join(OUTPUT_DIR, 'fight_vectors_dated.csv')
+    dated = dated_vectors(create_fighter_profiles(training_data, window=10))
+    dated.to_csv(dated_path, index=False)
+    print(f"Wrote dated vectors: {dated_path} ({len(dated)} rows × {len(dated.columns)} cols)")
+
+    manifest.stages["fighter_vectors"] = {
+        "training_data": fingerprint(training_path),
+        "rows": len(training_data),
+        "cutoff": cutoff.isoformat(),
+        "output": fingerprint(out_path),
+    }
+    manifest.save()
+
     print("\n" + "=" * 14)
     print("COMPLETE!")
 
-def latest_vectors(start_date=None, end_date=None, training_data_path: str = os.path.join(DATA_DIR, "training_data.csv"), window: int = 10, include_no_history: bool = False, fill_value=None, fighter_id: str=None) -> pd.DataFrame: 
+def latest_vectors(start_date=None, end_date=None, training_data_path: str = os.path.join(DATA_DIR, "training_data.csv"), window: int = 10, include_no_history: bool = False, fill_value=None, fighter_id: str=None, fighter_ids=None) -> pd.DataFrame: 
     # - If `start_date` is None, uses full history before `end_date`.
     # - If `end_date` is None, uses all history up to latest available.
     # - `include_no_history` includes fighters with no prior fights (filled with `fill_value`).
+    # - `fighter_ids` limits the result to those fighters, with fights filtered as for everyone.
     
     if isinstance(training_data_path, str):
         td = pd.read_csv(training_data_path)
@@ -172,38 +213,10 @@ def latest_vectors(start_date=None, end_date=None, training_data_path: str = os.
     if td.empty:
         return pd.DataFrame([])
 
-    # compute duration (minutes) per fight in a vectorized way
-    max_ctrl = td.groupby('fight_id')['ctrl_seconds'].max().fillna(0)
-    durations = (max_ctrl / 60.0).clip(lower=5.0)
-    td['duration_min'] = td['fight_id'].map(durations)
-
-    # per-minute features
-    td['sig_str_per_min'] = td['sig_str_landed'].fillna(0) / td['duration_min']
-    td['td_att_per_min'] = td['td_attempted'].fillna(0) / td['duration_min']
-    td['td_success_per_min'] = td['td_landed'].fillna(0) / td['duration_min']
-    td['ctrl_sec_per_min'] = td['ctrl_seconds'].fillna(0) / td['duration_min']
-    td['kd_per_min'] = td['kd'].fillna(0) / td['duration_min']
-    td['distance_str_per_min'] = td['distance_landed'].fillna(0) / td['duration_min']
-    td['clinch_str_per_min'] = td['clinch_landed'].fillna(0) / td['duration_min']
-    td['ground_str_per_min'] = td['ground_landed'].fillna(0) / td['duration_min']
-    td['sub_att_per_min'] = td['sub_att'].fillna(0) / td['duration_min']
-
-    # strike-target ratios (guard against zero sig landed)
-    sig_landed = td['sig_str_landed'].fillna(0)
-    mask = sig_landed > 0
-    td['distance_strike_ratio'] = 0.0
-    td['clinch_strike_ratio'] = 0.0
-    td['ground_strike_ratio'] = 0.0
-    td['head_target_ratio'] = 0.0
-    td['body_target_ratio'] = 0.0
-    td['leg_target_ratio'] = 0.0
-
-    td.loc[mask, 'distance_strike_ratio'] = td.loc[mask, 'distance_landed'].fillna(0) / sig_landed[mask]
-    td.loc[mask, 'clinch_strike_ratio'] = td.loc[mask, 'clinch_landed'].fillna(0) / sig_landed[mask]
-    td.loc[mask, 'ground_strike_ratio'] = td.loc[mask, 'ground_landed'].fillna(0) / sig_landed[mask]
-    td.loc[mask, 'head_target_ratio'] = td.loc[mask, 'head_landed'].fillna(0) / sig_landed[mask]
-    td.loc[mask, 'body_target_ratio'] = td.loc[mask, 'body_landed'].fillna(0) / sig_landed[mask]
-    td.loc[mask, 'leg_target_ratio'] = td.loc[mask, 'leg_landed'].fillna(0) / sig_landed[mask]
+    # Durations need both fighters' rows, so narrow to the requested fighters only after
+    add_fight_features(td)
+    if fighter_ids is not None:
+        td = td[td['fighter_id'].isin(set(fighter_ids))].copy()
 
     # Build fight-level dataframe with only the columns we need
     fight_level_df = td[['fighter', 'fighter_id', 'fight_id', 'event_date', 'weight_class', 'outcome'] + FEATURE_COLS].copy()
@@ -272,4 +285,4 @@ def latest_vectors(start_date=None, end_date=None, training_data_path: str = os.
 
 
 if __name__ == "__main__":
-    main()
+    main(full="--full" in sys.argv[1:])
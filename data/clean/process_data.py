@@ -1,12 +1,32 @@
+import numpy as np
 import pandas as pd
 import os
 import re
+import sys
+from pathlib import Path
 from typing import Tuple, Optional
 
+BASE_DIR = Path(__file__).resolve().parent
+REPO_ROOT = BASE_DIR.parents[1]
+for path in (REPO_ROOT, REPO_ROOT / "data"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from cache.CsvUtil import ensure_trailing_newline
+from cache.NameUtil import normalize_name
+from clean.clean_manifest import MANIFEST_NAME, CleanManifest, appended_since, fingerprint
+from FighterIdentityService import FighterIdentityService
+
 DATA_DIR = "../resources/initial_data/"
 OUTPUT_DIR = "../resources/clean_data/"
+FIGHTER_ALIAS_CSV = str(REPO_ROOT / "resources" / "initial_data" / "fighter-aliases.csv")
 
-os.makedirs(OUTPUT_DIR, exist_ok=True)
+INPUT_FILES = ["fights.csv", "events.csv", "events-info.csv"]
+
+# "X of Y" columns of fights.csv, parsed into X_landed / X_attempted
+STAT_COLUMNS = ['sig_str', 'total_str', 'td', 'head', 'body', 'leg', 'distance', 'clinch', 'ground']
+STAT_PATTERN = r"^(\d+)\s+of\s+(\d+)"
+CTRL_PATTERN = r"^(\d+):(\d+)"
 
 def parse_stat_string(stat_str: str) -> Tuple[Optional[float], Optional[float]]:
     if not stat_str or stat_str == "---":
@@ -25,6 +45,15 @@ def parse_control_time(ctrl_str: str) -> Optional[float]:
         return float(minutes * 60 + seconds)
     return None
 
+def parse_stat_column(col: pd.Series) -> pd.DataFrame:
+    """Vectorized parse_stat_string: columns 0 and 1 hold landed and attempted, NaN where unparsable."""
+    return col.astype(str).str.strip().str.extract(STAT_PATTERN).astype(float)
+
+def parse_control_column(col: pd.Series) -> pd.Series:
+    """Vectorized parse_control_time."""
+    parts = col.astype(str).str.strip().str.extract(CTRL_PATTERN).astype(float)
+    return parts[0] * 60 + parts[1]
+
 def calculate_success_rate(landed: Optional[float], attempted: Optional[float]) -> Optional[float]:
     if landed is None or attempted is None or attempted == 0:
         return None
@@ -64,17 +93,13 @@ def clean_fights_data(fights: pd.DataFrame) -> pd.DataFrame:
     df = fights.copy()
     df = df.dropna(subset=['fight_id', 'fighter_id', 'fighter'])
     
-    df[['sig_str_landed', 'sig_str_attempted']] = df['sig_str'].apply(lambda x: pd.Series(parse_stat_string(x)))
-    df[['total_str_landed', 'total_str_attempted']] = df['total_str'].apply(lambda x: pd.Series(parse_stat_string(x)))
-    df[['td_landed', 'td_attempted']] = df['td'].apply(lambda x: pd.Series(parse_stat_string(x)))
-    df[['head_landed', 'head_attempted']] = df['head'].apply(lambda x: pd.Series(parse_stat_string(x)))
-    df[['body_landed', 'body_attempted']] = df['body'].apply(lambda x: pd.Series(parse_stat_string(x)))
-    df[['leg_landed', 'leg_attempted']] = df['leg'].apply(lambda x: pd.Series(parse_stat_string(x)))
-    df[['distance_landed', 'distance_attempted']] = df['distance'].apply(lambda x: pd.Series(parse_stat_string(x)))
-    df[['clinch_landed', 'clinch_attempted']] = df['clinch'].apply(lambda x: pd.Series(parse_stat_string(x)))
-    df[['ground_landed', 'ground_attempted']] = df['ground'].apply(lambda x: pd.Series(parse_stat_string(x)))
-    
-    df['ctrl_seconds'] = df['ctrl'].apply(parse_control_time)
+    # One vectorized regex pass per column instead of a pd.Series per cell
+    for col in STAT_COLUMNS:
+        parsed = parse_stat_column(df[col])
+        df[f'{col}_landed'] = parsed[0]
+        df[f'{col}_attempted'] = parsed[1]
+    
+    df['ctrl_seconds'] = parse_control_column(df['ctrl'])
     df['kd'] = pd.to_numeric(df['kd'], errors='coerce')
     df['sub_att'] = pd.to_numeric(df['sub_att'], errors='coerce')
     df['rev'] = pd.to_numeric(df['rev'], errors='coerce')
@@ -88,83 +113,126 @@ def clean_fights_data(fights: pd.DataFrame) -> pd.DataFrame:
 def normalize_fight_features(df: pd.DataFrame) -> pd.DataFrame:
     df_normalized = df.copy()
     
-    for fight_id in df_normalized['fight_id'].unique():
-        fight_rows = df_normalized[df_normalized['fight_id'] == fight_id]
-        max_ctrl = fight_rows['ctrl_seconds'].max()
-        if pd.notna(max_ctrl) and max_ctrl > 0:
-            fight_duration_min = max(max_ctrl / 60, 5.0)
-        else:
-            fight_duration_min = 15.0
-        
-        mask = df_normalized['fight_id'] == fight_id
-        df_normalized.loc[mask, 'sig_str_per_min'] = df_normalized.loc[mask, 'sig_str_landed'] / fight_duration_min
-        df_normalized.loc[mask, 'td_per_min'] = df_normalized.loc[mask, 'td_landed'] / fight_duration_min
-        df_normalized.loc[mask, 'ctrl_pct'] = ((df_normalized.loc[mask, 'ctrl_seconds'] / (fight_duration_min * 60)) * 100).clip(0, 100)
+    # Fight length estimated from the longer control time (at least 5 min), 15 min when unknown
+    max_ctrl = df_normalized.groupby('fight_id')['ctrl_seconds'].transform('max')
+    fight_duration_min = (max_ctrl / 60).clip(lower=5.0).where(max_ctrl > 0, 15.0)
     
-    df_normalized['sig_str_accuracy'] = df_normalized.apply(
-        lambda row: calculate_success_rate(row['sig_str_landed'], row['sig_str_attempted']), axis=1
-    )
-    df_normalized['td_success'] = df_normalized.apply(
-        lambda row: calculate_success_rate(row['td_landed'], row['td_attempted']), axis=1
-    )
+    df_normalized['sig_str_per_min'] = df_normalized['sig_str_landed'] / fight_duration_min
+    df_normalized['td_per_min'] = df_normalized['td_landed'] / fight_duration_min
+    df_normalized['ctrl_pct'] = ((df_normalized['ctrl_seconds'] / (fight_duration_min * 60)) * 100).clip(0, 100)
+    
+    # Same as calculate_success_rate: undefined when nothing was attempted
+    df_normalized['sig_str_accuracy'] = df_normalized['sig_str_landed'] / df_normalized['sig_str_attempted'].where(df_normalized['sig_str_attempted'] != 0)
+    df_normalized['td_success'] = df_normalized['td_landed'] / df_normalized['td_attempted'].where(df_normalized['td_attempted'] != 0)
     
     return df_normalized
 
-def merge_with_event_info(fights_clean: pd.DataFrame, events_info: pd.DataFrame, events: pd.DataFrame) -> pd.DataFrame:
+def merge_with_event_info(fights_clean: pd.DataFrame, events_info: pd.DataFrame, events: pd.DataFrame, resolver: Optional[FighterIdentityService] = None) -> pd.DataFrame:
+    # Outcomes are matched on fighter_id when a resolver is given (the winner/loser
+    # names are resolved against the two fighters in the bout), else on normalized names
     events_info_full = events_info.merge(events[['event_id', 'event_date']], on='event_id')
     events_info_full['event_date'] = pd.to_datetime(events_info_full['event_date'])
     
-    fights_with_outcome = []
+    bouts = events_info_full[events_info_full['fight_id'].notna() & (events_info_full['fight_id'] != '')]
+    bouts = bouts[['fight_id', 'winner_name', 'loser_name', 'event_date', 'weight_class', 'method']].reset_index(drop=True)
+    bouts['_bout'] = np.arange(len(bouts))
+    bouts['outcome_type'] = bouts['method'].map(categorize_outcome_type)
+    
+    stats = fights_clean.copy()
+    stats['_row'] = np.arange(len(stats))
+    if resolver is not None:
+        fighter_ids = bouts['fight_id'].map(fights_clean.groupby('fight_id', sort=False)['fighter_id'].agg(set))
+        bouts['_winner_key'] = [resolver.resolve(name, ids) if isinstance(ids, set) else None for name, ids in zip(bouts['winner_name'], fighter_ids)]
+        bouts['_loser_key'] = [resolver.resolve(name, ids) if isinstance(ids, set) else None for name, ids in zip(bouts['loser_name'], fighter_ids)]
+        stats['_fighter_key'] = stats['fighter_id']
+    else:
+        bouts['_winner_key'] = bouts['winner_name'].map(normalize_name)
+        bouts['_loser_key'] = bouts['loser_name'].map(normalize_name)
+        stats['_fighter_key'] = stats['fighter'].map(normalize_name)
+    
+    # One row per (bout, stat line), in event-info order and then stat-line order
+    merged = bouts.drop(columns=['winner_name', 'loser_name', 'method']).merge(stats, on='fight_id', suffixes=('', '_stats'))
+    merged = merged.sort_values(['_bout', '_row'], kind='stable')
+    is_winner = (merged['_fighter_key'] == merged['_winner_key']).to_numpy()
+    is_loser = (merged['_fighter_key'] == merged['_loser_key']).to_numpy()
+    keep = is_winner | is_loser
+    
+    training_data = merged.loc[keep, list(fights_clean.columns)].reset_index(drop=True)
+    training_data['outcome'] = np.where(is_winner[keep], 1, 0)
+    training_data['event_date'] = merged.loc[keep, 'event_date'].to_numpy()
+    training_data['weight_class'] = merged.loc[keep, 'weight_class'].to_numpy()
+    training_data['outcome_type'] = merged.loc[keep, 'outcome_type'].to_numpy()
+    return training_data
+
+def append_training_rows(output_path: str, rows: pd.DataFrame) -> None:
+    # Columns in the existing header's order; pandas formats the values as a full rebuild would
+    header = pd.read_csv(output_path, nrows=0).columns
+    ensure_trailing_newline(output_path)
+    rows.reindex(columns=header).to_csv(output_path, mode='a', header=False, index=False)
+
+def main(full: bool = False):
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    output_path = os.path.join(OUTPUT_DIR, "training_data.csv")
+    input_paths = {name: os.path.join(DATA_DIR, name) for name in INPUT_FILES}
+    manifest = CleanManifest(os.path.join(OUTPUT_DIR, MANIFEST_NAME)).load()
+    state = manifest.stage("process_data")
+    
+    # Incremental only while the raw CSVs and training_data.csv have just been appended to
+    incremental = (
+        not full
+        and os.path.exists(output_path)
+        and appended_since(output_path, state.get("output"))
+        and all(appended_since(path, state.get("inputs", {}).get(name)) for name, path in input_paths.items())
+    )
+    if not incremental:
+        state = manifest.reset("process_data")
     
-    for _, row in events_info_full.iterrows():
-        fight_id = row['fight_id']
-        if pd.isna(fight_id) or fight_id == '':
-            continue
-        
-        winner = row['winner_name']
-        loser = row['loser_name']
-        event_date = row['event_date']
-        weight_class = row['weight_class']
-        method = row['method']
-        outcome_type = categorize_outcome_type(method)
-        
-        fight_stats = fights_clean[fights_clean['fight_id'] == fight_id]
-        
-        for _, fighter_row in fight_stats.iterrows():
-            fighter_name = fighter_row['fighter']
-            outcome = 1 if fighter_name == winner else (0 if fighter_name == loser else None)
-            
-            if outcome is not None:
-                fighter_row_with_outcome = fighter_row.copy()
-                fighter_row_with_outcome['outcome'] = outcome
-                fighter_row_with_outcome['event_date'] = event_date
-                fighter_row_with_outcome['weight_class'] = weight_class
-                fighter_row_with_outcome['outcome_type'] = outcome_type
-                fights_with_outcome.append(fighter_row_with_outcome)
-    
-    return pd.DataFrame(fights_with_outcome)
-
-def main():
     print("Loading raw data...")
-    fights = pd.read_csv(os.path.join(DATA_DIR, "fights.csv"))
-    events = pd.read_csv(os.path.join(DATA_DIR, "events.csv"))
-    events_info = pd.read_csv(os.path.join(DATA_DIR, "events-info.csv"))
+    fights = pd.read_csv(input_paths["fights.csv"])
+    events = pd.read_csv(input_paths["events.csv"])
+    events_info = pd.read_csv(input_paths["events-info.csv"])
     
     print(f"Loaded: {len(fights)} fights, {len(events)} events, {len(events_info)} event-info records")
     
-    print("\nCleaning fight data...")
-    fights_clean = clean_fights_data(fights)
-    
-    print("Normalizing features...")
-    fights_norm = normalize_fight_features(fights_clean)
-    
-    print("Merging with event outcomes...")
-    training_data = merge_with_event_info(fights_norm, events_info, events)
+    processed = set(state.get("fight_ids", []))
+    if incremental:
+        fights = fights[~fights['fight_id'].isin(processed)]
+        print(f"Incremental run: {fights['fight_id'].nunique()} fights not processed yet (use --full to rebuild)")
     
-    output_path = os.path.join(OUTPUT_DIR, "training_data.csv")
-    training_data.to_csv(output_path, index=False)
-    print(f"\nSaved: {output_path}")
+    if not fights.empty:
+        print("\nCleaning fight data...")
+        fights_clean = clean_fights_data(fights)
+        
+        print("Normalizing features...")
+        fights_norm = normalize_fight_features(fights_clean)
+        
+        print("Merging with event outcomes...")
+        resolver = FighterIdentityService.from_csv(
+            input_paths["events.csv"],
+            input_paths["events-info.csv"],
+            input_paths["fights.csv"],
+            FIGHTER_ALIAS_CSV,
+        )
+        training_data = merge_with_event_info(fights_norm, events_info, events, resolver)
+        
+        if incremental:
+            append_training_rows(output_path, training_data)
+            print(f"\nAppended {len(training_data)} rows to {output_path}")
+        else:
+            training_data.to_csv(output_path, index=False)
+            print(f"\nSaved: {output_path}")
+        
+        # A fight counts as processed once its event info is in; until then it is retried
+        with_info = set(events_info.merge(events[['event_id']], on='event_id')['fight_id'].dropna())
+        processed |= set(fights_clean['fight_id']) & with_info
+    else:
+        print("\nNo new fights; training data is up to date")
+    
+    state["fight_ids"] = sorted(processed)
+    state["inputs"] = {name: fingerprint(path) for name, path in input_paths.items()}
+    state["output"] = fingerprint(output_path)
+    manifest.save()
     print("Complete")
 
 if __name__ == "__main__":
-    main()
+    main(full="--full" in sys.argv[1:])
@@ -1,3 +1,4 @@
+import argparse
 import os
 import sys
 from pathlib import Path
@@ -9,17 +10,17 @@ os.chdir(script_dir)
 import process_data
 import fighter_vectors
 
-def main():
+def main(full: bool = False):
 
     print("\n==============")
     print("FIGHTER VECTOR PIPELINE")
     print("==============\n")
     
     print("Step 1: Clean & normalize statistics")
-    process_data.main()
+    process_data.main(full=full)
     
     print("\nStep 2: Create vectors & aggregations")
-    fighter_vectors.main()
+    fighter_vectors.main(full=full)
     
     print("\nOutputs:")
     print("  - resources/clean_data/training_data.csv")
@@ -27,8 +28,12 @@ def main():
     print("  - resources/fighter_vectors/fighter_vectors_train.csv")
     print("  - resources/fighter_vectors/fighter_vectors_test.csv")
     print("  - resources/fighter_vectors/fighter_vectors_all.csv")
+    print("  - resources/fighter_vectors/fight_vectors_dated.csv")
 
     print("\nReady for training!\n")
 
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser(description="Clean raw data and build fighter vectors")
+    # By default only fights added since the last run are processed (see clean_manifest.py)
+    parser.add_argument("--full", action="store_true", help="rebuild every output from all raw data")
+    main(full=parser.parse_args().full)
@@ -1,27 +1,163 @@
+import os
 import requests
 import re
-from datetime import datetime, timezone
+import threading
+import time
+from datetime import date, datetime, timezone
 from decimal import Decimal
-from typing import Any, Optional
+from functools import lru_cache
+from typing import Any, List, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+from requests.adapters import HTTPAdapter
+
+# Overridable so the odds path can run against scripts/standin_server.py
+KALSHI_API_URL = os.getenv("KALSHI_API_URL", "https://api.elections.kalshi.com/trade-api/v2/markets")
+# How long one pull of the markets is served before Kalshi is asked again
+ODDS_TTL_SECONDS = float(os.getenv("KALSHI_ODDS_TTL", "60"))
+# (connect, read); a slow Kalshi delays /event/next by at most this, once per TTL
+TIMEOUT = (3.05, 10)
+# Kalshi's maximum page size
+PAGE_LIMIT = 1000
+MAX_PAGES = 50
+
+TICKER_DATE = re.compile(r"-(\d{2}[A-Z]{3}\d{2})")
+
+
+@lru_cache(maxsize=1024)
+def _parse_ticker_date(stamp: str) -> date:
+    # A card's markets share one date stamp, so strptime runs once per stamp
+    return datetime.strptime(stamp, "%y%b%d").date()
+
+
+class OddsSnapshot(NamedTuple):
+    """One pull of the open UFC markets, column per field."""
+    ticker: np.ndarray       # object
+    fighter: np.ndarray      # object
+    fight_date: np.ndarray   # datetime64[D]
+    yes_money: np.ndarray    # float64, NaN when not quoted
+    no_money: np.ndarray     # float64, NaN when not quoted
+    fetched_at: float        # epoch seconds
+
+    def __len__(self) -> int:
+        return len(self.ticker)
+
+    def to_frame(self) -> pd.DataFrame:
+        # Same columns as getLatest's dicts
+        return pd.DataFrame({
+            'kalshi_ticker': self.ticker,
+            'fighter': self.fighter,
+            'fight_date': np.datetime_as_string(self.fight_date, unit="D"),
+            'yes_money': self.yes_money,
+            'no_money': self.no_money,
+            'timestamp': datetime.fromtimestamp(self.fetched_at).date(),
+        })
+
+
+EMPTY_SNAPSHOT = OddsSnapshot(
+    np.array([], dtype=object), np.array([], dtype=object), np.array([], dtype="datetime64[D]"),
+    np.array([], dtype=np.float64), np.array([], dtype=np.float64), 0.0,
+)
 
-class KalshiClient:
 
-    def __init__(self):
-        self.url = "https://api.elections.kalshi.com/trade-api/v2/markets"
+class KalshiClient:
+    """
+    Open KXUFCFIGHT markets from the Kalshi API.
+
+    One pooled session is reused for every pull and each pull follows the
+    cursor to the last page. The parsed snapshot is kept for ttl seconds and
+    shared by every caller; when it expires a single caller refreshes it while
+    concurrent callers wait for that one pull. A failed pull keeps serving the
+    last snapshot and is not retried until the next TTL window.
+    """
+
+    def __init__(self, url: str = None, ttl: float = ODDS_TTL_SECONDS, session: requests.Session = None):
+        self.url = url or KALSHI_API_URL
+        self.ttl = ttl
         self.params = {
             'status': 'open',
             'series_ticker': "KXUFCFIGHT"
         }
-    
-    def getLatest(self):
-        response = requests.get(self.url, self.params)
-        if response.status_code == 200:
-            markets = response.json()["markets"]
-            print(f"Found {len(markets)} markets for upcoming UFC fights")
-            return [self.parse_kalshi_market(m) for m in markets]
+        self.session = session or self._make_session()
+        self._snapshot = EMPTY_SNAPSHOT
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def getSnapshot(self) -> OddsSnapshot:
+        if time.monotonic() < self._expires_at:
+            return self._snapshot
+        with self._lock:
+            # Another caller may have refreshed it while this one waited
+            if time.monotonic() < self._expires_at:
+                return self._snapshot
+            try:
+                markets = self._fetchMarkets()
+                self._snapshot = self._toSnapshot(markets)
+                print(f"Found {len(self._snapshot)} markets for upcoming UFC fights")
+            except (requests.RequestException, ValueError, KeyError) as e:
+                print(f"Error when gathering latest data from Kalshi, serving the last snapshot: {e}")
+            self._expires_at = time.monotonic() + self.ttl
+            return self._snapshot
+
+    def getLatest(self) -> List[dict]:
+        return self.getSnapshot().to_frame().to_dict("records")
+
+    def invalidate(self) -> None:
+        self._expires_at = 0.0
+
+    def _fetchMarkets(self) -> List[dict]:
+        markets = []
+        params = dict(self.params, limit=PAGE_LIMIT)
+        for _ in range(MAX_PAGES):
+            response = self.session.get(self.url, params=params, timeout=TIMEOUT)
+            if response.status_code != 200:
+                raise requests.HTTPError(f"HTTP {response.status_code}", response=response)
+            payload = response.json()
+            markets.extend(payload.get("markets") or [])
+            cursor = payload.get("cursor")
+            if not cursor:
+                break
+            params["cursor"] = cursor
         else:
-            print(f"Error when gathering latest data from Kalshi: {response.status_code}")
-            return []
+            # A partial pull would drop the later cards' markets; keep the last full snapshot instead
+            raise ValueError(f"Kalshi still returned a cursor after {MAX_PAGES} pages of {PAGE_LIMIT} markets")
+        return markets
+
+    def _toSnapshot(self, markets: List[dict]) -> OddsSnapshot:
+        tickers, fighters, dates, yes, no = [], [], [], [], []
+        skipped = 0
+        for market in markets:
+            try:
+                parsed = self.parse_kalshi_market(market)
+            except (KeyError, ValueError):
+                skipped += 1
+                continue
+            tickers.append(parsed['kalshi_ticker'])
+            fighters.append(parsed['fighter'])
+            dates.append(parsed['fight_date'])
+            yes.append(parsed['yes_money'])
+            no.append(parsed['no_money'])
+        if skipped:
+            print(f"Skipped {skipped} Kalshi markets without a fighter or date")
+        return OddsSnapshot(
+            np.array(tickers, dtype=object),
+            np.array(fighters, dtype=object),
+            np.array(dates, dtype="datetime64[D]"),
+            np.array([np.nan if v is None else v for v in yes], dtype=np.float64),
+            np.array([np.nan if v is None else v for v in no], dtype=np.float64),
+            time.time(),
+        )
+
+    @staticmethod
+    def _make_session() -> requests.Session:
+        s = requests.Session()
+        s.headers.update({"Accept": "application/json"})
+        # No transport retries: a failed pull is retried on the next TTL window instead
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=0)
+        s.mount("https://", adapter)
+        s.mount("http://", adapter)
+        return s
 
 
     def _to_decimal(self, value: Any) -> Optional[Decimal]:
@@ -37,11 +173,11 @@ class KalshiClient:
         Extracts:
         26APR04 -> 2026-04-04
         """
-        match = re.search(r"-(\d{2}[A-Z]{3}\d{2})", ticker)
+        match = TICKER_DATE.search(ticker)
         if not match:
             return None
 
-        parsed = datetime.strptime(match.group(1), "%y%b%d").date()
+        parsed = _parse_ticker_date(match.group(1))
         return parsed.isoformat()
 
 
@@ -75,4 +211,4 @@ class KalshiClient:
 
 if __name__ == '__main__':
     client = KalshiClient()
-    client.getLatest()
\ No newline at end of file
+    client.getLatest()
@@ -1,19 +1,17 @@
 import re
-import time
-import random
 from typing import Dict, List, Optional, Any
 
-from scrapers.ScraperUtil import make_session, get_html
+from scrapers.ScraperUtil import UFCSTATS_BASE_URL, get_session, get_html, polite_delay
 import requests
 from bs4 import BeautifulSoup
 
-EVENT_DETAILS_URL = "http://ufcstats.com/event-details/{event_id}"
-FIGHT_DETAILS_PREFIX = "http://ufcstats.com/fight-details/"
+EVENT_DETAILS_URL = UFCSTATS_BASE_URL + "/event-details/{event_id}"
+FIGHT_DETAILS_PREFIX = f"{UFCSTATS_BASE_URL}/fight-details/"
 
 FIGHT_ID_RE = re.compile(r"/fight-details/([a-zA-Z0-9]+)")
 
 def scrapeEventInfo(event_id: str) -> List[Dict[str, str]]:
-    session = make_session()
+    session = get_session()
     fights = scrape_event_fights(session, event_id)
 
     print(f"Scraped {len(fights)} fights")
@@ -30,18 +28,28 @@ def scrape_event_fights(session: requests.Session, event_id: str) -> List[Dict[s
 
     Returns list of dicts, one per fight.
     """
-    url = EVENT_DETAILS_URL.format(event_id=event_id)
+    url = event_info_url(event_id)
     print(url)
 
     # polite delay
-    time.sleep(random.uniform(0.8, 1.8))
+    polite_delay(url)
 
     resp = get_html(session, url)
     if resp == None:
         print(f"Could not return html after multiple attempts for url {url}")
         return []
     resp.raise_for_status()
-    soup = BeautifulSoup(resp.text, "html.parser")
+    return parse_event_fights(resp.text, event_id, url)
+
+def event_info_url(event_id: str) -> str:
+    return EVENT_DETAILS_URL.format(event_id=event_id)
+
+def parse_event_fights(html: str, event_id: str, url: str = "") -> List[Dict[str, str]]:
+    """
+    Parse the fights table of an event-details page (the fetch-free half of
+    scrape_event_fights, used by the concurrent FetchEngine).
+    """
+    soup = BeautifulSoup(html, "html.parser")
 
     # The fights table is typically: table.b-fight-details__table
     table = soup.select_one("table.b-fight-details__table")
@@ -1,15 +1,15 @@
 import re
-import time
-import random
-from scrapers.ScraperUtil import make_session, get_html
-from typing import Dict, List, Optional, Any
+from scrapers.ScraperUtil import UFCSTATS_BASE_URL, get_session, get_html, polite_delay
+from typing import Dict, List, Optional, Any, Set, Tuple
 from data_model.Event import Event
 
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 
-COMPLETED_EVENTS_URL = "http://ufcstats.com/statistics/events/completed?page=all"
-EVENT_DETAILS_PREFIX = "http://ufcstats.com/event-details/"
+COMPLETED_EVENTS_URL = f"{UFCSTATS_BASE_URL}/statistics/events/completed?page=all"
+# First page of the same listing (the most recent events), enough for an hourly refresh
+RECENT_EVENTS_URL = f"{UFCSTATS_BASE_URL}/statistics/events/completed"
+EVENT_DETAILS_PREFIX = f"{UFCSTATS_BASE_URL}/event-details/"
 
 EVENT_ID_RE = re.compile(r"/event-details/([a-zA-Z0-9]+)$")
 
@@ -47,14 +47,48 @@ def extract_event_id(href: str) -> Optional[str]:
 
 def scrape_completed_events(session: requests.Session) -> List[Event]:
     # Polite delay (even for one request)
-    time.sleep(random.uniform(0.8, 1.8))
+    polite_delay(COMPLETED_EVENTS_URL)
 
     resp = get_html(session, COMPLETED_EVENTS_URL)
     if resp == None:
         print(f"Could not return html after multiple attempts for url {COMPLETED_EVENTS_URL}")
         return []
     resp.raise_for_status()
-    soup = BeautifulSoup(resp.text, "html.parser")
+    events, _ = parse_completed_events(resp.text)
+    return events
+
+def scrape_new_events(session: requests.Session, known_event_ids: Set[str]) -> List[Event]:
+    """
+    Incremental listing for the hourly refresh: only events newer than the
+    newest one already known. The first page is revalidated with a conditional
+    request (a 304 serves the cached copy) and always parsed down to the first
+    known event, so events a failed earlier run never saved are still picked
+    up. The full listing is only fetched when no known event appears on the
+    first page.
+    """
+    if not known_event_ids:
+        return scrape_completed_events(session)
+
+    events: List[Event] = []
+    for url in (RECENT_EVENTS_URL, COMPLETED_EVENTS_URL):
+        polite_delay(url)
+        resp = get_html(session, url, revalidate=True)
+        if resp == None:
+            print(f"Could not return html after multiple attempts for url {url}")
+            return []
+        resp.raise_for_status()
+        events, reached_known = parse_completed_events(resp.text, stop_at=known_event_ids)
+        if reached_known:
+            return events
+        print(f"No known event on {url}; falling back to the full listing")
+    return events
+
+def parse_completed_events(html: str, stop_at: Set[str] = None) -> Tuple[List[Event], bool]:
+    """
+    Rows of the completed-events table, newest first. With stop_at, parsing
+    stops at the first event id in it; the flag says whether that happened.
+    """
+    soup = BeautifulSoup(html, "html.parser", parse_only=SoupStrainer("table"))
 
     table = soup.select_one("table.b-statistics__table-events")
     if not table:
@@ -79,6 +113,8 @@ def scrape_completed_events(session: requests.Session) -> List[Event]:
 
         href = a.get("href", "").strip()
         event_id = extract_event_id(href) or ""
+        if stop_at and event_id in stop_at:
+            return events, True
 
         # Clean text for name (anchor text includes whitespace/newlines)
         event_name = " ".join(a.get_text(strip=True).split())
@@ -101,22 +137,13 @@ def scrape_completed_events(session: requests.Session) -> List[Event]:
             "event_location": event_location,
             "event_url": event_url,
         })
-        # events.append(
-        #     Event(
-        #         event_id, 
-        #         event_name, 
-        #         event_date, 
-        #         event_location, 
-        #         event_url
-        #         )
-        #     )
 
-    return events
+    return events, False
 
 def scrapeEvents() -> List[Event]:
-    events: List[Event]
+    events: List[Event] = []
     try:
-        session = make_session()
+        session = get_session()
         events = scrape_completed_events(session)
     except Exception as e:
         print(f"Could not scrape events page, encountered an exception {e}")
@@ -128,6 +155,16 @@ def scrapeEvents() -> List[Event]:
 
     return events
 
+def scrapeNewEvents(known_event_ids: Set[str]) -> List[Event]:
+    events: List[Event] = []
+    try:
+        events = scrape_new_events(get_session(), known_event_ids)
+    except Exception as e:
+        print(f"Could not scrape events page, encountered an exception {e}")
+
+    print(f"Scraped {len(events)} new events.")
+    return events
+
 def reloadEventIds() -> List[str]:
     events = scrapeEvents()
     return [d["event_id"] for d in events if "event_id" in d]
@@ -0,0 +1,142 @@
+import re
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from lxml import etree
+
+# ----------------------------
+# Constants
+# ----------------------------
+TOTALS_HEADERS = ["fighter", "kd", "sig. str.", "total str.", "td", "ctrl"]
+SIG_HEADERS = ["fighter", "head", "body", "leg", "distance", "clinch", "ground"]
+
+# Fighter | KD | Sig Str | Sig Str % | Total Str | Td | Td % | Sub Att | Rev | Ctrl
+TOTALS_COLS = {"kd": 1, "sig_str": 2, "sig_str_pct": 3, "total_str": 4, "td": 5, "td_pct": 6, "sub_att": 7, "rev": 8, "ctrl": 9}
+# Fighter | Sig Str | Sig Str % | Head | Body | Leg | Distance | Clinch | Ground
+SIG_COLS = {"head": 3, "body": 4, "leg": 5, "distance": 6, "clinch": 7, "ground": 8}
+
+FIGHTER_ID_RE = re.compile(r"/fighter-details/([a-zA-Z0-9]+)")
+ROUND_RE = re.compile(r"Round\s+(\d+)")
+
+# Compiled once; evaluating a compiled XPath skips re-parsing the expression per call
+_CELL_TEXT = etree.XPath(".//p[contains(concat(' ', normalize-space(@class), ' '), ' b-fight-details__table-text ')]")
+_FIGHTER_LINKS = etree.XPath(".//a[contains(@href, 'fighter-details')]")
+_FIRST_ROW = etree.XPath("./tbody/tr[1]")
+
+
+class FightPage(NamedTuple):
+    # Two rows, one per fighter, identical to FightDataScraper.parse_fight_totals
+    totals: List[Dict]
+    # Two rows per round: fight_id, round, fighter_id, fighter and the totals + sig strike columns
+    rounds: List[Dict]
+
+
+def parse_fight_page(html: str, fight_id: str, url: str = "") -> FightPage:
+    """
+    Single-pass lxml parse of a fight-details page. Only the stats tables are
+    handed to the parser (the page chrome before the first <table> and after
+    the last one is sliced off), and all four tables are read in one walk.
+    """
+    start = html.find("<table")
+    end = html.rfind("</table>")
+    if start < 0 or end < 0:
+        raise RuntimeError(f"Could not find Totals table on {url}")
+    root = etree.HTML(html[start:end + len("</table>")])
+
+    totals_table = sig_table = None
+    round_totals_table = round_sig_table = None
+    for table in root.iter("table"):
+        header = _header_text(table)
+        per_round = "js-fight-table" in (table.get("class") or "")
+        # First match of each kind wins, as in the BeautifulSoup parser this replaced
+        if all(h in header for h in TOTALS_HEADERS):
+            if per_round and round_totals_table is None:
+                round_totals_table = table
+            elif not per_round and totals_table is None:
+                totals_table = table
+        elif all(h in header for h in SIG_HEADERS):
+            if per_round and round_sig_table is None:
+                round_sig_table = table
+            elif not per_round and sig_table is None:
+                sig_table = table
+
+    if totals_table is None:
+        raise RuntimeError(f"Could not find Totals table on {url}")
+    if sig_table is None:
+        raise RuntimeError(f"Could not find Significant Strikes totals table on {url}")
+
+    totals_row = _FIRST_ROW(totals_table)
+    if not totals_row:
+        raise RuntimeError(f"Totals table missing tbody row on {url}")
+    sig_row = _FIRST_ROW(sig_table)
+    if not sig_row:
+        raise RuntimeError(f"Sig strikes table missing tbody row on {url}")
+
+    fighters = _fighters(totals_row[0])
+    if fighters is None:
+        raise RuntimeError(f"Could not find two fighter links in Totals table on {url}")
+    totals = [{"fight_id": fight_id, "fighter_id": fid, "fighter": name} for fid, name in fighters]
+    _read_columns(totals_row[0], TOTALS_COLS, totals)
+    _read_columns(sig_row[0], SIG_COLS, totals)
+
+    rounds: Dict[Tuple[int, int], Dict] = {}
+    for table, cols in ((round_totals_table, TOTALS_COLS), (round_sig_table, SIG_COLS)):
+        if table is not None:
+            _read_rounds(table, cols, fight_id, rounds)
+
+    return FightPage(totals, [rounds[key] for key in sorted(rounds)])
+
+
+# -------- helpers --------
+
+def _clean(parts) -> str:
+    return " ".join(" ".join(parts).split())
+
+
+def _header_text(table) -> str:
+    thead = table.find("thead")
+    return _clean(thead.itertext()).lower() if thead is not None else ""
+
+
+def _fighters(tr) -> Optional[List[Tuple[str, str]]]:
+    tds = tr.findall("td")
+    if not tds:
+        return None
+    links = _FIGHTER_LINKS(tds[0])
+    if len(links) < 2:
+        return None
+    fighters = []
+    for a in links[:2]:
+        m = FIGHTER_ID_RE.search(a.get("href", ""))
+        # Same text as bs4's get_text(strip=True): stripped strings joined without a separator
+        name = " ".join("".join(s.strip() for s in a.itertext()).split())
+        fighters.append((m.group(1) if m else "", name))
+    return fighters
+
+
+def _read_columns(tr, cols: Dict[str, int], rows: List[Dict]) -> None:
+    # Both fighters share each <td> as two <p> blocks: first fighter, then second
+    tds = tr.findall("td")
+    for key, idx in cols.items():
+        vals = [_clean(p.itertext()) for p in _CELL_TEXT(tds[idx])] + ["", ""]
+        rows[0][key] = vals[0]
+        rows[1][key] = vals[1]
+
+
+def _read_rounds(table, cols: Dict[str, int], fight_id: str, rounds: Dict[Tuple[int, int], Dict]) -> None:
+    # Each round is a "Round N" <thead> followed by a <tbody> holding that round's row
+    round_no = 0
+    for child in table:
+        if child.tag == "thead":
+            m = ROUND_RE.search(_clean(child.itertext()))
+            if m:
+                round_no = int(m.group(1))
+        elif child.tag == "tbody" and round_no:
+            for tr in child.iterfind("tr"):
+                fighters = _fighters(tr)
+                if fighters is None:
+                    continue
+                rows = [
+                    rounds.setdefault((round_no, side), {"fight_id": fight_id, "round": round_no, "fighter_id": fid, "fighter": name})
+                    for side, (fid, name) in enumerate(fighters)
+                ]
+                _read_columns(tr, cols, rows)
@@ -0,0 +1,157 @@
+from __future__ import annotations
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[2] / "resources" / "html_cache"
+
+HOUR = 3600
+# First matching URL fragment wins; None means cache forever
+TTL_POLICY = [
+    ("/fight-details/", None),
+    ("/event-details/", 6 * HOUR),
+    ("/statistics/events/", 1 * HOUR),
+]
+DEFAULT_TTL = 1 * HOUR
+# A fight-details page is only immutable once its stats are posted
+FIGHT_STATS_MARKER = b"Sig. str."
+
+
+class CachedPage(NamedTuple):
+    url: str
+    sha256: str
+    fetched_at: float
+    encoding: Optional[str]
+    immutable: bool
+    # HTTP validators for conditional revalidation once the entry goes stale
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+class HtmlCache:
+    """
+    On-disk cache of raw ufcstats responses.
+
+    Bodies are gzip blobs named by their sha256 (blobs/ab/abcd....html.gz), so
+    identical pages are stored once; index.jsonl is an append-only log of
+    url -> (sha256, fetched_at, encoding, immutable, validators) where the last
+    line for a url wins. Freshness follows TTL_POLICY per page type.
+    """
+
+    def __init__(self, root_dir: str = str(DEFAULT_CACHE_DIR)):
+        self.root_dir = Path(root_dir)
+        self._index_path = self.root_dir / "index.jsonl"
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._index: Dict[str, CachedPage] = {}
+
+    def load(self) -> None:
+        with self._lock:
+            if self._loaded:
+                return
+            if self._index_path.exists():
+                with open(self._index_path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            entry = json.loads(line)
+                        except ValueError:
+                            # A torn final line from an interrupted run
+                            continue
+                        if entry.get("sha256"):
+                            self._index[entry["url"]] = CachedPage(
+                                entry["url"], entry["sha256"], entry["fetched_at"], entry.get("encoding"), entry.get("immutable", False),
+                                entry.get("etag"), entry.get("last_modified"),
+                            )
+                        else:
+                            self._index.pop(entry["url"], None)
+            self._loaded = True
+
+    # ---- Lookups ----
+
+    @staticmethod
+    def ttl_for(url: str) -> Optional[float]:
+        for fragment, ttl in TTL_POLICY:
+            if fragment in url:
+                return ttl
+        return DEFAULT_TTL
+
+    def entry(self, url: str) -> Optional[CachedPage]:
+        self.load()
+        with self._lock:
+            return self._index.get(url)
+
+    def is_fresh(self, url: str) -> bool:
+        entry = self.entry(url)
+        if entry is None:
+            return False
+        if entry.immutable:
+            return True
+        return time.time() - entry.fetched_at < (self.ttl_for(url) or DEFAULT_TTL)
+
+    def read(self, url: str) -> Optional[bytes]:
+        """The cached body for a url regardless of age, or None."""
+        entry = self.entry(url)
+        if entry is None:
+            return None
+        try:
+            with gzip.open(self._blob_path(entry.sha256), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    # ---- Updates ----
+
+    def put(self, url: str, content: bytes, encoding: Optional[str] = None,
+            etag: Optional[str] = None, last_modified: Optional[str] = None) -> CachedPage:
+        sha256 = hashlib.sha256(content).hexdigest()
+        blob_path = self._blob_path(sha256)
+        if not blob_path.exists():
+            blob_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = blob_path.with_name(f"{blob_path.name}.{threading.get_ident()}.tmp")
+            with gzip.open(tmp_path, "wb") as f:
+                f.write(content)
+            os.replace(tmp_path, blob_path)
+
+        immutable = self.ttl_for(url) is None
+        if "/fight-details/" in url and FIGHT_STATS_MARKER not in content:
+            # Stats not posted yet; keep it on the default TTL so it is fetched again
+            immutable = False
+        page = CachedPage(url, sha256, time.time(), encoding, immutable, etag, last_modified)
+        self._append(page._asdict())
+        with self._lock:
+            self._index[url] = page
+        return page
+
+    def touch(self, url: str) -> Optional[CachedPage]:
+        """Restart the TTL of an entry the server confirmed unchanged (a 304)."""
+        entry = self.entry(url)
+        if entry is None:
+            return None
+        page = entry._replace(fetched_at=time.time())
+        self._append(page._asdict())
+        with self._lock:
+            self._index[url] = page
+        return page
+
+    def invalidate(self, url: str) -> None:
+        self.load()
+        self._append({"url": url, "sha256": None, "fetched_at": time.time()})
+        with self._lock:
+            self._index.pop(url, None)
+
+    # -------- helpers --------
+
+    def _blob_path(self, sha256: str) -> Path:
+        return self.root_dir / "blobs" / sha256[:2] / f"{sha256}.html.gz"
+
+    def _append(self, entry: dict) -> None:
+        self.load()
+        with self._lock:
+            self.root_dir.mkdir(parents=True, exist_ok=True)
+            with open(self._index_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
@@ -1,24 +1,48 @@
-from scrapers.EventScraper import scrapeEvents
-from scrapers.EventInfoScraper import scrapeEventInfo
-from scrapers.FightDataScraper import scrapeFight
+from scrapers.EventScraper import scrapeEvents, scrapeNewEvents
+from scrapers.EventInfoScraper import scrapeEventInfo, event_info_url, parse_event_fights
+from scrapers.FightDataScraper import scrapeFight, fight_details_url, parse_fight_totals
+from scrapers.FetchEngine import FetchEngine
 
 from data_model.Event import Event
 from data_model.EventInfo import EventInfo
 from data_model.FightStatLine import FightStatLine
 
-from typing import List
+from typing import Dict, Iterable, List, Set
 
 ### A Facade class to hide the implementation of the individual scrapers
 class ScraperService:
 
+    def __init__(self, fetch_engine: FetchEngine = None):
+        self.fetch_engine = fetch_engine or FetchEngine()
+
     # Will scrape for all event metadata
     def scrape_all_events(self) -> List[Event]:
         return scrapeEvents()
-    
+
+    # Will scrape only events listed ahead of the newest known one
+    def scrape_new_events(self, known_event_ids: Set[str]) -> List[Event]:
+        return scrapeNewEvents(known_event_ids)
+
     # Will scrape for all fight metadata for a specific event id
     def scrape_event_info(self, event_id: str) -> List[EventInfo]:
         return scrapeEventInfo(event_id)
-    
+
     # Will scrape the stats of each fighter from the fight id
     def scrape_fight_info(self, fight_id: str) -> List[FightStatLine]:
-        return scrapeFight(fight_id)
\ No newline at end of file
+        return scrapeFight(fight_id)
+
+    # Batch variants fetch concurrently; ids that fail map to [] like the single-id scrapers.
+    # revalidate asks the server about cached cards that are still within their TTL
+    def scrape_event_infos(self, event_ids: Iterable[str], revalidate: bool = False) -> Dict[str, List[EventInfo]]:
+        return self._scrape_many(event_ids, event_info_url, lambda key, url, html: parse_event_fights(html, key, url), revalidate)
+
+    def scrape_fight_infos(self, fight_ids: Iterable[str]) -> Dict[str, List[FightStatLine]]:
+        return self._scrape_many(fight_ids, fight_details_url, lambda key, url, html: parse_fight_totals(html, key, url))
+
+    def _scrape_many(self, keys: Iterable[str], url_of, parse, revalidate: bool = False) -> Dict[str, list]:
+        results: Dict[str, list] = {}
+        for key, rows, error in self.fetch_engine.map(dict.fromkeys(keys), url_of, parse, revalidate):
+            if error is not None:
+                print(f"Encountered exception when trying to scrape {key}. Ignoring entry: {error}")
+            results[key] = rows or []
+        return results
@@ -1,8 +1,58 @@
 import requests
+import random
+import threading
 import time
 import os
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
 
-def make_session() -> requests.Session:
+from scrapers.HtmlCache import DEFAULT_CACHE_DIR, CachedPage, HtmlCache
+
+# Point the scrapers at a stand-in server (scripts/standin_server.py) for offline runs
+UFCSTATS_BASE_URL = os.getenv("UFCSTATS_BASE_URL", "http://ufcstats.com").rstrip("/")
+# Scale of the 0.8-1.8s pause before sequential requests; 0 turns it off for local load tests
+POLITE_DELAY_SCALE = float(os.getenv("SCRAPE_POLITE_DELAY", "1"))
+
+# Connection pool sized for the FetchEngine worker pool; one host, so one pool
+POOL_SIZE = int(os.getenv("SCRAPE_POOL_SIZE", "16"))
+
+MAX_RETRIES = 3
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+
+# SCRAPE_CACHE: "on" serves fresh pages from the HTML cache and stores new ones,
+# "replay" reads only from the cache (never the network), "off" bypasses it
+CACHE_MODES = ("on", "off", "replay")
+
+
+class ScrapeStats:
+    """Thread-safe counters for get_html, surfaced on the API's /meta endpoint."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Dict[str, int] = {}
+
+    def incr(self, name: str) -> None:
+        with self._lock:
+            self._counts[name] = self._counts.get(name, 0) + 1
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(sorted(self._counts.items()))
+
+
+scrape_stats = ScrapeStats()
+
+_adapter: Optional[HTTPAdapter] = None
+_local = threading.local()
+_session_lock = threading.Lock()
+_html_cache: Optional[HtmlCache] = None
+
+
+def make_session(adapter: Optional[HTTPAdapter] = None) -> requests.Session:
     s = requests.Session()
     # Headers to look like a normal browser (helps avoid intermittent 502s)
     s.headers.update({
@@ -14,30 +64,177 @@ def make_session() -> requests.Session:
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
         "Accept-Language": "en-US,en;q=0.9",
         "Connection": "keep-alive",
-        "Referer": "http://ufcstats.com/",
+        "Referer": f"{UFCSTATS_BASE_URL}/",
     })
+    # Retries are handled in get_html so they can be counted and honor Retry-After
+    adapter = adapter or HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE, max_retries=0)
+    s.mount("http://", adapter)
+    s.mount("https://", adapter)
     return s
 
-def get_html(session: requests.Session, url: str, timeout: int = 30):
-    # Honor environment flag to disable scraping during startup or in restricted environments
-    enable_scraping = os.getenv("ENABLE_SCRAPING", "true").lower() in ("1", "true", "yes")
-    if not enable_scraping:
+
+def get_session() -> requests.Session:
+    """
+    This thread's session. requests.Session is not documented as thread-safe
+    (its cookie jar and adapter mounts are shared, unlocked state), so each
+    FetchEngine worker gets its own; they all mount one HTTPAdapter, whose
+    urllib3 pool is thread-safe, so keep-alive connections are still reused.
+    """
+    global _adapter
+    session = getattr(_local, "session", None)
+    if session is None:
+        with _session_lock:
+            if _adapter is None:
+                _adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE, max_retries=0)
+        session = _local.session = make_session(_adapter)
+    return session
+
+
+def get_html_cache() -> HtmlCache:
+    global _html_cache
+    with _session_lock:
+        if _html_cache is None:
+            _html_cache = HtmlCache(os.getenv("SCRAPE_CACHE_DIR", str(DEFAULT_CACHE_DIR)))
+        return _html_cache
+
+
+def cache_mode() -> str:
+    mode = os.getenv("SCRAPE_CACHE", "on").lower()
+    return mode if mode in CACHE_MODES else "on"
+
+
+def needs_network(url: str, revalidate: bool = False) -> bool:
+    """False when get_html would answer from the cache (replay mode or a fresh entry)."""
+    mode = cache_mode()
+    return mode == "off" or (mode == "on" and (revalidate or not get_html_cache().is_fresh(url)))
+
+
+def scraping_enabled() -> bool:
+    # ENABLE_SCRAPING=false keeps startup and restricted environments off the network
+    return os.getenv("ENABLE_SCRAPING", "true").lower() in ("1", "true", "yes")
+
+
+def polite_delay(url: str) -> None:
+    # Only real requests need spacing out; cache hits run at disk speed
+    if POLITE_DELAY_SCALE > 0 and needs_network(url):
+        time.sleep(random.uniform(0.8, 1.8) * POLITE_DELAY_SCALE)
+
+
+def get_html(session: requests.Session, url: str, timeout: int = 30, revalidate: bool = False, retries: int = MAX_RETRIES):
+    """
+    GET a ufcstats page through the HTML cache. With revalidate=True a cached
+    page is never served without asking the server first. The response's
+    X-Cache header tells the caller where the body came from: HIT (cache, no
+    request), REVALIDATED (a 304 for the cached body) or UNCHANGED (a 200 whose
+    body hashes the same as the cached one).
+
+    A 429/5xx or failed connection is retried up to `retries` times with
+    backoff. retries=0 leaves retrying to the caller; FetchEngine does that so
+    every attempt goes through its rate limit and concurrency control.
+    """
+    mode = cache_mode()
+    cache = get_html_cache()
+    if mode == "replay" or (mode == "on" and not revalidate and cache.is_fresh(url)):
+        cached = _cached_response(cache, url)
+        if cached is not None:
+            scrape_stats.incr("cache_hits")
+            return cached
+        if mode == "replay":
+            scrape_stats.incr("replay_misses")
+            print(f"Replay mode: {url} is not in the HTML cache")
+            return None
+
+    if not scraping_enabled():
         try:
             print(f"Scraping disabled via ENABLE_SCRAPING env; skipping request to {url}")
         except Exception:
             pass
         return None
 
-    resp = None
-    attempts = 0
-    while resp == None and attempts < 3:
+    previous = cache.entry(url) if mode == "on" else None
+    resp = _get_with_retries(session, url, timeout, _conditional_headers(previous), retries)
+    if resp is None or mode != "on":
+        return resp
+    if resp.status_code == 304 and previous is not None:
+        scrape_stats.incr("not_modified")
+        cache.touch(url)
+        return _cached_response(cache, url, "REVALIDATED")
+    if resp.status_code == 200:
+        page = cache.put(url, resp.content, resp.encoding, resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+        if previous is not None and page.sha256 == previous.sha256:
+            scrape_stats.incr("unchanged")
+            resp.headers["X-Cache"] = "UNCHANGED"
+    return resp
+
+
+def _conditional_headers(entry: Optional[CachedPage]) -> Optional[Dict[str, str]]:
+    if entry is None:
+        return None
+    headers = {}
+    if entry.etag:
+        headers["If-None-Match"] = entry.etag
+    if entry.last_modified:
+        headers["If-Modified-Since"] = entry.last_modified
+    return headers or None
+
+
+def should_retry(resp: Optional[requests.Response]) -> bool:
+    """True for a failed request (None) or a status the server may clear by itself (429/5xx)."""
+    return resp is None or resp.status_code in RETRY_STATUSES
+
+
+def retry_delay(resp: Optional[requests.Response], attempt: int) -> float:
+    """Seconds to wait before retry number attempt + 1 of a request that got `resp`."""
+    # Retry-After wins when the server sends it; otherwise exponential backoff with full jitter
+    retry_after = resp.headers.get("Retry-After") if resp is not None else None
+    if retry_after:
+        try:
+            return min(BACKOFF_MAX, max(0.0, float(retry_after)))
+        except ValueError:
+            try:
+                return min(BACKOFF_MAX, max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time()))
+            except (TypeError, ValueError):
+                pass
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (attempt + 1)))
+
+
+def _get_with_retries(session: requests.Session, url: str, timeout: int, headers: Optional[Dict[str, str]] = None,
+                      retries: int = MAX_RETRIES):
+    # Returns the response (possibly a final 4xx/5xx for the caller's raise_for_status),
+    # or None when every attempt failed to connect.
+    for attempt in range(retries + 1):
+        scrape_stats.incr("requests")
+        resp = None
         try:
-            resp = session.get(url, timeout=timeout)
-        except Exception as e:
+            resp = session.get(url, timeout=timeout, headers=headers)
+        except requests.RequestException as e:
+            scrape_stats.incr("request_errors")
             print(f"Attempted to get html for {url}, but encountered an exception: {e}")
-            print(f"Trying again in 10 seconds")
-            time.sleep(10)
-            attempts = attempts + 1
-    return resp
-            
+        else:
+            if not should_retry(resp):
+                return resp
+            scrape_stats.incr(f"status_{resp.status_code}")
+
+        if attempt == retries:
+            if retries:
+                scrape_stats.incr("gave_up")
+            return resp
+        delay = retry_delay(resp, attempt)
+        scrape_stats.incr("retries")
+        print(f"Retrying {url} in {delay:.1f}s (attempt {attempt + 2}/{retries + 1})")
+        time.sleep(delay)
+
 
+def _cached_response(cache: HtmlCache, url: str, source: str = "HIT") -> Optional[requests.Response]:
+    # Rebuild a requests.Response so callers cannot tell a cache hit from a fetch
+    content = cache.read(url)
+    if content is None:
+        return None
+    entry = cache.entry(url)
+    resp = requests.Response()
+    resp.status_code = 200
+    resp.url = url
+    resp._content = content
+    resp.encoding = entry.encoding if entry else None
+    resp.headers = CaseInsensitiveDict({"X-Cache": source})
+    return resp
@@ -0,0 +1,13 @@
+from dataclasses import dataclass
+from typing import Iterator
+
+@dataclass(frozen=True)
+class FighterAlias:
+    alias: str
+    fighter_id: str
+    fighter: str
+
+    def __iter__(self) -> Iterator[str]:
+        yield self.alias
+        yield self.fighter_id
+        yield self.fighter
@@ -0,0 +1,19 @@
+from dataclasses import dataclass
+from typing import Iterator
+
+@dataclass(frozen=True)
+class ScheduledBout:
+    event_id: str
+    bout_order: int
+    fighter_a: str
+    fighter_b: str
+    weight_class: str
+    scraped_at: str
+
+    def __iter__(self) -> Iterator[object]:
+        yield self.event_id
+        yield self.bout_order
+        yield self.fighter_a
+        yield self.fighter_b
+        yield self.weight_class
+        yield self.scraped_at
@@ -78,7 +78,10 @@ def compare(request: Request, red: str = "", blue: str = "") -> HTMLResponse:
     
     if fighter_red and fighter_blue:
         win_probability = _compute_win_probability(fighter_red, fighter_blue)
-        hth_stats       = _build_hth_stats(fighter_red, fighter_blue)
+        hth_stats       = _build_hth_stats(
+            fighter_red, fighter_blue,
+            service.getPercentiles(fighter_red.id), service.getPercentiles(fighter_blue.id),
+        )
 
     return templates.TemplateResponse(request, "index.html", {
         "request":      request,
@@ -341,16 +344,23 @@ def _compute_win_probability(red: Fighter, blue: Fighter,) -> dict:
         "model":      "Model Pending",
     }
 
-def _build_hth_stats(red: Fighter, blue: Fighter) -> List[dict]:
+def _build_hth_stats(red: Fighter, blue: Fighter, red_percentiles: Optional[Dict[str, float]] = None, blue_percentiles: Optional[Dict[str, float]] = None) -> List[dict]:
     # Build head-to-head comparison rows from FighterComposition
     rc, bc = red.composition, blue.composition
     rs, bs = rc.stats or {}, bc.stats or {}
+    rp, bp = red_percentiles or {}, blue_percentiles or {}
 
     def norm(a: float, b: float) -> Tuple[int, int]:
         # Scale both values so max(a, b) = 100%
         m = max(a, b, 0.001)
         return round(a / m * 100), round(b / m * 100)
 
+    def ranked(metric: str, fallback: Tuple[int, int]) -> Tuple[int, int]:
+        # Bar widths are division percentiles when the data API has them
+        if metric in rp and metric in bp:
+            return round(rp[metric]), round(bp[metric])
+        return fallback
+
     rows = []
     # Style Composition
     for label, r_val, b_val in [
@@ -370,33 +380,36 @@ def _build_hth_stats(red: Fighter, blue: Fighter) -> List[dict]:
         })
     # Fight Record
     if "win_rate" in rs and "win_rate" in bs:
+        r_pct, b_pct = ranked('win_rate', (int(rs.get('win_rate', 0) * 100), int(bs.get('win_rate', 0) * 100)))
         rows.append({
             "label": "Win Rate",
             "red": f"{round(rs.get('win_rate', 0) * 100, 1)}%",
             "blue": f"{round(bs.get('win_rate', 0) * 100, 1)}%",
-            "red_pct": int(rs.get('win_rate', 0) * 100),
-            "blue_pct": int(bs.get('win_rate', 0) * 100),
+            "red_pct": r_pct,
+            "blue_pct": b_pct,
         })
     if "total_fights" in rs and "total_fights" in bs:
+        r_pct, b_pct = ranked('total_fights', (50, 50))
         rows.append({
             "label": "Total Fights",
             "red": rs.get('total_fights', 0),
             "blue": bs.get('total_fights', 0),
-            "red_pct": 50,
-            "blue_pct": 50,
+            "red_pct": r_pct,
+            "blue_pct": b_pct,
         })
     if "current_streak" in rs and "current_streak" in bs:
+        r_pct, b_pct = ranked('current_streak', (50, 50))
         rows.append({
             "label": "Current Streak",
             "red": rs.get('current_streak', 0),
             "blue": bs.get('current_streak', 0),
-            "red_pct": 50,
-            "blue_pct": 50,
+            "red_pct": r_pct,
+            "blue_pct": b_pct,
         })
     # Striking Stats
     if "sig_str_per_min" in rs and "sig_str_per_min" in bs:
         r_val, b_val = rs.get('sig_str_per_min', 0), bs.get('sig_str_per_min', 0)
-        r_pct, b_pct = norm(r_val, b_val)
+        r_pct, b_pct = ranked('sig_str_per_min', norm(r_val, b_val))
         rows.append({
             "label": "Sig. Str. / min",
             "red": round(r_val, 2),
@@ -406,7 +419,7 @@ def _build_hth_stats(red: Fighter, blue: Fighter) -> List[dict]:
         })
     if "kd_per_min" in rs and "kd_per_min" in bs:
         r_val, b_val = rs.get('kd_per_min', 0), bs.get('kd_per_min', 0)
-        r_pct, b_pct = norm(r_val, b_val)
+        r_pct, b_pct = ranked('kd_per_min', norm(r_val, b_val))
         rows.append({
             "label": "KD / min",
             "red": round(r_val, 3),
@@ -417,7 +430,7 @@ def _build_hth_stats(red: Fighter, blue: Fighter) -> List[dict]:
     # Takedown Stats
     if "td_att_per_min" in rs and "td_att_per_min" in bs:
         r_val, b_val = rs.get('td_att_per_min', 0), bs.get('td_att_per_min', 0)
-        r_pct, b_pct = norm(r_val, b_val)
+        r_pct, b_pct = ranked('td_att_per_min', norm(r_val, b_val))
         rows.append({
             "label": "TD Att / min",
             "red": round(r_val, 3),
@@ -427,7 +440,7 @@ def _build_hth_stats(red: Fighter, blue: Fighter) -> List[dict]:
         })
     if "td_success_per_min" in rs and "td_success_per_min" in bs:
         r_val, b_val = rs.get('td_success_per_min', 0), bs.get('td_success_per_min', 0)
-        r_pct, b_pct = norm(r_val, b_val)
+        r_pct, b_pct = ranked('td_success_per_min', norm(r_val, b_val))
         rows.append({
             "label": "TD Success / min",
             "red": round(r_val, 3),
@@ -438,7 +451,7 @@ def _build_hth_stats(red: Fighter, blue: Fighter) -> List[dict]:
     # Control
     if "ctrl_sec_per_min" in rs and "ctrl_sec_per_min" in bs:
         r_val, b_val = rs.get('ctrl_sec_per_min', 0), bs.get('ctrl_sec_per_min', 0)
-        r_pct, b_pct = norm(r_val, b_val)
+        r_pct, b_pct = ranked('ctrl_sec_per_min', norm(r_val, b_val))
         rows.append({
             "label": "Ctrl Sec / min",
             "red": round(r_val, 2),
@@ -448,53 +461,59 @@ def _build_hth_stats(red: Fighter, blue: Fighter) -> List[dict]:
         })
     # Strike Distribution
     if "distance_strike_ratio" in rs and "distance_strike_ratio" in bs:
+        r_pct, b_pct = ranked('distance_strike_ratio', (int(rs.get('distance_strike_ratio', 0) * 100), int(bs.get('distance_strike_ratio', 0) * 100)))
         rows.append({
             "label": "Distance Str %",
             "red": f"{round(rs.get('distance_strike_ratio', 0) * 100, 1)}%",
             "blue": f"{round(bs.get('distance_strike_ratio', 0) * 100, 1)}%",
-            "red_pct": int(rs.get('distance_strike_ratio', 0) * 100),
-            "blue_pct": int(bs.get('distance_strike_ratio', 0) * 100),
+            "red_pct": r_pct,
+            "blue_pct": b_pct,
         })
     if "clinch_strike_ratio" in rs and "clinch_strike_ratio" in bs:
+        r_pct, b_pct = ranked('clinch_strike_ratio', (int(rs.get('clinch_strike_ratio', 0) * 100), int(bs.get('clinch_strike_ratio', 0) * 100)))
         rows.append({
             "label": "Clinch Str %",
             "red": f"{round(rs.get('clinch_strike_ratio', 0) * 100, 1)}%",
             "blue": f"{round(bs.get('clinch_strike_ratio', 0) * 100, 1)}%",
-            "red_pct": int(rs.get('clinch_strike_ratio', 0) * 100),
-            "blue_pct": int(bs.get('clinch_strike_ratio', 0) * 100),
+            "red_pct": r_pct,
+            "blue_pct": b_pct,
         })
     if "ground_strike_ratio" in rs and "ground_strike_ratio" in bs:
+        r_pct, b_pct = ranked('ground_strike_ratio', (int(rs.get('ground_strike_ratio', 0) * 100), int(bs.get('ground_strike_ratio', 0) * 100)))
         rows.append({
             "label": "Ground Str %",
             "red": f"{round(rs.get('ground_strike_ratio', 0) * 100, 1)}%",
             "blue": f"{round(bs.get('ground_strike_ratio', 0) * 100, 1)}%",
-            "red_pct": int(rs.get('ground_strike_ratio', 0) * 100),
-            "blue_pct": int(bs.get('ground_strike_ratio', 0) * 100),
+            "red_pct": r_pct,
+            "blue_pct": b_pct,
         })
     # Target Distribution
     if "head_target_ratio" in rs and "head_target_ratio" in bs:
+        r_pct, b_pct = ranked('head_target_ratio', (int(rs.get('head_target_ratio', 0) * 100), int(bs.get('head_target_ratio', 0) * 100)))
         rows.append({
             "label": "Head Target %",
             "red": f"{round(rs.get('head_target_ratio', 0) * 100, 1)}%",
             "blue": f"{round(bs.get('head_target_ratio', 0) * 100, 1)}%",
-            "red_pct": int(rs.get('head_target_ratio', 0) * 100),
-            "blue_pct": int(bs.get('head_target_ratio', 0) * 100),
+            "red_pct": r_pct,
+            "blue_pct": b_pct,
         })
     if "body_target_ratio" in rs and "body_target_ratio" in bs:
+        r_pct, b_pct = ranked('body_target_ratio', (int(rs.get('body_target_ratio', 0) * 100), int(bs.get('body_target_ratio', 0) * 100)))
         rows.append({
             "label": "Body Target %",
             "red": f"{round(rs.get('body_target_ratio', 0) * 100, 1)}%",
             "blue": f"{round(bs.get('body_target_ratio', 0) * 100, 1)}%",
-            "red_pct": int(rs.get('body_target_ratio', 0) * 100),
-            "blue_pct": int(bs.get('body_target_ratio', 0) * 100),
+            "red_pct": r_pct,
+            "blue_pct": b_pct,
         })
     if "leg_target_ratio" in rs and "leg_target_ratio" in bs:
+        r_pct, b_pct = ranked('leg_target_ratio', (int(rs.get('leg_target_ratio', 0) * 100), int(bs.get('leg_target_ratio', 0) * 100)))
         rows.append({
             "label": "Leg Target %",
             "red": f"{round(rs.get('leg_target_ratio', 0) * 100, 1)}%",
             "blue": f"{round(bs.get('leg_target_ratio', 0) * 100, 1)}%",
-            "red_pct": int(rs.get('leg_target_ratio', 0) * 100),
-            "blue_pct": int(bs.get('leg_target_ratio', 0) * 100),
+            "red_pct": r_pct,
+            "blue_pct": b_pct,
         })
     return rows
 
@@ -292,6 +292,32 @@ class FrontEndService:
         except Exception:
             return {}
 
+    def getLeaderboard(self, weight_class: str, metric: str = "sig_str_per_min", n: int = 25, min_fights: int = 0) -> List[dict]:
+        # Top fighters in a division from the data API, for the division browser
+        try:
+            payload = self._try_get_json(
+                [f"{self._data_api_url}/leaderboard/{weight_class}"],
+                timeout=self._timeout,
+                params={"metric": metric, "n": n, "min_fights": min_fights},
+            )
+            return (payload or {}).get("fighters", [])
+        except Exception as e:
+            print(f"getLeaderboard error: {e}")
+            return []
+
+    def getPercentiles(self, fighter_id: str) -> Dict[str, float]:
+        # Division percentile (0-100) per vector feature; empty when unavailable
+        try:
+            payload = self._try_get_json(
+                [f"{self._data_api_url}/percentile/{fighter_id}"],
+                timeout=self._timeout,
+            )
+            percentiles = (payload or {}).get("percentiles") or {}
+            return {k: v for k, v in percentiles.items() if v is not None}
+        except Exception as e:
+            print(f"getPercentiles error: {e}")
+            return {}
+
     def getPopularFighters(self) -> List[Fighter]:
         try:
             if self._execution_api_url:
@@ -16,6 +16,8 @@ import torch
 import torch.nn as nn
 from torch.utils.data import Dataset, DataLoader
 
+from OutcomeVectorBuilder import load_training_matrix, mirror_matchups
+
 
 # ----------------------------
 # CONFIG
@@ -23,12 +25,16 @@ from torch.utils.data import Dataset, DataLoader
 @dataclass
 class Config:
     csv_path: str = "./outcome_training_vectors_2.csv"
+    # Written by OutcomeVectorBuilder alongside the CSV; used instead of it when present
+    matrix_path: str = "./outcome_training_vectors_2.npy"
     label_col: str = "y"
     out_dir: str = "./outcome_artifacts_32_retrain_2_test"
 
     test_size: float = 0.15
     val_size: float = 0.15
     random_state: int = 42
+    # Also train on every training fight with A and B swapped
+    mirror_train: bool = False
 
     batch_size: int = 128
     epochs: int = 100
@@ -109,8 +115,13 @@ class FightDataset(Dataset):
 # ----------------------------
 # Helpers
 # ----------------------------
-def load_and_validate(csv_path: str, label_col: str) -> pd.DataFrame:
-    df = pd.read_csv(csv_path)
+def load_and_validate(data_path: str, label_col: str) -> pd.DataFrame:
+    if data_path.endswith(".npy"):
+        # Memory-mapped; the frame is a view of the file until the cleanup below copies it
+        matrix, columns = load_training_matrix(data_path)
+        df = pd.DataFrame(matrix, columns=columns, copy=False)
+    else:
+        df = pd.read_csv(data_path)
 
     if label_col not in df.columns:
         raise ValueError(f"Label column '{label_col}' not found in CSV.")
@@ -238,8 +249,9 @@ def main():
     os.makedirs(CFG.out_dir, exist_ok=True)
 
     # 1) Load & validate
-    df = load_and_validate(CFG.csv_path, CFG.label_col)
-    print(f"Loaded {len(df)} fights from {CFG.csv_path}")
+    data_path = CFG.matrix_path if os.path.exists(CFG.matrix_path) else CFG.csv_path
+    df = load_and_validate(data_path, CFG.label_col)
+    print(f"Loaded {len(df)} fights from {data_path}")
     print(df)
 
     # 2) Split into train / temp
@@ -259,6 +271,9 @@ def main():
         stratify=temp_df[CFG.label_col],
     )
 
+    if CFG.mirror_train:
+        # Mirrored after the split, so no fight is on both sides of it
+        train_df = pd.concat([train_df, mirror_matchups(train_df)], ignore_index=True)
     print(f"Train: {len(train_df)} | Val: {len(val_df)} | Test: {len(test_df)}")
 
     # 4) Build loaders and scaler
@@ -357,7 +372,7 @@ def main():
     joblib.dump(scaler, scaler_path)
 
     metadata = {
-        "csv_path": CFG.csv_path,
+        "csv_path": data_path,
         "label_col": CFG.label_col,
         "feature_order": FEATURE_ORDER,
         "d_fighter": D_FIGHTER,
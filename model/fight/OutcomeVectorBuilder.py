@@ -4,20 +4,20 @@ This class serves to combine the data from outcome_vectors into single rows of f
 [Fa,Fb,Fa-Fb,Fa*Fb]
 """
 
-import pandas as pd
-
-df = pd.read_csv("../../resources/fighter_vectors/outcome_vectors_2.csv")
+import argparse
+from typing import List, Tuple
 
-# Drop fights that happened over 10 years ago
-df = df[pd.to_datetime(df["event_date"]) >= (pd.Timestamp.today() - pd.DateOffset(years=10))]
+import numpy as np
+import pandas as pd
 
-# Drop fights where fighters had too little data
-df = df[df["n_fights_norm"] >= 0.2]
+OUTCOME_VECTORS_CSV = "../../resources/fighter_vectors/outcome_vectors_2.csv"
+TRAINING_CSV = "outcome_training_vectors_2.csv"
+TRAINING_MATRIX = "outcome_training_vectors_2.npy"
 
 # Explicit feature vectors
 feature_cols = [
     "muay_thai",
-    "boxing", 
+    "boxing",
     "wrestling",
     "grappling",
     "pace",
@@ -26,40 +26,100 @@ feature_cols = [
     "n_fights_norm",
 ]
 
-df[feature_cols] = df[feature_cols].apply(pd.to_numeric, errors="coerce")
 
-df["fighter_idx"] = df.groupby("fight_id").cumcount()
+def build_matchups(df: pd.DataFrame, today: pd.Timestamp = None) -> pd.DataFrame:
+    """
+    One row per fight with both fighters' features side by side (fighter A is
+    the fight's first row in df), their differences and products, and y = 1
+    when A won. Ordered by fight_id.
+    """
+    today = today if today is not None else pd.Timestamp.today()
 
-# Keep only fights with exactly 2 rows
-df = df.groupby("fight_id").filter(lambda g: len(g) == 2)
+    # Drop fights that happened over 10 years ago
+    df = df[pd.to_datetime(df["event_date"]) >= (today - pd.DateOffset(years=10))]
 
-# Pivot the dataset
-match_df = df.pivot(
-    index="fight_id",
-    columns="fighter_idx",
-    values=feature_cols    
-)
+    # Drop fights where fighters had too little data
+    df = df[df["n_fights_norm"] >= 0.2].copy()
 
-# Flatten column names
-match_df.columns = [
-    f"{col}_A" if idx == 0 else f"{col}_B"
-    for col, idx in match_df.columns
-]
-match_df = match_df.reset_index()
+    df[feature_cols] = df[feature_cols].apply(pd.to_numeric, errors="coerce")
+
+    # Keep only fights with exactly 2 rows; a stable sort puts each pair's rows next to each other in file order
+    df = df[df.groupby("fight_id")["fight_id"].transform("size") == 2]
+    df = df.sort_values("fight_id", kind="mergesort")
+    return _pair_rows(df.iloc[0::2], df.iloc[1::2])
+
+
+def _pair_rows(a: pd.DataFrame, b: pd.DataFrame) -> pd.DataFrame:
+    a_features = a[feature_cols].fillna(0).to_numpy(dtype=np.float64)
+    b_features = b[feature_cols].fillna(0).to_numpy(dtype=np.float64)
+
+    match_df = pd.DataFrame({"fight_id": a["fight_id"].to_numpy()})
+    for i, col in enumerate(feature_cols):
+        match_df[f"{col}_A"] = a_features[:, i]
+        match_df[f"{col}_B"] = b_features[:, i]
+
+    # Add matchup features (difference and product)
+    for i, col in enumerate(feature_cols):
+        match_df[f"{col}_diff"] = a_features[:, i] - b_features[:, i]
+        match_df[f"{col}_inter"] = a_features[:, i] * b_features[:, i]
+
+    # Create the label
+    match_df["y"] = (a["win"].to_numpy() == 1).astype(int)
+    return match_df
+
+
+def mirror_matchups(match_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    The same fights with fighters A and B swapped, for augmenting a training
+    split after it is taken: mirroring before the split would put a fight on
+    both sides of it. y is flipped, which assumes each fight has one winner
+    (true of every paired fight in the outcome vectors).
+    """
+    mirrored = match_df.copy()
+    for col in feature_cols:
+        mirrored[f"{col}_A"] = match_df[f"{col}_B"]
+        mirrored[f"{col}_B"] = match_df[f"{col}_A"]
+        mirrored[f"{col}_diff"] = -match_df[f"{col}_diff"]
+    mirrored["y"] = 1 - match_df["y"]
+    return mirrored
+
+
+def save_training_matrix(match_df: pd.DataFrame, npy_path: str) -> None:
+    """
+    Writes every column but fight_id as a float32 .npy of named fields, so
+    load_training_matrix can memory-map it as one (fights x columns) matrix.
+    """
+    columns = [c for c in match_df.columns if c != "fight_id"]
+    records = np.empty(len(match_df), dtype=[(c, np.float32) for c in columns])
+    for col in columns:
+        records[col] = match_df[col].to_numpy(dtype=np.float32)
+    np.save(npy_path, records)
+
+
+def load_training_matrix(npy_path: str) -> Tuple[np.ndarray, List[str]]:
+    """The float32 matrix written by save_training_matrix, memory-mapped, and its column names."""
+    records = np.load(npy_path, mmap_mode="r")
+    columns = list(records.dtype.names)
+    return records.view(np.float32).reshape(len(records), len(columns)), columns
 
-# Add matchup features (difference and product)
-match_df = match_df.fillna(0)
 
-for col in feature_cols:
-    match_df[f"{col}_diff"] = match_df[f"{col}_A"] - match_df[f"{col}_B"]
-    match_df[f"{col}_inter"] = match_df[f"{col}_A"] * match_df[f"{col}_B"]
+def build_outcome_training_vectors(input_csv: str = OUTCOME_VECTORS_CSV,
+                                   output_csv: str = TRAINING_CSV,
+                                   output_npy: str = TRAINING_MATRIX) -> pd.DataFrame:
+    """Builds the matchup table from input_csv and writes it to each output path given."""
+    match_df = build_matchups(pd.read_csv(input_csv))
+    if output_csv:
+        match_df.to_csv(output_csv, index=False)
+    if output_npy:
+        save_training_matrix(match_df, output_npy)
+    print(f"Built {len(match_df)} matchup rows from {input_csv}")
+    return match_df
 
-# Create the label
-win_df = df[["fight_id", "fighter_idx", "win"]].pivot(
-    index="fight_id",
-    columns="fighter_idx",
-    values="win"
-)
-match_df["y"] = (win_df[0] == 1).astype(int).values
 
-match_df.to_csv("outcome_training_vectors_2.csv", mode="a", index=False, header=True)
\ No newline at end of file
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pair outcome vectors into matchup training rows")
+    parser.add_argument("--input", default=OUTCOME_VECTORS_CSV)
+    parser.add_argument("--output-csv", default=TRAINING_CSV)
+    parser.add_argument("--output-npy", default=TRAINING_MATRIX)
+    args = parser.parse_args()
+    build_outcome_training_vectors(args.input, args.output_csv, args.output_npy)
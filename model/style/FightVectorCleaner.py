@@ -21,23 +21,32 @@ This class serves to clean fight vectors from fight_vectors_dated to be exactly
 
 """
 
-import csv
+import sys
 import pandas as pd
 import numpy as np
-from datetime import datetime
-from typing import List
-from style.StylePredictor import StylePredictor
-from datetime import datetime, timedelta
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+for path in (REPO_ROOT, REPO_ROOT / "data", REPO_ROOT / "model"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from cache.FightIndex import FightIndex
+from RatingService import RatingService
 
 FIGHT_VECTOR_CSV = "../resources/fighter_vectors/fight_vectors_dated.csv"
 
 OUTCOME_FIGHT_VECTOR_CSV = "../resources/fighter_vectors/outcome_fighter_vectors_all.csv"
+OUTCOME_VECTOR_CSV = "outcome_vectors.csv"
 
-FIGHT_CSV = "../resources/initial_data/fights_dedupe.csv"
+FIGHT_CSV = "../resources/initial_data/fights.csv"
 EVENT_CSV = "../resources/initial_data/events.csv"
 EVENT_INFO_CSV = "../resources/initial_data/events-info.csv"
 
-style_predictor = StylePredictor()
+# Built by loadData, so importing the helpers below (as StylePredictionService does) loads no model or CSVs
+style_predictor = None
+fight_index = None
+rating_service = None
 
 feature_cols = [
     "sig_str_per_min",
@@ -57,108 +66,74 @@ feature_cols = [
     "leg_target_ratio",
 ]
 
-event_data = None
-event_info_data = None
 def loadData():
-    event_data = pd.read_csv(EVENT_CSV)
-    event_data["event_date"] = pd.to_datetime(event_data["event_date"])
-    event_info_data = pd.read_csv(EVENT_INFO_CSV)
-
-def addDayToDate(date_str: str):
-    # Convert string → datetime
-    date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-
-    # Add one day
-    new_date = date_obj + timedelta(days=1)
-
-    # Convert back to string
-    return new_date.strftime("%Y-%m-%d")
-
-def getEventIdByDate(date: str):
-    return event_data.loc[event_data["event_date"] == date, "event_id"].iloc[0]
-
-def getFightId(fighter: str, date: str):
-    event_id = getEventIdByDate(date)
-    fight_id = event_info_data.loc[
-        (event_info_data["event_id"] == event_id) &
-        (
-            (event_info_data["winner_name"] == fighter) |
-            (event_info_data["loser_name"] == fighter)
-        ),
-        "fight_id"
-    ].iloc[0]
-    return fight_id
+    global style_predictor, fight_index, rating_service
+    from style.StylePredictor import StylePredictor
+    if style_predictor is None:
+        style_predictor = StylePredictor()
+    if fight_index is None:
+        fight_index = FightIndex.from_csv(EVENT_CSV, EVENT_INFO_CSV, FIGHT_CSV)
+        rating_service = RatingService(fight_index)
+    fight_index.load()
 
 def calculatePace(sig_strike_per_min: float, td_att_per_min: float):
     return sig_strike_per_min + td_att_per_min
 
-def normalizeNumberOfFights(fights: int):
-    return min(int(fights), 10) / 10
-
-def getStyleVector(fighter_vector: dict):
-    # Gather features for style predictor
-    df = pd.DataFrame([fighter_vector])
-    features = df[feature_cols].replace([np.inf, -np.inf], np.nan).fillna(0.0).to_numpy(dtype=np.float32).tolist()
-
-    # Calculate style vector
-    return style_predictor.predict(features[0])[0]
-
-def dedupe_csv(input_path: str, output_path: str) -> None:
-    seen = set()
-
-    with open(input_path, newline="", encoding="utf-8") as infile, \
-         open(output_path, "w", newline="", encoding="utf-8") as outfile:
-
-        reader = csv.reader(infile)
-        writer = csv.writer(outfile)
-
-        header = next(reader)
-        writer.writerow(header)
-
-        for row in reader:
-            row_tuple = tuple(row)
-            if row_tuple not in seen:
-                seen.add(row_tuple)
-                writer.writerow(row)
-
-
-def generateOutcomeVectorTrainingData():
+def normalizeNumberOfFights(fights):
+    # One fight count or a column of them
+    return np.minimum(np.asarray(fights).astype(int), 10) / 10
+
+def buildOutcomeVectors(fight_vectors: pd.DataFrame, include_elo: bool = False, predictor=None, index: FightIndex = None, ratings: RatingService = None) -> pd.DataFrame:
+    """
+    Outcome vectors for rows in the fight_vectors_dated layout: styles from one
+    batched StyleNet pass, fight_ids joined on (fighter_id, fight date). Rows
+    whose fight cannot be found are dropped. predictor, index and ratings
+    default to the ones loadData builds.
+    """
+    predictor = predictor or style_predictor
+    index = index or fight_index
+    ratings = ratings or rating_service
+    vectors = fight_vectors.copy()
+    # fight_vectors_dated rows are dated the day before the fight
+    vectors["event_date"] = pd.to_datetime(vectors["event_date"]) + pd.Timedelta(days=1)
+
+    features = vectors[feature_cols].apply(pd.to_numeric, errors="coerce").replace([np.inf, -np.inf], np.nan).fillna(0.0)
+    style = predictor.predict_batch(features.to_numpy(dtype=np.float32))
+
+    vectors = vectors.merge(index.fighter_date_frame(), on=["fighter_id", "event_date"], how="left", sort=False)
+    found = vectors["fight_id"].notna().to_numpy()
+    if not found.all():
+        print(f"No fight found for {(~found).sum()} fighter vectors, skipping them")
+
+    outcome_vectors = pd.DataFrame({
+        "fighter": vectors["fighter"],
+        "fighter_id": vectors["fighter_id"],
+        "fight_id": vectors["fight_id"],
+        "event_date": vectors["event_date"].dt.strftime("%Y-%m-%d"),
+        "muay_thai": style[:, 0],
+        "boxing": style[:, 1],
+        "wrestling": style[:, 2],
+        "grappling": style[:, 3],
+        "pace": calculatePace(features["sig_str_per_min"], features["td_att_per_min"]),
+        "td_success": vectors["td_success_per_min"],
+        "ctrl_share": vectors["ctrl_sec_per_min"],
+        "n_fights_norm": normalizeNumberOfFights(vectors["total_fights"]),
+        "win": (vectors["win"].astype(str) == "True").astype(int),
+    })[found]
+    if include_elo:
+        outcome_vectors["elo"] = [ratings.rating(f, d) for f, d in zip(outcome_vectors["fighter_id"], outcome_vectors["event_date"])]
+    return outcome_vectors.drop_duplicates().reset_index(drop=True)
+
+
+def generateOutcomeVectorTrainingData(include_elo: bool = False, output_csv: str = OUTCOME_VECTOR_CSV):
+    # include_elo appends each fighter's pre-fight Elo rating as a trailing "elo" column
     loadData()
-    counter = 1
-    with open(FIGHT_VECTOR_CSV, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)   # rows as dictionaries
-        for row in reader:
-            fighter = row["fighter"]
-            fighter_id = row["fighter_id"]
-            date = addDayToDate(row["event_date"])
-            try:
-                # Calculate style vector
-                style = getStyleVector(row)
-                print(style)
-
-                outcome_vector = {}
-                outcome_vector["fighter"] = fighter
-                outcome_vector["fighter_id"] = fighter_id
-                outcome_vector["fight_id"] = getFightId(fighter, date)
-                outcome_vector["event_date"] = date
-                outcome_vector["muay_thai"] = style[0]
-                outcome_vector["boxing"] = style[1]
-                outcome_vector["wrestling"] = style[2]
-                outcome_vector["grappling"] = style[3]
-                outcome_vector["pace"] = calculatePace(float(row["sig_str_per_min"]), float(row["td_att_per_min"]))
-                outcome_vector["td_success"] = row["td_success_per_min"]
-                outcome_vector["ctrl_share"] = row["ctrl_sec_per_min"]
-                outcome_vector["n_fights_norm"] = normalizeNumberOfFights(row["total_fights"])
-                outcome_vector["won"] = 1 if row["win"] == "True" else 0
-
-                pd.DataFrame([outcome_vector]).to_csv("test.csv", mode="a", index=False, header=False)
-                print(f"{counter}. Saved DF for {fighter} on {date}: {outcome_vector}")
-            except Exception as e:
-                print(f"Encountered exception when calculating outcome vector for {fighter} on {date}: {e}")
-            counter = counter + 1
-
-
-    dedupe_csv("test.csv", "outcome_vectors.csv")
+    fight_vectors = pd.read_csv(FIGHT_VECTOR_CSV, dtype={"fighter_id": str}, float_precision="round_trip")
+    print(f"Calculating outcome vectors for {len(fight_vectors)} fighter vectors")
+
+    outcome_vectors = buildOutcomeVectors(fight_vectors, include_elo)
+    outcome_vectors.to_csv(output_csv, index=False)
+    print(f"Saved {len(outcome_vectors)} outcome vectors to {output_csv}")
 
 if __name__ == "__main__":
-    generateOutcomeVectorTrainingData()
\ No newline at end of file
+    generateOutcomeVectorTrainingData()
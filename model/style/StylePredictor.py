@@ -10,7 +10,9 @@ import numpy as np
 class StylePredictor:
 
     MAP_LOCATION = "cuda" if torch.cuda.is_available() else "cpu"
-    
+    # Rows per forward pass in predict_batch
+    BATCH_SIZE = 8192
+
     def __init__(self):
         metadata_dir = Path(__file__).resolve().parent / "metadata"
         self._model_path = str(metadata_dir / "style_model.pt")
@@ -35,3 +37,17 @@ class StylePredictor:
         with torch.no_grad():
             comp = self._model(torch.tensor(X_scaled, dtype=torch.float32))
         return comp.numpy().tolist()
+
+    def predict_batch(self, features: np.ndarray) -> np.ndarray:
+        # One row of features per fighter; returns one row of 4 style weights each
+        features = np.asarray(features, dtype=np.float64)
+        if len(features) == 0:
+            return np.empty((0, 4), dtype=np.float32)
+        X_scaled = self._scaler.transform(features)
+        X = torch.tensor(X_scaled, dtype=torch.float32)
+
+        comps = []
+        with torch.no_grad():
+            for start in range(0, len(X), self.BATCH_SIZE):
+                comps.append(self._model(X[start:start + self.BATCH_SIZE]).numpy())
+        return np.concatenate(comps)
@@ -0,0 +1,208 @@
+"""
+Historical backfill: rebuild events.csv, events-info.csv and fights.csv from ufcstats.
+
+Work is split into shards of consecutive events (oldest first). Each shard's
+event pages and then fight pages are fetched concurrently, its rows are
+appended to the caches in one batched write per file, and only then is the
+shard checkpointed to the progress file. An interrupted run resumes at the
+first unfinished shard; ids already in the output caches are never fetched or
+written twice, so a crash between a write and its checkpoint is harmless.
+
+Usage (from the repo root):
+    python scripts/backfill.py --out-dir resources/initial_data
+    python scripts/backfill.py --out-dir /tmp/rebuild --shard-size 25 --fresh
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, List
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DATA_DIR = REPO_ROOT / "data"
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(DATA_DIR))
+
+from cache.CsvUtil import append_rows
+from cache.EventCache import EventCache
+from cache.EventInfoCache import EventInfoCache
+from cache.FightCache import FightCache
+from cache.FightIndex import field_of, parse_event_date
+from scrapers.ScraperService import ScraperService
+
+DEFAULT_OUT_DIR = REPO_ROOT / "resources" / "initial_data"
+DEFAULT_SHARD_SIZE = 20
+PROGRESS_FILE = "backfill-progress.json"
+
+
+class BackfillProgress:
+    """
+    Checkpoint of a backfill run (a small JSON file, replaced atomically).
+
+      events_done     events whose info and every completed fight are saved
+      fights_done     fights saved so far, including those of unfinished events
+      failed          id -> last error, retried on the next run
+    """
+
+    def __init__(self, json_path: Path):
+        self.json_path = json_path
+        self.events_done = set()
+        self.fights_done = set()
+        self.failed: Dict[str, str] = {}
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+
+    def load(self) -> "BackfillProgress":
+        if self.json_path.exists():
+            with open(self.json_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            self.events_done = set(state.get("events_done", []))
+            self.fights_done = set(state.get("fights_done", []))
+            self.failed = dict(state.get("failed", {}))
+            self.started_at = state.get("started_at", self.started_at)
+        return self
+
+    def save(self) -> None:
+        state = {
+            "started_at": self.started_at,
+            "updated_at": datetime.now().isoformat(timespec="seconds"),
+            "events_done": sorted(self.events_done),
+            "fights_done": sorted(self.fights_done),
+            "failed": dict(sorted(self.failed.items())),
+        }
+        tmp_path = self.json_path.with_name(self.json_path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=1)
+        os.replace(tmp_path, self.json_path)
+
+
+class Backfill:
+
+    def __init__(self, out_dir: Path, shard_size: int, scraper: ScraperService = None):
+        self.out_dir = out_dir
+        self.shard_size = shard_size
+        self.scraper = scraper or ScraperService()
+        self.event_cache = EventCache(str(self._csv("events.csv", EventCache.FIELDS)))
+        self.event_info_cache = EventInfoCache(str(self._csv("events-info.csv", EventInfoCache.FIELDS)))
+        self.fight_cache = FightCache(str(self._csv("fights.csv", FightCache.FIELDS)))
+        self.progress = BackfillProgress(out_dir / PROGRESS_FILE).load()
+
+    def run(self) -> bool:
+        events = self._listEvents()
+        today = date.today()
+        past = [e for e in events if (parse_event_date(e["event_date"]) or today) < today]
+        todo = [e["event_id"] for e in past if e["event_id"] not in self.progress.events_done]
+        shards = [todo[i:i + self.shard_size] for i in range(0, len(todo), self.shard_size)]
+        logging.info(
+            f"{len(past)} completed events, {len(past) - len(todo)} already done; "
+            f"{len(todo)} to go in {len(shards)} shards of {self.shard_size}"
+        )
+
+        started = time.monotonic()
+        fights_fetched = 0
+        for n, shard in enumerate(shards, start=1):
+            fights_fetched += self._runShard(shard)
+            self.progress.save()
+
+            elapsed = time.monotonic() - started
+            events_done = sum(len(s) for s in shards[:n])
+            eta = elapsed / events_done * (len(todo) - events_done)
+            logging.info(
+                f"Shard {n}/{len(shards)}: {events_done}/{len(todo)} events, {fights_fetched} fights in {elapsed:.0f}s "
+                f"({events_done / elapsed * 60:.1f} events/min, {fights_fetched / elapsed:.2f} fights/s), "
+                f"ETA {format_duration(eta)}, {len(self.progress.failed)} failed"
+            )
+
+        if self.progress.failed:
+            logging.warning(f"{len(self.progress.failed)} ids failed; run again to retry them: {sorted(self.progress.failed)[:10]}")
+        return not self.progress.failed
+
+    def _listEvents(self) -> List[Dict]:
+        # The full listing, oldest first; events missing from the output are saved up front
+        listed = [e for e in self.scraper.scrape_all_events() if e.get("event_id")]
+        if not listed:
+            raise RuntimeError("Could not list events from ufcstats")
+        known = {field_of(e, "event_id") for e in self.event_cache.all()}
+        new_events = [e for e in listed if e["event_id"] not in known]
+        if new_events:
+            self.event_cache.saveAll(new_events)
+        return sorted(listed, key=lambda e: parse_event_date(e["event_date"]) or date.max)
+
+    def _runShard(self, event_ids: List[str]) -> int:
+        # 1) Event pages for events without saved info
+        need_info = [e for e in event_ids if not self.event_info_cache.get_event(e)]
+        infos = []
+        # Pages that parsed, including cards with no completed (fight_id) bouts to save
+        scraped = set()
+        for event_id, rows in self.scraper.scrape_event_infos(need_info).items():
+            if rows:
+                infos.extend(row for row in rows if row.get("fight_id"))
+                scraped.add(event_id)
+                self.progress.failed.pop(event_id, None)
+            else:
+                self.progress.failed[event_id] = "no event info returned"
+        if infos:
+            self.event_info_cache.saveAll(infos)
+
+        # 2) Fight pages for the shard's fights not saved yet
+        fight_ids = {
+            e: [info.fight_id for info in self.event_info_cache.get_event(e) if info.fight_id]
+            for e in event_ids
+        }
+        need_fights = [f for ids in fight_ids.values() for f in ids if not self.fight_cache.hasFight(f)]
+        lines = []
+        for fight_id, rows in self.scraper.scrape_fight_infos(need_fights).items():
+            if rows:
+                lines.extend(rows)
+                self.progress.failed.pop(fight_id, None)
+            else:
+                self.progress.failed[fight_id] = "no fight stats returned"
+        if lines:
+            self.fight_cache.saveAll(lines)
+
+        # 3) Checkpoint what is now on disk
+        for event_id, ids in fight_ids.items():
+            saved = [f for f in ids if self.fight_cache.hasFight(f)]
+            self.progress.fights_done.update(saved)
+            if len(saved) == len(ids) and (ids or event_id in scraped):
+                self.progress.events_done.add(event_id)
+        return len({line["fight_id"] for line in lines})
+
+    def _csv(self, name: str, fields: List[str]) -> Path:
+        # The caches expect their CSV to exist; a fresh output dir starts with headers only
+        path = self.out_dir / name
+        if not path.exists() or path.stat().st_size == 0:
+            append_rows(str(path), fields, [])
+        return path
+
+
+def format_duration(seconds: float) -> str:
+    # A full backfill can run past a day, which a bare HH:MM:SS would wrap
+    days, rest = divmod(int(seconds), 86400)
+    hms = time.strftime("%H:%M:%S", time.gmtime(rest))
+    return f"{days}d {hms}" if days else hms
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resumable historical backfill of the ufcstats dataset")
+    parser.add_argument("--out-dir", type=Path, default=DEFAULT_OUT_DIR, help="directory holding events.csv, events-info.csv and fights.csv")
+    parser.add_argument("--shard-size", type=int, default=DEFAULT_SHARD_SIZE, help="events fetched and checkpointed together")
+    parser.add_argument("--fresh", action="store_true", help="ignore an existing progress file (the output CSVs are kept)")
+    args = parser.parse_args()
+
+    args.out_dir.mkdir(parents=True, exist_ok=True)
+    if args.fresh and (args.out_dir / PROGRESS_FILE).exists():
+        (args.out_dir / PROGRESS_FILE).unlink()
+
+    backfill = Backfill(args.out_dir, max(1, args.shard_size))
+    sys.exit(0 if backfill.run() else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,376 @@
+"""
+Local stand-in for ufcstats.com and the Kalshi markets API, for offline load tests.
+
+Serves the pages the scrapers read (completed-events listing, event-details,
+fight-details) and Kalshi's /markets JSON for a synthetic, deterministic
+world of any size, with configurable latency, jitter and error rates. Pages
+recorded in an HTML cache directory (resources/html_cache) are replayed as-is
+when their path matches; fight-details pages are otherwise built from the
+recorded fixture in src/test/resources/ufcstats.
+
+Usage (from the repo root):
+    python scripts/standin_server.py --events 10000 --latency-ms 150 --error-rate 0.02
+
+then point the pipeline at it, e.g.
+    export UFCSTATS_BASE_URL=http://127.0.0.1:8765
+    export KALSHI_API_URL=http://127.0.0.1:8765/trade-api/v2/markets
+    export SCRAPE_POLITE_DELAY=0 SCRAPE_RATE_PER_SEC=50 SCRAPE_CACHE=off
+    python scripts/backfill.py --out-dir /tmp/backfill
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import date, timedelta
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "data"))
+
+from scrapers.HtmlCache import HtmlCache
+
+FIGHT_FIXTURE = REPO_ROOT / "src" / "test" / "resources" / "ufcstats" / "fight-details-3-rounds.html"
+# The fixture's fighters, swapped for each synthetic bout's fighters
+FIXTURE_FIGHTERS = [("a1b2c3d4e5f60718", "Islam Makhachev"), ("0f1e2d3c4b5a6978", "Dustin Poirier")]
+RECORDED_ORIGINS = ["http://ufcstats.com", "http://www.ufcstats.com", "https://ufcstats.com"]
+
+EVENTS_PER_PAGE = 25
+KALSHI_PAGE_LIMIT = 100
+WEIGHT_CLASSES = ["Flyweight", "Bantamweight", "Featherweight", "Lightweight", "Welterweight", "Middleweight", "Light Heavyweight", "Heavyweight"]
+METHODS = [("KO/TKO", "Punches"), ("Submission", "Rear Naked Choke"), ("Decision - Unanimous", ""), ("Decision - Split", "")]
+FIRST_NAMES = ["Alex", "Bruno", "Carlos", "Dan", "Eli", "Felipe", "Gabe", "Hugo", "Ivan", "Jon", "Kai", "Leo", "Max", "Nate", "Omar", "Paulo"]
+LAST_NAMES = ["Silva", "Jones", "Smith", "Nunes", "Costa", "Khan", "Lee", "Moreno", "Petrov", "Santos", "Walker", "Young", "Zhang", "Diaz", "Cruz", "Volkov"]
+LOCATIONS = ["Las Vegas, Nevada, USA", "Abu Dhabi, Abu Dhabi, United Arab Emirates", "London, England, United Kingdom", "Newark, New Jersey, USA"]
+
+
+def _hex_id(kind: str, n) -> str:
+    return hashlib.sha1(f"{kind}-{n}".encode()).hexdigest()[:16]
+
+
+class Event(NamedTuple):
+    event_id: str
+    name: str
+    date: date
+    location: str
+
+
+class Bout(NamedTuple):
+    fight_id: str
+    fighter_a: tuple
+    fighter_b: tuple
+    weight_class: str
+    method: tuple
+    round: int
+    time: str
+
+
+class World:
+    """A deterministic synthetic promotion: `events` completed events, weekly, plus `upcoming` future ones."""
+
+    def __init__(self, events: int, fights_per_event: int, upcoming: int, seed: int):
+        self.fights_per_event = fights_per_event
+        self.seed = seed
+        today = date.today()
+        total = events + upcoming
+        # Newest first, like the ufcstats listing
+        self.events = [
+            Event(_hex_id("event", i), f"UFC Standin {i + 1}", today + timedelta(days=7 * (i - events + 1) - 1), LOCATIONS[i % len(LOCATIONS)])
+            for i in reversed(range(total))
+        ]
+        self.by_id = {e.event_id: e for e in self.events}
+        # Built up front so a fight page resolves before (or without) its event page
+        self.fight_slots: Dict[str, Tuple[str, int]] = {
+            _hex_id("fight", f"{e.event_id}-{k}"): (e.event_id, k) for e in self.events for k in range(fights_per_event)
+        }
+        self.fighter_pool = max(64, events * fights_per_event // 4)
+
+    def fighter(self, n: int) -> tuple:
+        n %= self.fighter_pool
+        suffix = n // (len(FIRST_NAMES) * len(LAST_NAMES))
+        name = f"{FIRST_NAMES[n % len(FIRST_NAMES)]} {LAST_NAMES[(n // len(FIRST_NAMES)) % len(LAST_NAMES)]}"
+        return _hex_id("fighter", n), f"{name} {suffix + 1}" if suffix else name
+
+    @lru_cache(maxsize=4096)
+    def bouts(self, event_id: str) -> List[Bout]:
+        rng = random.Random(f"{self.seed}-{event_id}")
+        bouts = []
+        for k in range(self.fights_per_event):
+            a, b = rng.sample(range(self.fighter_pool), 2)
+            fight_id = _hex_id("fight", f"{event_id}-{k}")
+            rounds = rng.randint(1, 3)
+            bouts.append(Bout(
+                fight_id, self.fighter(a), self.fighter(b), rng.choice(WEIGHT_CLASSES), rng.choice(METHODS),
+                rounds, "5:00" if rounds == 3 else f"{rng.randint(0, 4)}:{rng.randint(0, 59):02d}",
+            ))
+        return bouts
+
+    def is_upcoming(self, event: Event) -> bool:
+        return event.date >= date.today()
+
+    def bout(self, fight_id: str) -> Optional[Bout]:
+        slot = self.fight_slots.get(fight_id)
+        return self.bouts(slot[0])[slot[1]] if slot else None
+
+
+class Pages:
+    """Builds ufcstats-shaped HTML and Kalshi-shaped JSON for a World."""
+
+    def __init__(self, world: World, base_url: str, html_cache_dir: Optional[Path]):
+        self.world = world
+        self.base_url = base_url
+        self.fight_template = FIGHT_FIXTURE.read_text(encoding="utf-8")
+        self.recorded = HtmlCache(str(html_cache_dir)) if html_cache_dir else None
+
+    def recorded_page(self, path_and_query: str) -> Optional[bytes]:
+        # Recorded pages are keyed by their original ufcstats url, whatever its age
+        if self.recorded is None:
+            return None
+        for origin in RECORDED_ORIGINS:
+            body = self.recorded.read(origin + path_and_query)
+            if body is not None:
+                return body
+        return None
+
+    def events_listing(self, page: str) -> str:
+        events = self.world.events
+        if page != "all":
+            start = (max(1, int(page or 1)) - 1) * EVENTS_PER_PAGE
+            events = events[start:start + EVENTS_PER_PAGE]
+        rows = "".join(f'''
+        <tr class="b-statistics__table-row">
+          <td class="b-statistics__table-col">
+            <i class="b-statistics__table-content">
+              <a href="{self.base_url}/event-details/{e.event_id}" class="b-link b-link_style_black">
+                {e.name}
+              </a>
+              <span class="b-statistics__date">
+                {e.date.strftime("%B %d, %Y")}
+              </span>
+            </i>
+          </td>
+          <td class="b-statistics__table-col b-statistics__table-col_style_big-top-padding">
+            {e.location}
+          </td>
+        </tr>''' for e in events)
+        return f'''<!DOCTYPE html>
+<html lang="en"><head><meta charset="utf-8"><title>UFC Stats</title></head>
+<body>
+  <table class="b-statistics__table-events">
+    <thead class="b-statistics__table-caption">
+      <tr class="b-statistics__table-row"><th class="b-statistics__table-col">Name/date</th><th class="b-statistics__table-col">Location</th></tr>
+    </thead>
+    <tbody>
+        <tr class="b-statistics__table-row"><td class="b-statistics__table-col b-statistics__table-col_type_first" colspan="2"></td></tr>{rows}
+    </tbody>
+  </table>
+</body></html>
+'''
+
+    def event_details(self, event_id: str) -> Optional[str]:
+        event = self.world.by_id.get(event_id)
+        if event is None:
+            return None
+        upcoming = self.world.is_upcoming(event)
+        rows = "".join(self._event_row(b, upcoming) for b in self.world.bouts(event_id))
+        return f'''<!DOCTYPE html>
+<html lang="en"><head><meta charset="utf-8"><title>UFC Event Details</title></head>
+<body>
+  <h2 class="b-content__title"><span class="b-content__title-highlight">{event.name}</span></h2>
+  <table class="b-fight-details__table b-fight-details__table_style_margin-top b-fight-details__table_type_event-details js-fight-table">
+    <thead class="b-fight-details__table-head">
+      <tr class="b-fight-details__table-row">
+        <th class="b-fight-details__table-col">W/L</th><th class="b-fight-details__table-col">Fighter</th>
+        <th class="b-fight-details__table-col">Kd</th><th class="b-fight-details__table-col">Str</th>
+        <th class="b-fight-details__table-col">Td</th><th class="b-fight-details__table-col">Sub</th>
+        <th class="b-fight-details__table-col">Weight class</th><th class="b-fight-details__table-col">Method</th>
+        <th class="b-fight-details__table-col">Round</th><th class="b-fight-details__table-col">Time</th>
+      </tr>
+    </thead>
+    <tbody class="b-fight-details__table-body">{rows}
+    </tbody>
+  </table>
+</body></html>
+'''
+
+    def fight_details(self, fight_id: str) -> Optional[str]:
+        bout = self.world.bout(fight_id)
+        if bout is None:
+            return None
+        page = self.fight_template
+        for (old_id, old_name), (new_id, new_name) in zip(FIXTURE_FIGHTERS, (bout.fighter_a, bout.fighter_b)):
+            page = page.replace(old_id, new_id).replace(old_name, new_name)
+        return page
+
+    def kalshi_markets(self, cursor: str, limit: int) -> dict:
+        markets = []
+        for event in self.world.events:
+            if not self.world.is_upcoming(event):
+                break
+            stamp = event.date.strftime("%y%b%d").upper()
+            for bout in self.world.bouts(event.event_id):
+                pair = (bout.fighter_a[1][:3] + bout.fighter_b[1][:3]).upper().replace(" ", "")
+                rng = random.Random(bout.fight_id)
+                yes_a = round(rng.uniform(0.1, 0.9), 2)
+                for name, yes in ((bout.fighter_a[1], yes_a), (bout.fighter_b[1], round(1 - yes_a, 2))):
+                    markets.append({
+                        "ticker": f"KXUFCFIGHT-{stamp}{pair}-{name[:3].upper()}",
+                        "event_ticker": f"KXUFCFIGHT-{stamp}{pair}",
+                        "status": "active",
+                        "yes_sub_title": name,
+                        "yes_ask_dollars": f"{yes:.2f}",
+                        "no_ask_dollars": f"{1 - yes + 0.01:.2f}",
+                    })
+        start = int(cursor or 0)
+        end = start + limit
+        return {"markets": markets[start:end], "cursor": str(end) if end < len(markets) else ""}
+
+    # -------- helpers --------
+
+    def _event_row(self, bout: Bout, upcoming: bool) -> str:
+        link = f"{self.base_url}/fight-details/{bout.fight_id}"
+        flag = "" if upcoming else f'<a href="{link}" class="b-flag b-flag_style_green"><span class="b-flag__inner"><span class="b-flag__text">win</span></span></a>'
+        method, detail = ("", "") if upcoming else bout.method
+        round_no, end_time = ("", "") if upcoming else (bout.round, bout.time)
+        fighters = "".join(
+            f'<p class="b-fight-details__table-text"><a href="{self.base_url}/fighter-details/{fid}" class="b-link b-link_style_black">{name}</a></p>'
+            for fid, name in (bout.fighter_a, bout.fighter_b)
+        )
+        return f'''
+      <tr class="b-fight-details__table-row b-fight-details__table-row__hover js-fight-details-click">
+        <td class="b-fight-details__table-col b-fight-details__table-col_style_align-top"><p class="b-fight-details__table-text">{flag}</p></td>
+        <td class="b-fight-details__table-col l-page_align_left">{fighters}</td>
+        <td class="b-fight-details__table-col"><p class="b-fight-details__table-text">0</p><p class="b-fight-details__table-text">0</p></td>
+        <td class="b-fight-details__table-col"><p class="b-fight-details__table-text">40</p><p class="b-fight-details__table-text">31</p></td>
+        <td class="b-fight-details__table-col"><p class="b-fight-details__table-text">1</p><p class="b-fight-details__table-text">0</p></td>
+        <td class="b-fight-details__table-col"><p class="b-fight-details__table-text">0</p><p class="b-fight-details__table-text">0</p></td>
+        <td class="b-fight-details__table-col l-page_align_left"><p class="b-fight-details__table-text">{bout.weight_class}</p></td>
+        <td class="b-fight-details__table-col l-page_align_left"><p class="b-fight-details__table-text">{method}</p><p class="b-fight-details__table-text">{detail}</p></td>
+        <td class="b-fight-details__table-col"><p class="b-fight-details__table-text">{round_no}</p></td>
+        <td class="b-fight-details__table-col"><p class="b-fight-details__table-text">{end_time}</p></td>
+      </tr>'''
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    pages: Pages = None
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    stats = Counter()
+    stats_lock = threading.Lock()
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        kind = url.path.strip("/").split("/")[0] or "root"
+        time.sleep(max(0.0, self.latency + random.uniform(-self.jitter, self.jitter)))
+
+        if random.random() < self.error_rate:
+            status = random.choice([429, 502, 503])
+            self._count(kind, status)
+            self.send_response(status)
+            if status == 429:
+                self.send_header("Retry-After", "1")
+            self.end_headers()
+            return
+
+        body, content_type = self._route(url.path, query)
+        if body is None:
+            self._count(kind, 404)
+            self.send_error(404)
+            return
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        if self.headers.get("If-None-Match") == etag:
+            self._count(kind, 304)
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self._count(kind, 200)
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _route(self, path: str, query: Dict[str, list]):
+        query_string = urlparse(self.path).query
+        recorded = self.pages.recorded_page(path + (f"?{query_string}" if query_string else ""))
+        if recorded is not None:
+            return recorded, "text/html; charset=utf-8"
+        parts = path.strip("/").split("/")
+        html = None
+        if path.rstrip("/") == "/statistics/events/completed":
+            html = self.pages.events_listing(query.get("page", ["1"])[0])
+        elif parts[0] == "event-details" and len(parts) == 2:
+            html = self.pages.event_details(parts[1])
+        elif parts[0] == "fight-details" and len(parts) == 2:
+            html = self.pages.fight_details(parts[1])
+        elif path.rstrip("/") == "/trade-api/v2/markets":
+            limit = min(1000, int(query.get("limit", [KALSHI_PAGE_LIMIT])[0]))
+            payload = self.pages.kalshi_markets(query.get("cursor", [""])[0], limit)
+            return json.dumps(payload).encode("utf-8"), "application/json"
+        return (html.encode("utf-8"), "text/html; charset=utf-8") if html is not None else (None, None)
+
+    def _count(self, kind: str, status: int) -> None:
+        with self.stats_lock:
+            self.stats[f"{kind} {status}"] += 1
+
+    def log_message(self, format, *args):
+        # Per-request logging would dominate a load test; totals are printed on exit
+        pass
+
+
+def make_server(world: World, host: str, port: int, html_cache_dir: Optional[Path] = None) -> ThreadingHTTPServer:
+    """Bind the stand-in (port 0 picks a free one); pages link back to the bound address."""
+    server = ThreadingHTTPServer((host, port), StandinHandler)
+    StandinHandler.pages = Pages(world, f"http://{host}:{server.server_address[1]}", html_cache_dir)
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for ufcstats.com and the Kalshi markets API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--events", type=int, default=700, help="completed events in the synthetic world")
+    parser.add_argument("--fights-per-event", type=int, default=12)
+    parser.add_argument("--upcoming", type=int, default=2, help="future events (their cards feed the Kalshi markets)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="added to every response")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="latency varies by +/- this much")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered 429/502/503")
+    parser.add_argument("--html-cache", type=Path, default=None, help="replay pages recorded in this HtmlCache directory")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    world = World(args.events, args.fights_per_event, args.upcoming, args.seed)
+    server = make_server(world, args.host, args.port, args.html_cache)
+    base_url = StandinHandler.pages.base_url
+    StandinHandler.latency = args.latency_ms / 1000
+    StandinHandler.jitter = args.jitter_ms / 1000
+    StandinHandler.error_rate = args.error_rate
+
+    logging.info(f"Stand-in serving {len(world.events)} events at {base_url}")
+    logging.info(f"  export UFCSTATS_BASE_URL={base_url} KALSHI_API_URL={base_url}/trade-api/v2/markets")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        logging.info(f"Requests served: {dict(sorted(StandinHandler.stats.items()))}")
+
+
+if __name__ == "__main__":
+    main()
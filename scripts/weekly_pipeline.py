@@ -56,9 +56,13 @@ def run_scrape():
 
 def run_clean():
     logging.info("Running data cleaning pipeline")
-    # run_data_clean.py handles its own cwd adjustments; call it as a script
+    # run_data_clean.py handles its own cwd adjustments; call it as a script.
+    # It only processes fights added since the last run unless CLEAN_FULL is set.
+    args = [sys.executable, "run_data_clean.py"]
+    if os.getenv("CLEAN_FULL", "false").lower() in ("1", "true", "yes"):
+        args.append("--full")
     try:
-        subprocess.check_call([sys.executable, "run_data_clean.py"], cwd=str(DATA_DIR / "clean"))
+        subprocess.check_call(args, cwd=str(DATA_DIR / "clean"))
         logging.info("Cleaning finished")
     except subprocess.CalledProcessError:
         logging.exception("Data cleaning failed")
@@ -82,12 +86,12 @@ def run_style_vectors():
 
 def run_outcome_builder():
     logging.info("Building matchup-style training CSV")
-    # Importing the module will execute the top-level builder code which writes a CSV
+    # Writes outcome_training_vectors_2.csv and the .npy matrix the trainers memory-map
     try:
         subprocess.check_call([
             sys.executable,
             "-c",
-            "import OutcomeVectorBuilder",
+            "from OutcomeVectorBuilder import build_outcome_training_vectors; build_outcome_training_vectors()",
         ], cwd=str(REPO_ROOT / "model" / "fight"))
         logging.info("Outcome training table built")
     except subprocess.CalledProcessError:
@@ -96,7 +100,9 @@ def run_outcome_builder():
 
 
 def run_trainer_if_available():
-    # Trainer expects a CSV at model/fight/outcome_training_vectors.csv
+    # Training runs only when model/fight/outcome_training_vectors.csv is present. The trainer
+    # reads the outcome_training_vectors_2 files, but OutcomeVectorBuilder rewrites those every
+    # week, so they cannot gate it.
     trainer_csv = REPO_ROOT / "model" / "fight" / "outcome_training_vectors.csv"
     if trainer_csv.exists():
         logging.info(f"Found training CSV at {trainer_csv}, starting trainer")
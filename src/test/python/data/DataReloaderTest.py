@@ -0,0 +1,118 @@
+import csv
+import tempfile
+import unittest
+from pathlib import Path
+
+from cache.CsvUtil import append_rows
+from cache.DataVersion import DataVersion
+from cache.EventCache import EventCache
+from cache.EventInfoCache import EventInfoCache
+from cache.FightCache import FightCache
+from cache.FightIndex import FightIndex
+from cache.UpcomingCardCache import UpcomingCardCache
+from DataReloader import DataReloader
+from FighterIdentityService import FighterIdentityService
+from RatingService import RatingService
+
+EVENT = {"event_id": "e1", "event_name": "UFC 1", "event_date": "January 06, 2024", "event_location": "", "event_url": ""}
+INFO = {"event_id": "e1", "fight_id": "f1", "winner_name": "Alice Adams", "loser_name": "Bea Brown"}
+LINES = [{"fight_id": "f1", "fighter_id": "a", "fighter": "Alice Adams"}, {"fight_id": "f1", "fighter_id": "b", "fighter": "Bea Brown"}]
+
+
+def write_csv(path: Path, fields, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fields, restval="")
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+class DataReloaderTest(unittest.TestCase):
+    """The worker side is played by appending rows to the CSVs and bumping the version."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        self.paths = {
+            "events": root / "events.csv",
+            "events-info": root / "events-info.csv",
+            "fights": root / "fights.csv",
+            "cards": root / "upcoming-cards.csv",
+        }
+        write_csv(self.paths["events"], EventCache.FIELDS, [])
+        write_csv(self.paths["events-info"], EventInfoCache.FIELDS, [])
+        write_csv(self.paths["fights"], FightCache.FIELDS, [])
+        write_csv(self.paths["cards"], UpcomingCardCache.FIELDS, [])
+
+        self.event_cache = EventCache(str(self.paths["events"]))
+        self.event_info_cache = EventInfoCache(str(self.paths["events-info"]))
+        self.fight_cache = FightCache(str(self.paths["fights"]))
+        self.upcoming_cards = UpcomingCardCache(str(self.paths["cards"]))
+        self.fight_index = FightIndex(self.event_cache, self.event_info_cache, self.fight_cache)
+        self.identity = FighterIdentityService(self.fight_cache, fight_index=self.fight_index)
+        self.ratings = RatingService(self.fight_index)
+        self.version = DataVersion(str(root / "data-version.json"))
+        self.reloader = DataReloader(
+            DataVersion(self.version.path), self.event_cache, self.event_info_cache, self.fight_cache,
+            self.fight_index, self.identity, self.ratings, self.upcoming_cards,
+        )
+        self.ratings.load()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_fight(self):
+        append_rows(str(self.paths["events"]), EventCache.FIELDS, [EVENT])
+        append_rows(str(self.paths["events-info"]), EventInfoCache.FIELDS, [INFO])
+        append_rows(str(self.paths["fights"]), FightCache.FIELDS, LINES)
+
+    def test_nothing_applied_until_version_moves(self):
+        self.write_fight()
+        self.assertEqual(self.reloader.poll(), {})
+        self.assertIsNone(self.fight_index.event_of("f1"))
+
+    def test_applies_appended_rows(self):
+        self.write_fight()
+        self.version.bump("refreshFightData")
+        self.assertEqual(self.reloader.poll(), {"events": 1, "eventInfo": 1, "fights": 1})
+        self.assertEqual(self.fight_index.fight_date("f1").isoformat(), "2024-01-06")
+        self.assertEqual(len(self.fight_cache.get_fight("f1")), 2)
+        self.assertEqual(self.identity.resolve("alice adams"), "a")
+        self.assertEqual(self.ratings.fights_rated("a"), 1)
+        self.assertGreater(self.ratings.rating("a"), self.ratings.rating("b"))
+
+    def test_rows_already_in_memory_are_skipped(self):
+        self.write_fight()
+        self.version.bump()
+        self.reloader.poll()
+        # Same rows again, e.g. read twice around startup
+        self.write_fight()
+        self.version.bump()
+        self.assertEqual(self.reloader.poll(), {"events": 1, "eventInfo": 0, "fights": 0})
+        self.assertEqual(len(self.fight_cache.get_fight("f1")), 2)
+        self.assertEqual(self.ratings.fights_rated("a"), 1)
+
+    def test_partial_last_line_waits_for_next_poll(self):
+        row = ",".join(LINES[0].get(field, "") for field in FightCache.FIELDS)
+        with open(self.paths["fights"], "a", encoding="utf-8") as f:
+            f.write(row[:10])
+        self.version.bump()
+        self.assertEqual(self.reloader.poll()["fights"], 0)
+
+        with open(self.paths["fights"], "a", encoding="utf-8") as f:
+            f.write(row[10:] + "\n")
+        self.version.bump()
+        self.assertEqual(self.reloader.poll()["fights"], 1)
+        self.assertEqual([l.fighter for l in self.fight_cache.get_fight("f1")], ["Alice Adams"])
+
+    def test_new_card_snapshot_reloads_upcoming_cards(self):
+        self.assertEqual(self.upcoming_cards.get_card("e9"), [])
+        append_rows(str(self.paths["cards"]), UpcomingCardCache.FIELDS, [
+            {"event_id": "e9", "bout_order": "1", "fighter_a": "Alice Adams", "fighter_b": "Cara Cole", "weight_class": "Flyweight", "scraped_at": "2026-01-01T00:00:00"},
+        ])
+        self.version.bump("refreshUpcomingCards")
+        self.reloader.poll()
+        self.assertEqual([b.fighter_a for b in self.upcoming_cards.get_card("e9")], ["Alice Adams"])
+
+
+if __name__ == "__main__":
+    unittest.main()
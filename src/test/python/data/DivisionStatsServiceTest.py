@@ -0,0 +1,102 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+from clean.features import FIGHTER_VECTOR_FEATURES
+from DivisionStatsService import DivisionStatsService, division_key
+
+# (fighter_id, weight_class, total_fights, sig_str_per_min, current_streak)
+ROWS = [
+    ("a", "Flyweight", 10, 5.0, 3),
+    ("b", "Flyweight", 2, 7.0, -1),
+    ("c", "Flyweight", 6, 5.0, 1),
+    ("d", "Flyweight", 4, None, 0),
+    ("e", "Women's Strawweight", 8, 4.0, 2),
+    ("f", "Women's Strawweight", 3, 6.0, 2),
+]
+
+
+def vectors_frame(rows=ROWS) -> pd.DataFrame:
+    frame = pd.DataFrame([
+        {"fighter": f"Fighter {fid.upper()}", "fighter_id": fid, "event_date": "2026-02-07", "weight_class": wc,
+         "win_rate": 0.5, "total_fights": n, "current_streak": streak}
+        for fid, wc, n, _, streak in rows
+    ])
+    for col in FIGHTER_VECTOR_FEATURES:
+        frame[col] = 1.0
+    frame["sig_str_per_min"] = [pace for _, _, _, pace, _ in rows]
+    return frame
+
+
+class DivisionStatsServiceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.csv = str(Path(self.tmp.name) / "fighter_vectors_all.csv")
+        vectors_frame().to_csv(self.csv, index=False)
+        self.stats = DivisionStatsService(self.csv)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def ranked(self, leaderboard):
+        return [(f["rank"], f["fighter_id"]) for f in leaderboard["fighters"]]
+
+    def test_division_key(self):
+        self.assertEqual(division_key("Women's Strawweight"), "womens-strawweight")
+        self.assertEqual(division_key(" womens-strawweight "), "womens-strawweight")
+
+    def test_leaderboard(self):
+        board = self.stats.leaderboard("flyweight", "sig_str_per_min")
+        self.assertEqual(board["weight_class"], "Flyweight")
+        # Ties keep CSV order, fighters without a value are left out
+        self.assertEqual(self.ranked(board), [(1, "b"), (2, "a"), (3, "c")])
+        self.assertEqual(board["fighters"][0]["value"], 7.0)
+
+    def test_leaderboard_filters(self):
+        self.assertEqual(self.ranked(self.stats.leaderboard("Flyweight", "sig_str_per_min", min_fights=5)), [(1, "a"), (2, "c")])
+        self.assertEqual(self.ranked(self.stats.leaderboard("Flyweight", "sig_str_per_min", n=1)), [(1, "b")])
+        self.assertEqual(self.stats.leaderboard("womens-strawweight", "streak")["metric"], "current_streak")
+        self.assertIsNone(self.stats.leaderboard("Heavyweight", "sig_str_per_min"))
+        with self.assertRaises(ValueError):
+            self.stats.leaderboard("Flyweight", "reach")
+
+    def test_percentiles(self):
+        result = self.stats.percentiles("a")
+        self.assertEqual(result["weight_class"], "Flyweight")
+        self.assertEqual(result["division_size"], 4)
+        # a ties c for the lower two of three ranked values: (0 + 2) / (2 * 3)
+        self.assertAlmostEqual(result["percentiles"]["sig_str_per_min"], 100 / 3)
+        self.assertEqual(result["percentiles"]["win_rate"], 50.0)
+        self.assertEqual(result["percentiles"]["total_fights"], 100 * 7 / 8)
+
+        missing = self.stats.percentiles("d")
+        self.assertIsNone(missing["values"]["sig_str_per_min"])
+        self.assertIsNone(missing["percentiles"]["sig_str_per_min"])
+
+    def test_percentiles_in_another_division(self):
+        result = self.stats.percentiles("b", weight_class="Women's Strawweight")
+        self.assertEqual(result["weight_class"], "Women's Strawweight")
+        self.assertEqual(result["percentiles"]["sig_str_per_min"], 100.0)
+        self.assertIsNone(self.stats.percentiles("z"))
+        self.assertIsNone(self.stats.percentiles("b", weight_class="Heavyweight"))
+
+    def test_reload_rebuilds_changed_divisions_only(self):
+        self.stats.load()
+        flyweight = self.stats._divisions["flyweight"]
+        strawweight = self.stats._divisions["womens-strawweight"]
+
+        rows = [r if r[0] != "e" else ("e", "Women's Strawweight", 9, 8.0, 3) for r in ROWS]
+        vectors_frame(rows).to_csv(self.csv, index=False)
+        os.utime(self.csv, (0, os.path.getmtime(self.csv) + 1))
+
+        self.assertEqual(self.ranked(self.stats.leaderboard("Women's Strawweight", "sig_str_per_min")), [(1, "e"), (2, "f")])
+        self.assertIs(self.stats._divisions["flyweight"], flyweight)
+        self.assertIsNot(self.stats._divisions["womens-strawweight"], strawweight)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+from fastapi.testclient import TestClient
+
+from cache.RefreshRequest import RefreshRequest
+from FightDataResource import FightDataResource
+from RefreshDataService import RefreshDataService, RefreshReport
+
+
+def refresh_service(report_json: str) -> RefreshDataService:
+    caches = [Mock(), Mock(), Mock()]
+    return RefreshDataService(*caches, Mock(), fight_index=Mock(), fighter_identity=Mock(), rating_service=Mock(),
+                              watermark=Mock(), upcoming_cards=Mock(), kalshi_client=Mock(), odds_store=Mock(),
+                              report_json=report_json)
+
+
+@patch.dict(os.environ, {"ENABLE_SCRAPING": "true"})
+class FightDataResourceRefreshTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        self.report_json = str(root / "refresh-report.json")
+        self.request = RefreshRequest(str(root / "refresh-request.json"))
+        self.api_refresh = refresh_service(self.report_json)
+        self.api_refresh.refreshFightData = Mock(return_value=["e1"])
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def client(self, refresh_mode: str) -> TestClient:
+        # The lifespan (worker subprocess, reloader) only runs inside `with TestClient(...)`
+        with patch.dict(os.environ, {"REFRESH_MODE": refresh_mode}):
+            resource = FightDataResource(Mock(), self.api_refresh, enable_background_refresh=True, refreshRequest=self.request)
+        return TestClient(resource.app)
+
+    def started_client(self, refresh_on_start: str):
+        # Process mode with its lifespan run; the worker subprocess is a stand-in that stays up
+        worker = Mock(pid=1234)
+        worker.poll.return_value = None
+        env = patch.dict(os.environ, {"REFRESH_ON_START": refresh_on_start})
+        popen = patch("FightDataResource.subprocess.Popen", return_value=worker)
+        env.start()
+        self.addCleanup(env.stop)
+        self.addCleanup(popen.stop)
+        return popen.start(), TestClient(self.client("process").app)
+
+    def test_refresh_is_handed_to_the_worker(self):
+        popen, client = self.started_client("true")
+        with client:
+            resp = client.get("/refresh")
+        popen.assert_called_once()
+        self.assertEqual(resp.status_code, 202)
+        self.assertEqual(resp.json()["status"], "queued")
+        self.assertIsNotNone(self.request.take())
+
+        resp = self.client("external").get("/refresh")
+        self.assertEqual(resp.status_code, 202)
+        self.assertIsNotNone(self.request.take())
+        self.api_refresh.refreshFightData.assert_not_called()
+
+    def test_refresh_runs_inline_without_a_worker(self):
+        # The default process mode with REFRESH_ON_START=false starts no worker to take a request
+        popen, client = self.started_client("false")
+        with client:
+            resp = client.get("/refresh")
+        popen.assert_not_called()
+        self.assertEqual((resp.status_code, resp.json()), (200, ["e1"]))
+        self.assertIsNone(self.request.pending())
+
+        # Nor does a worker that has exited
+        popen, client = self.started_client("true")
+        with client:
+            popen.return_value.poll.return_value = 1
+            resp = client.get("/refresh")
+        self.assertEqual(resp.status_code, 200)
+        self.assertIsNone(self.request.pending())
+
+    def test_inline_refresh_runs_in_process(self):
+        resp = self.client("inline").get("/refresh")
+        self.assertEqual((resp.status_code, resp.json()), (200, ["e1"]))
+        self.assertIsNone(self.request.pending())
+
+    def test_refresh_disabled(self):
+        with patch.dict(os.environ, {"ENABLE_SCRAPING": "false"}):
+            self.assertEqual(self.client("process").get("/refresh").status_code, 403)
+        self.assertIsNone(self.request.pending())
+
+    def test_report_written_by_the_worker(self):
+        client = self.client("process")
+        self.assertEqual(client.get("/refresh/report").status_code, 404)
+
+        worker_refresh = refresh_service(self.report_json)
+        worker_refresh._saveReport(RefreshReport(started_at="2026-01-01T00:00:00", events_checked=3, failures={"f1": "timeout"}))
+        resp = client.get("/refresh/report")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()["events_checked"], 3)
+        self.assertEqual(resp.json()["failures"], {"f1": "timeout"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import os
+import tempfile
+import time
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import Mock, patch
+
+from fastapi import HTTPException
+
+from cache.OddsStore import OddsMarket, OddsSample, OddsStore
+from FightDataService import FightDataService
+
+EWING = OddsMarket("KXUFCFIGHT-20MAR01EWIEST-EWI", "KXUFCFIGHT-20MAR01EWIEST", "e1", "2020-03-01", "Ewing", "f-ewing")
+
+
+class FightDataServiceOddsHistoryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        store = OddsStore(self.tmp.name)
+        for hour in (0, 23):
+            store.append([OddsSample(EWING, 0.5, None)], datetime(2020, 3, 1, hour, 30, tzinfo=timezone.utc).timestamp())
+        self.service = FightDataService(Mock(), Mock(), Mock(), fightIndex=Mock(), fighterIdentity=Mock(), ratingService=Mock(),
+                                        divisionStats=Mock(), upcomingCards=Mock(), kalshiClient=Mock(), oddsStore=store)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_days_are_utc_whatever_the_local_zone(self):
+        for zone in ("America/New_York", "Asia/Tokyo"):
+            with patch.dict(os.environ, {"TZ": zone}):
+                time.tzset()
+                result = self.service.getOddsHistory(fighter_id="f-ewing", start="2020-03-01", end="2020-03-02")
+            time.tzset()
+            self.assertEqual([s["ts"] for s in result["samples"]], ["2020-03-01T00:30:00+00:00", "2020-03-01T23:30:00+00:00"])
+            self.assertIsNone(result["samples"][0]["no"])
+
+    def test_bad_input(self):
+        with self.assertRaises(HTTPException) as ctx:
+            self.service.getOddsHistory()
+        self.assertEqual(ctx.exception.status_code, 400)
+        with self.assertRaises(HTTPException) as ctx:
+            self.service.getOddsHistory(event_id="e1", start="03/01/2020")
+        self.assertEqual(ctx.exception.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
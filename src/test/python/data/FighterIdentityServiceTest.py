@@ -0,0 +1,85 @@
+import csv
+import tempfile
+import unittest
+from pathlib import Path
+
+from cache.EventCache import EventCache
+from cache.EventInfoCache import EventInfoCache
+from cache.FightCache import FightCache
+from FighterIdentityService import FighterIdentityService
+
+EVENTS = [
+    {"event_id": "e1", "event_date": "January 06, 2024"},
+    {"event_id": "e2", "event_date": "February 03, 2024"},
+]
+EVENT_INFOS = [
+    # event-info spells Weili's name in the other order than her stat line does
+    {"event_id": "e1", "fight_id": "f1", "winner_name": "Weili Zhang", "loser_name": "Rose Namajunas"},
+    {"event_id": "e2", "fight_id": "f2", "winner_name": "Bruno Silva", "loser_name": "Jose Aldo"},
+    {"event_id": "e2", "fight_id": "f3", "winner_name": "Bruno Silva", "loser_name": "Alex Perez"},
+]
+FIGHTS = [
+    ("f1", "zw", "Zhang Weili"), ("f1", "rn", "Rose Namajunas"),
+    ("f2", "bs1", "Bruno Silva"), ("f2", "ja", 'José "Scarface" Aldo Jr.'),
+    ("f3", "bs2", "Bruno Silva"), ("f3", "ap", "Alex Perez"),
+]
+
+
+def write_csv(path: Path, fields, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fields, restval="")
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+class FighterIdentityServiceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        write_csv(root / "events.csv", EventCache.FIELDS, EVENTS)
+        write_csv(root / "events-info.csv", EventInfoCache.FIELDS, EVENT_INFOS)
+        write_csv(root / "fights.csv", FightCache.FIELDS, [{"fight_id": f, "fighter_id": i, "fighter": n} for f, i, n in FIGHTS])
+        self.alias_csv = root / "fighter-aliases.csv"
+        self.identity = FighterIdentityService.from_csv(
+            str(root / "events.csv"), str(root / "events-info.csv"), str(root / "fights.csv"), str(self.alias_csv),
+        )
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_name_variants(self):
+        self.assertEqual(self.identity.resolve("Jose Aldo"), "ja")
+        self.assertEqual(self.identity.resolve("JOSÉ ALDO"), "ja")
+        self.assertEqual(self.identity.resolve("Weili Zhang"), "zw")
+        self.assertEqual(self.identity.resolve("Zhang Weili"), "zw")
+        self.assertIsNone(self.identity.resolve("Unknown Fighter"))
+        self.assertIsNone(self.identity.resolve(""))
+
+    def test_last_name_needs_candidates(self):
+        self.assertIsNone(self.identity.resolve("Namajunas"))
+        self.assertEqual(self.identity.resolve("Namajunas", {"zw", "rn"}), "rn")
+
+    def test_namesakes_need_candidates(self):
+        self.assertIsNone(self.identity.resolve("Bruno Silva"))
+        self.assertEqual(self.identity.resolve("Bruno Silva", {"bs2", "ap"}), "bs2")
+        self.assertIsNone(self.identity.resolve("Bruno Silva", {"bs1", "bs2"}))
+        self.assertEqual(self.identity.candidates_for("Bruno Silva"), ["bs1", "bs2"])
+
+    def test_alias_overrides_learned_names(self):
+        self.identity.add_alias("The Blade Silva", "bs1")
+        self.identity.add_alias("Rose Namajunas", "zw")
+        self.assertEqual(self.identity.resolve("the blade silva"), "bs1")
+        self.assertEqual(self.identity.resolve("Rose Namajunas"), "zw")
+        with open(self.alias_csv, newline="", encoding="utf-8") as f:
+            self.assertEqual([row["fighter_id"] for row in csv.DictReader(f)], ["bs1", "zw"])
+
+    def test_learn_after_load(self):
+        self.assertIsNone(self.identity.resolve("Merab Dvalishvili"))
+        self.identity.learn("md", "Merab Dvalishvili")
+        self.assertEqual(self.identity.resolve("merab dvalishvili"), "md")
+        self.assertEqual(self.identity.name_of("md"), "Merab Dvalishvili")
+
+
+if __name__ == "__main__":
+    unittest.main()
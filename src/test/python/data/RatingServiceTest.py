@@ -0,0 +1,106 @@
+import csv
+import tempfile
+import unittest
+from pathlib import Path
+
+from cache.EventCache import EventCache
+from cache.EventInfoCache import EventInfoCache
+from cache.FightCache import FightCache
+from cache.FightIndex import FightIndex
+from RatingService import RatingService
+
+EVENTS = [
+    {"event_id": "e1", "event_date": "January 06, 2024"},
+    {"event_id": "e2", "event_date": "February 03, 2024"},
+    {"event_id": "e3", "event_date": "March 02, 2024"},
+]
+EVENT_INFOS = [
+    {"event_id": "e1", "fight_id": "f1", "winner_name": "Alice Adams", "loser_name": "Bea Brown"},
+    {"event_id": "e2", "fight_id": "f2", "winner_name": "Bea Brown", "loser_name": "Cara Cole"},
+    {"event_id": "e3", "fight_id": "f3", "winner_name": "Cara Cole", "loser_name": "Alice Adams"},
+]
+NAMES = {"a": "Alice Adams", "b": "Bea Brown", "c": "Cara Cole"}
+FIGHTS = [("f1", "a"), ("f1", "b"), ("f2", "b"), ("f2", "c"), ("f3", "c"), ("f3", "a")]
+
+
+def write_csv(path: Path, fields, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fields, restval="")
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def fight_lines(fight_id):
+    return [{"fight_id": f, "fighter_id": i, "fighter": NAMES[i]} for f, i in FIGHTS if f == fight_id]
+
+
+class RatingServiceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        write_csv(self.root / "events.csv", EventCache.FIELDS, EVENTS)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def ratings_for(self, fight_ids):
+        """A RatingService over an index holding only the given fights."""
+        write_csv(self.root / "events-info.csv", EventInfoCache.FIELDS, [i for i in EVENT_INFOS if i["fight_id"] in fight_ids])
+        write_csv(self.root / "fights.csv", FightCache.FIELDS, [l for f in fight_ids for l in fight_lines(f)])
+        index = FightIndex.from_csv(*(str(self.root / n) for n in ("events.csv", "events-info.csv", "fights.csv")))
+        return index, RatingService(index)
+
+    def add_fight(self, index, ratings, fight_id):
+        index.add_event_info(next(i for i in EVENT_INFOS if i["fight_id"] == fight_id))
+        index.add_fight_lines(fight_lines(fight_id))
+        return ratings.apply_fight(fight_id)
+
+    def snapshot(self, ratings):
+        return {f: (ratings.rating(f), ratings.fights_rated(f), ratings.history(f)) for f in NAMES}
+
+    def test_first_fight(self):
+        _, ratings = self.ratings_for(["f1"])
+        self.assertEqual(ratings.rating("a"), RatingService.INITIAL_RATING + RatingService.PROVISIONAL_K_FACTOR / 2)
+        self.assertEqual(ratings.rating("b"), RatingService.INITIAL_RATING - RatingService.PROVISIONAL_K_FACTOR / 2)
+        self.assertIsNone(ratings.rating("c"))
+        self.assertEqual(ratings.fights_rated("c"), 0)
+
+    def test_incremental_matches_full_replay(self):
+        _, full = self.ratings_for(["f1", "f2", "f3"])
+        expected = self.snapshot(full)
+
+        index, incremental = self.ratings_for(["f1"])
+        incremental.load()
+        self.assertTrue(self.add_fight(index, incremental, "f2"))
+        self.assertTrue(self.add_fight(index, incremental, "f3"))
+        self.assertFalse(incremental.apply_fight("f3"))
+        self.assertEqual(self.snapshot(incremental), expected)
+
+    def test_out_of_order_result_replays(self):
+        _, full = self.ratings_for(["f1", "f2", "f3"])
+        expected = self.snapshot(full)
+
+        index, late = self.ratings_for(["f2", "f3"])
+        late.load()
+        self.assertTrue(self.add_fight(index, late, "f1"))
+        self.assertEqual(self.snapshot(late), expected)
+
+    def test_as_of_excludes_same_day_fights(self):
+        _, ratings = self.ratings_for(["f1", "f2", "f3"])
+        self.assertEqual(ratings.rating("b", "2024-01-06"), RatingService.INITIAL_RATING)
+        self.assertEqual(ratings.fights_rated("b", "January 06, 2024"), 0)
+        self.assertEqual(ratings.fights_rated("b", "2024-01-07"), 1)
+        self.assertEqual(ratings.rating("b", "2024-02-03"), ratings.history("b")[1]["rating"])
+        self.assertEqual(ratings.rating("b", "2025-01-01"), ratings.rating("b"))
+
+    def test_unparseable_as_of(self):
+        _, ratings = self.ratings_for(["f1"])
+        with self.assertRaises(ValueError):
+            ratings.rating("a", "last week")
+        with self.assertRaises(ValueError):
+            ratings.fights_rated("a", "last week")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,202 @@
+import csv
+import os
+import tempfile
+import unittest
+from datetime import date, timedelta
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import numpy as np
+
+from cache.EventCache import EventCache
+from cache.EventInfoCache import EventInfoCache
+from cache.FightCache import FightCache
+from cache.OddsStore import OddsStore
+from cache.RefreshWatermark import RefreshWatermark
+from clients.KalshiClient import OddsSnapshot
+from RefreshDataService import RefreshDataService
+
+
+def snapshot(fighter: str, fight_date: date, fetched_at: float) -> OddsSnapshot:
+    return OddsSnapshot(
+        np.array([f"KXUFCFIGHT-XEWIEST-{fighter[:3].upper()}"], dtype=object),
+        np.array([fighter], dtype=object),
+        np.array([fight_date.isoformat()], dtype="datetime64[D]"),
+        np.array([0.55]), np.array([0.47]), fetched_at,
+    )
+
+
+class RefreshDataServiceOddsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = OddsStore(self.tmp.name)
+        self.fight_date = date.today() + timedelta(days=10)
+        self.events = []
+        event_cache = Mock()
+        event_cache.all.side_effect = lambda: list(self.events)
+        self.identity = Mock()
+        self.identity.resolve_all.return_value = {}
+        self.identity.resolve.return_value = None
+        self.kalshi = Mock()
+        self.service = RefreshDataService(Mock(), event_cache, Mock(), Mock(), fight_index=Mock(), fighter_identity=self.identity,
+                                          rating_service=Mock(), watermark=Mock(), upcoming_cards=Mock(),
+                                          kalshi_client=self.kalshi, odds_store=self.store)
+        self.service.upcoming_cards.get_card.return_value = []
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def pull(self, fetched_at: float) -> int:
+        self.kalshi.getSnapshot.return_value = snapshot("Ewing", self.fight_date, fetched_at)
+        return self.service.recordOdds()
+
+    def test_market_seen_before_its_card_is_resolved_later(self):
+        self.assertEqual(self.pull(1.0), 1)
+        market = self.store.markets()[0]
+        self.assertEqual((market.event_id, market.fighter_id), ("", ""))
+
+        # The card is scraped and the fighter found after the market opened
+        self.events = [{"event_id": "e1", "event_date": self.fight_date.strftime("%B %d, %Y")}]
+        self.identity.resolve.return_value = "f-ewing"
+        self.assertEqual(self.pull(2.0), 1)
+
+        market = self.store.markets()[0]
+        self.assertEqual((market.event_id, market.fighter_id), ("e1", "f-ewing"))
+        self.assertEqual(len(self.store.history(fighter_id="f-ewing")), 2)
+
+    def test_resolved_market_is_not_resolved_again(self):
+        self.events = [{"event_id": "e1", "event_date": self.fight_date.strftime("%B %d, %Y")}]
+        self.identity.resolve.return_value = "f-ewing"
+        self.pull(1.0)
+        self.identity.resolve.reset_mock()
+
+        self.pull(2.0)
+        self.identity.resolve.assert_not_called()
+        # The same pull served again after a failure is not sampled twice
+        self.assertEqual(self.pull(2.0), 0)
+        self.assertEqual(len(self.store.history(event_id="e1")), 2)
+
+
+def write_csv(path: Path, fields, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fields, restval="")
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def days_ago(n: int) -> date:
+    return date.today() - timedelta(days=n)
+
+
+class StubScraper:
+    """
+    ufcstats as a dict: cards[event_id] is the event's bouts (a fight_id each)
+    and stats holds the fights whose stats are posted. Everything else fails.
+    """
+
+    def __init__(self):
+        self.cards = {}
+        self.stats = set()
+        self.event_calls = []
+        self.fight_calls = []
+
+    def scrape_event_info(self, event_id):
+        self.event_calls.append(event_id)
+        if event_id not in self.cards:
+            raise RuntimeError("HTTP 503")
+        return [{"event_id": event_id, "fight_id": fight_id, "winner_name": "A", "loser_name": "B"} for fight_id in self.cards[event_id]]
+
+    def scrape_fight_infos(self, fight_ids):
+        self.fight_calls.extend(fight_ids)
+        return {
+            fight_id: [{"fight_id": fight_id, "fighter_id": f"{fight_id}-{side}", "fighter": side} for side in ("A", "B")]
+            for fight_id in fight_ids if fight_id in self.stats
+        }
+
+
+@patch.dict(os.environ, {"ENABLE_SCRAPING": "true"})
+class RefreshDataServiceReconcileTest(unittest.TestCase):
+
+    EVENTS = [("e1", 40), ("e2", 30), ("e3", 20)]
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        write_csv(self.root / "events.csv", EventCache.FIELDS, [
+            {"event_id": e, "event_date": days_ago(n).strftime("%B %d, %Y")} for e, n in self.EVENTS
+        ])
+        write_csv(self.root / "events-info.csv", EventInfoCache.FIELDS, [])
+        write_csv(self.root / "fights.csv", FightCache.FIELDS, [])
+        self.scraper = StubScraper()
+        self.scraper.cards = {"e1": ["f1"], "e2": ["f2"], "e3": ["f3"]}
+        self.scraper.stats = {"f1", "f3"}
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def service(self) -> RefreshDataService:
+        # A fresh service per run, as each scheduled run of the worker reads the files again
+        return RefreshDataService(FightCache(str(self.root / "fights.csv")), EventCache(str(self.root / "events.csv")),
+                                  EventInfoCache(str(self.root / "events-info.csv")), self.scraper,
+                                  fight_index=Mock(), fighter_identity=Mock(), rating_service=Mock(),
+                                  watermark=RefreshWatermark(str(self.root / "watermark.json")), upcoming_cards=Mock(),
+                                  kalshi_client=Mock(), odds_store=Mock(), report_json=str(self.root / "report.json"))
+
+    def test_watermark_stops_at_first_unsettled_event(self):
+        report = self.service().reloadIncompleteData()
+
+        self.assertEqual(report.watermark_after, days_ago(40).isoformat())
+        self.assertEqual(sorted(report.fights_fetched), ["f1", "f3"])
+        self.assertEqual(report.failures, {"f2": "no fight stats returned"})
+
+        # Posted late: the next run settles e2 and the watermark moves past e3
+        self.scraper.stats.add("f2")
+        self.assertEqual(self.service().reloadIncompleteData().watermark_after, days_ago(20).isoformat())
+
+    def test_gives_up_after_max_attempts(self):
+        for run in range(1, RefreshDataService.MAX_ATTEMPTS + 1):
+            report = self.service().reloadIncompleteData()
+            self.assertEqual(report.given_up, [] if run < RefreshDataService.MAX_ATTEMPTS else ["f2"])
+
+        watermark = RefreshWatermark(str(self.root / "watermark.json"))
+        watermark.load()
+        self.assertEqual(watermark.unavailable["fights"], {"f2"})
+        self.assertEqual(watermark.attempts["fights"], {})
+        self.assertEqual(report.watermark_after, days_ago(20).isoformat())
+
+        # Given up on: no longer fetched
+        self.scraper.fight_calls.clear()
+        self.service().reloadIncompleteData()
+        self.assertNotIn("f2", self.scraper.fight_calls)
+
+    def test_flagged_ids_outside_window_are_rechecked(self):
+        self.scraper.stats.add("f2")
+        self.service().reloadIncompleteData()
+        # Well past the recent window of every event
+        watermark = RefreshWatermark(str(self.root / "watermark.json"))
+        watermark.load()
+        watermark.complete_through = days_ago(1)
+        watermark.save()
+
+        self.scraper.cards["e4"] = ["f4"]
+        self.scraper.stats.add("f4")
+        service = self.service()
+        service.flagGap(event_id="e4")
+        service.flagGap(fight_id="f9")
+        self.scraper.event_calls.clear()
+        self.scraper.fight_calls.clear()
+        report = service.reloadIncompleteData()
+
+        self.assertEqual(self.scraper.event_calls, ["e4"])
+        self.assertEqual(self.scraper.fight_calls, ["f4", "f9"])
+        self.assertEqual(report.event_info_fetched, ["e4"])
+        self.assertEqual(report.watermark_after, days_ago(1).isoformat())
+        watermark = RefreshWatermark(str(self.root / "watermark.json"))
+        watermark.load()
+        self.assertEqual(watermark.flagged, {"events": set(), "fights": {"f9"}})
+        self.assertEqual(watermark.attempts["fights"], {"f9": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import Mock
+
+from cache.DataVersion import DataVersion
+from cache.RefreshRequest import RefreshRequest
+from RefreshWorker import RefreshWorker
+
+
+class RefreshWorkerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        self.csv = root / "fights.csv"
+        self.csv.write_text("fight_id\n", encoding="utf-8")
+        self.version = DataVersion(str(root / "data-version.json"))
+        self.request = RefreshRequest(str(root / "refresh-request.json"))
+        self.service = Mock()
+        self.worker = RefreshWorker(self.service, self.version, self.request, watched_files=[self.csv])
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def append_row(self, *_):
+        with open(self.csv, "a", encoding="utf-8") as f:
+            f.write("f1\n")
+
+    def test_version_bumped_only_when_data_changes(self):
+        self.worker.run_job("recordOdds", lambda: None)
+        self.assertEqual(self.version.read(), 0)
+        self.worker.run_job("refreshFightData", self.append_row)
+        self.assertEqual(self.version.read(), 1)
+
+    def test_failed_job_still_publishes_its_rows(self):
+        def append_then_fail():
+            self.append_row()
+            raise RuntimeError("scrape failed")
+        self.worker.run_job("refreshFightData", append_then_fail)
+        self.assertEqual(self.version.read(), 1)
+
+    def test_runs_requested_refresh_once(self):
+        self.service.refreshFightData.side_effect = self.append_row
+        self.assertFalse(self.worker.run_requested())
+        self.request.request("api")
+        self.assertTrue(self.worker.run_requested())
+        self.assertFalse(self.worker.run_requested())
+        self.service.refreshFightData.assert_called_once_with()
+        self.assertEqual(self.version.read(), 1)
+
+    def test_run_once_runs_every_job_and_answers_requests(self):
+        self.request.request("api")
+        self.worker.run_once()
+        for job in ("refreshFightData", "reloadIncompleteData", "refreshUpcomingCards", "recordOdds", "downsampleOdds"):
+            getattr(self.service, job).assert_called_once_with()
+        self.assertIsNone(self.request.pending())
+
+
+if __name__ == "__main__":
+    unittest.main()
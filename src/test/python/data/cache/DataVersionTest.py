@@ -0,0 +1,48 @@
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from cache.DataVersion import DataVersion
+
+
+class DataVersionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = str(Path(self.tmp.name) / "data-version.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_missing_file_is_version_zero(self):
+        self.assertEqual(DataVersion(self.path).read(), 0)
+
+    def test_bump_is_seen_by_another_reader(self):
+        writer, reader = DataVersion(self.path), DataVersion(self.path)
+        self.assertEqual(writer.bump("refreshFightData"), 1)
+        self.assertEqual(reader.read(), 1)
+        self.assertEqual(writer.bump("reloadIncompleteData"), 2)
+        # Force a new mtime; bumps within one clock tick would otherwise look unchanged
+        os.utime(self.path, ns=(0, os.stat(self.path).st_mtime_ns + 1))
+        self.assertEqual(reader.read(), 2)
+        with open(self.path, "r", encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["reason"], "reloadIncompleteData")
+
+    def test_bump_continues_from_the_file(self):
+        DataVersion(self.path).bump()
+        self.assertEqual(DataVersion(self.path).bump(), 2)
+
+    def test_unreadable_file_keeps_last_version(self):
+        reader = DataVersion(self.path)
+        DataVersion(self.path).bump()
+        self.assertEqual(reader.read(), 1)
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write('{"vers')
+        os.utime(self.path, ns=(0, os.stat(self.path).st_mtime_ns + 1))
+        self.assertEqual(reader.read(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import csv
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+
+from cache.EventCache import EventCache
+from cache.EventInfoCache import EventInfoCache
+from cache.FightCache import FightCache
+from cache.FightIndex import Bout, FightIndex, parse_event_date
+
+EVENTS = [
+    {"event_id": "e1", "event_name": "UFC 1", "event_date": "January 06, 2024", "event_location": "", "event_url": ""},
+    {"event_id": "e2", "event_name": "UFC 2", "event_date": "February 03, 2024", "event_location": "", "event_url": ""},
+]
+EVENT_INFOS = [
+    {"event_id": "e1", "fight_id": "f1", "winner_name": "Alice Adams", "loser_name": "Bea Brown", "weight_class": "Flyweight", "method": "U-DEC"},
+    {"event_id": "e2", "fight_id": "f2", "winner_name": "Cara Cole", "loser_name": "Bea Brown", "weight_class": "Flyweight", "method": "KO/TKO"},
+    {"event_id": "e2", "fight_id": "f3", "winner_name": "", "loser_name": "", "weight_class": "Flyweight", "method": "CNC"},
+]
+FIGHTS = [
+    ("f1", "a", "Alice Adams"), ("f1", "b", "Bea Brown"),
+    ("f2", "b", "Bea Brown"), ("f2", "c", "Cara Cole"),
+    ("f3", "a", "Alice Adams"), ("f3", "c", "Cara Cole"),
+]
+
+
+def write_csv(path: Path, fields, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fields, restval="")
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+class FightIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        write_csv(root / "events.csv", EventCache.FIELDS, EVENTS)
+        write_csv(root / "events-info.csv", EventInfoCache.FIELDS, EVENT_INFOS)
+        write_csv(root / "fights.csv", FightCache.FIELDS, [{"fight_id": f, "fighter_id": i, "fighter": n} for f, i, n in FIGHTS])
+        self.index = FightIndex.from_csv(str(root / "events.csv"), str(root / "events-info.csv"), str(root / "fights.csv"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_joins(self):
+        self.assertEqual(self.index.event_of("f2"), "e2")
+        self.assertEqual(self.index.fight_date("f1"), date(2024, 1, 6))
+        self.assertEqual(self.index.event_info_of("f1").winner_name, "Alice Adams")
+        self.assertEqual(self.index.fight_id_for("b", "2024-02-03"), "f2")
+        self.assertEqual(self.index.fight_id_for("b", "February 03, 2024"), "f2")
+        self.assertIsNone(self.index.fight_id_for("b", "2024-02-04"))
+
+    def test_fights_of_sorted_with_outcomes(self):
+        self.assertEqual([(f.fight_id, f.outcome) for f in self.index.fights_of("b")], [("f1", 0), ("f2", 0)])
+        self.assertEqual([(f.fight_id, f.outcome) for f in self.index.fights_of("c")], [("f2", 1), ("f3", None)])
+
+    def test_bouts_skip_undecided(self):
+        self.assertEqual(self.index.bouts(), [
+            Bout(date(2024, 1, 6), "f1", "a", "b"),
+            Bout(date(2024, 2, 3), "f2", "c", "b"),
+        ])
+
+    def test_event_added_after_its_fights(self):
+        self.index.load()
+        self.index.add_event_info({"event_id": "e3", "fight_id": "f4", "winner_name": "Alice Adams", "loser_name": "Cara Cole"})
+        self.index.add_fight_lines([{"fight_id": "f4", "fighter_id": "a", "fighter": "Alice Adams"},
+                                    {"fight_id": "f4", "fighter_id": "c", "fighter": "Cara Cole"}])
+        self.assertIsNone(self.index.bout("f4"))
+        # Undated fights sort first
+        self.assertIsNone(self.index.fights_of("a")[0].event_date)
+
+        self.index.add_event({"event_id": "e3", "event_date": "March 02, 2024"})
+        self.assertEqual(self.index.bout("f4"), Bout(date(2024, 3, 2), "f4", "a", "c"))
+        self.assertEqual(self.index.fight_id_for("c", "2024-03-02"), "f4")
+        self.assertEqual([f.fight_id for f in self.index.fights_of("a")], ["f1", "f3", "f4"])
+
+    def test_fight_moved_to_another_event(self):
+        self.index.load()
+        self.index.add_event_info({"event_id": "e1", "fight_id": "f2", "winner_name": "Cara Cole", "loser_name": "Bea Brown"})
+        self.assertEqual(self.index.fight_date("f2"), date(2024, 1, 6))
+        # A later update to the old event no longer touches the moved fight
+        self.index.add_event({"event_id": "e2", "event_date": "February 10, 2024"})
+        self.assertEqual(self.index.fight_date("f2"), date(2024, 1, 6))
+        self.assertEqual(self.index.fight_date("f3"), date(2024, 2, 10))
+
+    def test_rescheduled_event_drops_old_date(self):
+        self.index.load()
+        self.index.add_event({"event_id": "e1", "event_date": "January 13, 2024"})
+        self.assertIsNone(self.index.fight_id_for("a", "2024-01-06"))
+        self.assertIsNone(self.index.fight_id_for("b", "2024-01-06"))
+        self.assertEqual(self.index.fight_id_for("a", "2024-01-13"), "f1")
+        dates = self.index.fighter_date_frame()
+        self.assertFalse((dates["event_date"] == "2024-01-06").any())
+
+        # Cara's other fight that night still answers for the date f3 moves away from
+        self.index.add_event_info({"event_id": "e1", "fight_id": "f3", "winner_name": "", "loser_name": ""})
+        self.assertEqual(self.index.fight_id_for("c", "2024-02-03"), "f2")
+        self.assertEqual(self.index.fight_id_for("c", "2024-01-13"), "f3")
+
+    def test_frames(self):
+        events = self.index.fight_event_frame().set_index("fight_id")
+        self.assertEqual(str(events.loc["f2", "event_date"].date()), "2024-02-03")
+        self.assertEqual(events.loc["f3", "method"], "CNC")
+        dates = self.index.fighter_date_frame()
+        # Cara fought twice on e2; fight_id_for keeps the fight indexed last
+        self.assertEqual(len(dates), len(FIGHTS) - 1)
+        self.assertEqual(self.index.fight_id_for("c", "2024-02-03"), "f3")
+        row = dates[(dates["fighter_id"] == "a") & (dates["event_date"] == "2024-02-03")]
+        self.assertEqual(row["fight_id"].tolist(), ["f3"])
+
+    def test_parse_event_date(self):
+        self.assertEqual(parse_event_date("January 24, 2026"), date(2026, 1, 24))
+        self.assertEqual(parse_event_date("2026-01-24"), date(2026, 1, 24))
+        self.assertIsNone(parse_event_date("garbage"))
+        self.assertIsNone(parse_event_date(""))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,31 @@
+import unittest
+
+from cache.NameUtil import normalize_name, token_key
+
+
+class NameUtilTest(unittest.TestCase):
+
+    def test_normalize_name(self):
+        cases = {
+            'José "Shorty" Aldo Jr.': "jose aldo",
+            "JAN BŁACHOWICZ": "jan blachowicz",
+            "Khalil Rountree Jr.": "khalil rountree",
+            "Ovince Saint-Preux": "ovince saint preux",
+            "Da'Mon Blackshear": "damon blackshear",
+            "T.J. Dillashaw": "t j dillashaw",
+            "Marcin Tybura III": "marcin tybura",
+            "": "",
+            None: "",
+        }
+        for name, expected in cases.items():
+            with self.subTest(name=name):
+                self.assertEqual(normalize_name(name), expected)
+
+    def test_token_key_ignores_word_order(self):
+        self.assertEqual(token_key("Zhang Weili"), token_key("Weili Zhang"))
+        self.assertEqual(token_key('Weili "Magnum" ZHANG'), "weili zhang")
+        self.assertNotEqual(token_key("Zhang Weili"), token_key("Zhang Wei"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import math
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from cache.OddsStore import COLUMNS, DOWNSAMPLED_MARKER, OddsMarket, OddsSample, OddsStore
+
+EWING = OddsMarket("KXUFCFIGHT-20MAR01EWIEST-EWI", "KXUFCFIGHT-20MAR01EWIEST", "e1", "2020-03-01", "Ewing", "f-ewing")
+ESTES = OddsMarket("KXUFCFIGHT-20MAR01EWIEST-EST", "KXUFCFIGHT-20MAR01EWIEST", "e1", "2020-03-01", "Estes", "f-estes")
+
+
+def at(day: int, hour: int = 0, minute: int = 0, second: int = 0) -> float:
+    return datetime(2020, 3, day, hour, minute, second, tzinfo=timezone.utc).timestamp()
+
+
+def utc(day: int, hour: int = 0) -> datetime:
+    return datetime(2020, 3, day, hour, tzinfo=timezone.utc)
+
+
+class OddsStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name) / "odds"
+        self.store = OddsStore(str(self.root))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_append_and_history_round_trip(self):
+        self.store.append([OddsSample(EWING, 0.55, 0.47), OddsSample(ESTES, None, 0.6)], at(1, 12))
+        self.store.append([OddsSample(EWING, 0.56, 0.46)], at(1, 12, 1))
+
+        history = self.store.history(fighter_id="f-ewing")
+        self.assertEqual(history["yes"].tolist(), [0.55, 0.56])
+        self.assertEqual(history["ticker"].tolist(), [EWING.ticker] * 2)
+        self.assertEqual(history["ts"].iloc[0], datetime(2020, 3, 1, 12, tzinfo=timezone.utc))
+
+        by_event = self.store.history(event_id="e1")
+        self.assertEqual(len(by_event), 3)
+        self.assertTrue(math.isnan(by_event[by_event["fighter_id"] == "f-estes"]["yes"].iloc[0]))
+
+        # Another process reads the same files
+        reopened = OddsStore(str(self.root))
+        self.assertEqual(reopened.markets(), [EWING, ESTES])
+        self.assertEqual(reopened.history(fighter_id="f-ewing")["yes"].tolist(), [0.55, 0.56])
+        self.assertTrue(self.store.history(fighter_id="nobody").empty)
+
+    def test_range_is_start_inclusive_end_exclusive_across_days(self):
+        for ts in (at(1, 23, 59, 59), at(2), at(2, 12), at(3)):
+            self.store.append([OddsSample(EWING, 0.5, 0.5)], ts)
+
+        def times(start, end):
+            return [ts.isoformat() for ts in self.store.history(ticker=EWING.ticker, start=start, end=end)["ts"]]
+
+        self.assertEqual(times(utc(2), utc(3)), ["2020-03-02T00:00:00+00:00", "2020-03-02T12:00:00+00:00"])
+        self.assertEqual(times(utc(1, 12), utc(2, 12)), ["2020-03-01T23:59:59+00:00", "2020-03-02T00:00:00+00:00"])
+        self.assertEqual(len(times(None, None)), 4)
+        self.assertEqual(times(utc(4), None), [])
+
+    def test_torn_append_is_ignored_then_truncated(self):
+        self.store.append([OddsSample(EWING, 0.55, 0.47)], at(1))
+        day_dir = self.root / "2020-03-01"
+        # A crash after writing only the first columns of the next sample
+        for name in ("ts", "market"):
+            with open(day_dir / f"{name}.bin", "ab") as f:
+                f.write(b"\x01" * COLUMNS[name].itemsize)
+
+        self.assertEqual(len(self.store.history(ticker=EWING.ticker)), 1)
+        self.store.append([OddsSample(EWING, 0.6, 0.4)], at(1, 1))
+        self.assertEqual(self.store.history(ticker=EWING.ticker)["yes"].tolist(), [0.55, 0.6])
+        for name, dtype in COLUMNS.items():
+            self.assertEqual((day_dir / f"{name}.bin").stat().st_size, 2 * dtype.itemsize)
+
+    def test_interrupted_day_swap_is_recovered(self):
+        for day in (1, 2, 3):
+            self.store.append([OddsSample(EWING, 0.5, 0.5)], at(day))
+        # Crashed while writing the new files
+        (self.root / "2020-03-01.tmp").mkdir()
+        # Crashed between moving the old day aside and moving the new one in
+        (self.root / "2020-03-02").rename(self.root / "2020-03-02.old")
+        (self.root / "2020-03-02.tmp").mkdir()
+        # Crashed before removing the old day
+        (self.root / "2020-03-03.old").mkdir()
+
+        store = OddsStore(str(self.root))
+        store.append([OddsSample(EWING, 0.7, 0.3)], at(4))
+
+        self.assertEqual(sorted(p.name for p in self.root.iterdir()), ["2020-03-01", "2020-03-02", "2020-03-03", "2020-03-04", "markets.csv"])
+        self.assertEqual(store.history(ticker=EWING.ticker)["yes"].tolist(), [0.5, 0.5, 0.5, 0.7])
+
+    def test_downsample_keeps_last_sample_per_bucket_and_is_idempotent(self):
+        for minute in (0, 10, 59, 60, 61):
+            self.store.append([OddsSample(EWING, minute / 100, 0.5), OddsSample(ESTES, 0.5, minute / 100)], at(1) + minute * 60)
+
+        self.assertEqual(self.store.downsample(timedelta(days=7), 3600), 6)
+        self.assertEqual(self.store.history(fighter_id="f-ewing")["yes"].tolist(), [0.59, 0.61])
+        self.assertEqual(self.store.history(fighter_id="f-estes")["no"].tolist(), [0.59, 0.61])
+        self.assertEqual((self.root / "2020-03-01" / DOWNSAMPLED_MARKER).read_text(), "3600")
+
+        self.assertEqual(self.store.downsample(timedelta(days=7), 3600), 0)
+        self.assertEqual(self.store.downsample(timedelta(days=7), 60), 0)
+        self.assertEqual(len(self.store.history(event_id="e1")), 4)
+
+    def test_later_row_updates_market_fields(self):
+        unresolved = EWING._replace(event_id="", fighter_id="")
+        self.store.append([OddsSample(unresolved, 0.55, 0.47)], at(1))
+        self.assertTrue(self.store.history(fighter_id="f-ewing").empty)
+
+        self.store.append([OddsSample(EWING, 0.56, 0.46)], at(1, 1))
+        self.assertEqual(self.store.market(EWING.ticker), EWING)
+        self.assertEqual(self.store.markets(), [EWING])
+        # Samples taken before the market was resolved are found by its new fields
+        self.assertEqual(self.store.history(fighter_id="f-ewing")["yes"].tolist(), [0.55, 0.56])
+
+        reopened = OddsStore(str(self.root))
+        self.assertEqual(reopened.markets(), [EWING])
+        reopened.append([OddsSample(ESTES, 0.4, 0.6)], at(1, 2))
+        self.assertEqual(OddsStore(str(self.root)).history(fighter_id="f-estes")["yes"].tolist(), [0.4])
+
+
+if __name__ == "__main__":
+    unittest.main()
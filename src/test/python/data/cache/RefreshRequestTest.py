@@ -0,0 +1,30 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from cache.RefreshRequest import RefreshRequest
+
+
+class RefreshRequestTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = str(Path(self.tmp.name) / "refresh-request.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_request_then_take(self):
+        api, worker = RefreshRequest(self.path), RefreshRequest(self.path)
+        self.assertIsNone(worker.take())
+        first = api.request("api")
+        # A second request before the worker runs collapses into the first
+        self.assertEqual(api.request("api"), first)
+        self.assertEqual(worker.pending(), first)
+        self.assertEqual(worker.take(), first)
+        self.assertIsNone(worker.take())
+        self.assertFalse(Path(self.path).exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
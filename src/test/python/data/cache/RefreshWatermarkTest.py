@@ -0,0 +1,53 @@
+import json
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+
+from cache.RefreshWatermark import RefreshWatermark
+
+
+class RefreshWatermarkTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.json_path = str(Path(self.tmp.name) / "watermark.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        watermark = RefreshWatermark(self.json_path)
+        watermark.complete_through = date(2026, 3, 1)
+        watermark.flag("events", "e1")
+        watermark.flag("fights", "f1")
+        self.assertFalse(watermark.record_failure("fights", "f1", max_attempts=3))
+        watermark.record_failure("fights", "f2", max_attempts=1)
+        watermark.save()
+
+        loaded = RefreshWatermark(self.json_path)
+        loaded.load()
+        self.assertEqual(loaded.complete_through, date(2026, 3, 1))
+        self.assertEqual(loaded.flagged, {"events": {"e1"}, "fights": {"f1"}})
+        self.assertEqual(loaded.attempts, {"events": {}, "fights": {"f1": 1}})
+        self.assertTrue(loaded.is_unavailable("fights", "f2"))
+        self.assertFalse(Path(f"{self.json_path}.tmp").exists())
+
+    def test_missing_file_starts_empty(self):
+        watermark = RefreshWatermark(self.json_path)
+        watermark.load()
+        self.assertIsNone(watermark.complete_through)
+        watermark.save()
+        with open(self.json_path, encoding="utf-8") as f:
+            self.assertIsNone(json.load(f)["complete_through"])
+
+    def test_flag_clears_given_up_id(self):
+        watermark = RefreshWatermark(self.json_path)
+        self.assertTrue(watermark.record_failure("events", "e1", max_attempts=1))
+        watermark.flag("events", "e1")
+        self.assertFalse(watermark.is_unavailable("events", "e1"))
+        self.assertEqual(watermark.flagged["events"], {"e1"})
+
+
+if __name__ == "__main__":
+    unittest.main()
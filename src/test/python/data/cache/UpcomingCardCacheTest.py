@@ -0,0 +1,53 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from cache.UpcomingCardCache import UpcomingCardCache
+from data_model.ScheduledBout import ScheduledBout
+
+
+def card(scraped_at: str, *pairs) -> list:
+    return [ScheduledBout("e1", order, a, b, "Flyweight", scraped_at) for order, (a, b) in enumerate(pairs)]
+
+
+class UpcomingCardCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.csv_path = str(Path(self.tmp.name) / "upcoming-cards.csv")
+        self.cache = UpcomingCardCache(self.csv_path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def reloaded(self) -> UpcomingCardCache:
+        return UpcomingCardCache(self.csv_path)
+
+    def test_only_changed_cards_are_written(self):
+        self.assertTrue(self.cache.save_card(card("2026-01-01T00:00:00", ("Ann", "Bo"), ("Cy", "Di"))))
+        self.assertFalse(self.cache.save_card(card("2026-01-02T00:00:00", ("Ann", "Bo"), ("Cy", "Di"))))
+        self.assertTrue(self.cache.save_card(card("2026-01-03T00:00:00", ("Ann", "Bo"))))
+
+        bouts = self.reloaded().get_card("e1")
+        self.assertEqual([(b.fighter_a, b.scraped_at) for b in bouts], [("Ann", "2026-01-03T00:00:00")])
+
+    def test_cancelled_card_is_recorded_empty(self):
+        self.cache.save_card(card("2026-01-01T00:00:00", ("Ann", "Bo")))
+        self.assertTrue(self.cache.save_card([], event_id="e1", scraped_at="2026-01-02T00:00:00"))
+        self.assertEqual(self.cache.get_card("e1"), [])
+        self.assertEqual(self.reloaded().get_card("e1"), [])
+        # Already empty: nothing more to record
+        self.assertFalse(self.cache.save_card([], event_id="e1", scraped_at="2026-01-03T00:00:00"))
+
+        # Rebooked after the cancellation
+        self.cache.save_card(card("2026-01-04T00:00:00", ("Ann", "Cy")))
+        self.assertEqual([b.fighter_b for b in self.reloaded().get_card("e1")], ["Cy"])
+
+    def test_empty_card_never_cached_is_not_written(self):
+        self.assertFalse(self.cache.save_card([], event_id="e2"))
+        self.assertFalse(self.cache.save_card([]))
+        self.assertFalse(Path(self.csv_path).exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
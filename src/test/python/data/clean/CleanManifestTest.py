@@ -0,0 +1,62 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from clean import clean_manifest
+from clean.clean_manifest import CleanManifest, appended_since, fingerprint
+
+
+class CleanManifestTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.path = self.root / "fights.csv"
+        self.path.write_text("fight_id,fighter\nf1,Alice Adams\n", encoding="utf-8")
+        self.previous = fingerprint(str(self.path))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_appended_file(self):
+        self.assertTrue(appended_since(str(self.path), self.previous))
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("f1,Bea Brown\n")
+        self.assertTrue(appended_since(str(self.path), self.previous))
+
+    def test_rewritten_file(self):
+        self.path.write_text("fight_id,fighter\nf1,Alice Adamz\nf1,Bea Brown\n", encoding="utf-8")
+        self.assertFalse(appended_since(str(self.path), self.previous))
+        # Shorter than when fingerprinted
+        self.path.write_text("fight_id,fighter\n", encoding="utf-8")
+        self.assertFalse(appended_since(str(self.path), self.previous))
+
+    def test_nothing_to_compare_against(self):
+        self.assertFalse(appended_since(str(self.path), None))
+        self.assertFalse(appended_since(str(self.root / "missing.csv"), self.previous))
+
+    def test_prefix_hash_spans_chunks(self):
+        with patch.object(clean_manifest, "CHUNK_SIZE", 5):
+            previous = fingerprint(str(self.path))
+            self.assertEqual(previous, self.previous)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("f1,Bea Brown\n")
+            self.assertTrue(appended_since(str(self.path), previous))
+
+    def test_round_trip(self):
+        json_path = str(self.root / clean_manifest.MANIFEST_NAME)
+        manifest = CleanManifest(json_path).load()
+        self.assertEqual(manifest.stages, {})
+        manifest.stage("process_data")["fight_ids"] = ["f1"]
+        manifest.stage("fighter_vectors")["rows"] = 2
+        manifest.save()
+
+        manifest = CleanManifest(json_path).load()
+        self.assertEqual(manifest.stage("process_data"), {"fight_ids": ["f1"]})
+        self.assertEqual(manifest.reset("fighter_vectors"), {})
+        self.assertFalse(Path(f"{json_path}.tmp").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
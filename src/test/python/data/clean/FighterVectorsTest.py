@@ -0,0 +1,47 @@
+import os
+import time
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+from clean import fighter_vectors
+
+FIXTURE_DIR = Path(__file__).resolve().parents[3] / "resources" / "clean"
+FULL_TRAINING_CSV = Path(__file__).resolve().parents[5] / "resources" / "clean_data" / "training_data.csv"
+
+
+class FighterVectorsTest(unittest.TestCase):
+    """
+    fighter-profiles.csv was written by the per-fighter loop that
+    create_fighter_profiles replaced, from training-data.csv: three fighters
+    with more fights than the window, one with two fights on the same night,
+    and a fight with a single row.
+    """
+
+    def setUp(self):
+        self.training_data = pd.read_csv(FIXTURE_DIR / "training-data.csv")
+
+    def test_create_fighter_profiles_matches_golden(self):
+        profiles = fighter_vectors.create_fighter_profiles(self.training_data, window=10)
+        self.assertEqual(profiles.to_csv(index=False).splitlines(), (FIXTURE_DIR / "fighter-profiles.csv").read_text(encoding="utf-8").splitlines())
+
+    def test_dated_vectors_lead_into_the_fight(self):
+        profiles = fighter_vectors.create_fighter_profiles(self.training_data, window=10)
+        dated = fighter_vectors.dated_vectors(profiles)
+        self.assertEqual(list(dated.columns[-1:]), ["win"])
+        self.assertNotIn("fight_id", dated.columns)
+        self.assertTrue((dated["event_date"] + pd.Timedelta(days=1)).equals(profiles["event_date"]))
+        self.assertTrue(dated["win"].equals(profiles["outcome"] == 1))
+
+    @unittest.skipUnless(os.getenv("RUN_BENCHMARKS") and FULL_TRAINING_CSV.exists(),
+                         "set RUN_BENCHMARKS=1; needs resources/clean_data/training_data.csv")
+    def test_create_fighter_profiles_benchmark(self):
+        training_data = pd.read_csv(FULL_TRAINING_CSV)
+        started = time.perf_counter()
+        fighter_vectors.create_fighter_profiles(training_data)
+        self.assertLess(time.perf_counter() - started, 5.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
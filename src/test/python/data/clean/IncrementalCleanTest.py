@@ -0,0 +1,123 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+
+from clean import fighter_vectors, process_data
+
+FIXTURE_DIR = Path(__file__).resolve().parents[3] / "resources" / "clean"
+
+
+def fixture_lines(name: str) -> list:
+    return (FIXTURE_DIR / name).read_text(encoding="utf-8").splitlines(keepends=True)
+
+
+def fight_boundary(lines: list, at: int) -> int:
+    # First line at or after `at` that starts a new fight, so no fight is split across runs
+    while at < len(lines) and lines[at].split(",")[0] == lines[at - 1].split(",")[0]:
+        at += 1
+    return at
+
+
+class IncrementalCleanTest(unittest.TestCase):
+    """
+    process_data.main and fighter_vectors.main run on the src/test/resources/clean
+    fixtures, first on part of the raw CSVs and then again once the rest is
+    appended, against a full rebuild from all of it.
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.raw = {name: fixture_lines(name) for name in process_data.INPUT_FILES}
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def run_pipeline(self, root: Path, full: bool = False) -> None:
+        with patch.object(process_data, "DATA_DIR", str(root / "raw")), \
+                patch.object(process_data, "OUTPUT_DIR", str(root / "clean")), \
+                patch.object(process_data, "FIGHTER_ALIAS_CSV", str(root / "fighter-aliases.csv")), \
+                patch.object(fighter_vectors, "DATA_DIR", str(root / "clean")), \
+                patch.object(fighter_vectors, "OUTPUT_DIR", str(root / "vectors")):
+            process_data.main(full=full)
+            fighter_vectors.main(full=full)
+
+    def write_raw(self, root: Path, cuts: dict = None, mode: str = "w") -> None:
+        # Each raw CSV up to its cut (all of it by default), or the rest of it when appending
+        (root / "raw").mkdir(parents=True, exist_ok=True)
+        for name, lines in self.raw.items():
+            cut = (cuts or {}).get(name, len(lines))
+            with open(root / "raw" / name, mode, encoding="utf-8") as f:
+                f.writelines(lines[:cut] if mode == "w" else lines[cut:])
+
+    def full_rebuild(self) -> Path:
+        root = self.root / "full"
+        self.write_raw(root)
+        self.run_pipeline(root, full=True)
+        return root
+
+    def assertSameOutputs(self, root: Path, full_root: Path) -> None:
+        vectors = "vectors/fighter_vectors_all.csv"
+        self.assertEqual((root / vectors).read_bytes(), (full_root / vectors).read_bytes())
+        # New fights are appended rather than interleaved, and a column without NaN in the
+        # appended chunk is written as int ("0", not "0.0"), so only the set of rows matches
+        training = [training_rows(r / "clean/training_data.csv") for r in (root, full_root)]
+        pd.testing.assert_frame_equal(*training, check_dtype=False)
+
+    def test_appended_inputs_match_full_rebuild(self):
+        cuts = {name: len(lines) // 2 for name, lines in self.raw.items()}
+        cuts["fights.csv"] = fight_boundary(self.raw["fights.csv"], cuts["fights.csv"])
+        root = self.root / "incremental"
+        self.write_raw(root, cuts)
+        self.run_pipeline(root, full=True)
+        self.write_raw(root, cuts, mode="a")
+
+        with patch.object(process_data, "append_training_rows", wraps=process_data.append_training_rows) as append, \
+                patch.object(fighter_vectors, "latest_vectors", wraps=fighter_vectors.latest_vectors) as latest:
+            self.run_pipeline(root)
+        append.assert_called_once()
+        self.assertIsNotNone(latest.call_args.kwargs["fighter_ids"])
+        self.assertSameOutputs(root, self.full_rebuild())
+
+    def test_rewritten_row_rebuilds_in_full(self):
+        root = self.root / "rewritten"
+        self.write_raw(root)
+        self.run_pipeline(root, full=True)
+        # An earlier stat line corrected in place, not appended
+        self.raw["fights.csv"][1] = self.raw["fights.csv"][1].replace(",0,", ",1,", 1)
+        self.write_raw(root)
+
+        with patch.object(process_data, "append_training_rows") as append, \
+                patch.object(fighter_vectors, "latest_vectors", wraps=fighter_vectors.latest_vectors) as latest:
+            self.run_pipeline(root)
+        append.assert_not_called()
+        self.assertIsNone(latest.call_args.kwargs.get("fighter_ids"))
+        full_root = self.full_rebuild()
+        self.assertSameOutputs(root, full_root)
+        self.assertEqual((root / "clean/training_data.csv").read_bytes(), (full_root / "clean/training_data.csv").read_bytes())
+
+    def test_fight_without_event_info_is_retried(self):
+        info = self.raw["events-info.csv"]
+        missing = info[-1].split(",")[1]
+        root = self.root / "retried"
+        self.write_raw(root, {"events-info.csv": len(info) - 1})
+        self.run_pipeline(root, full=True)
+        self.assertNotIn(missing, set(training_rows(root / "clean/training_data.csv")["fight_id"]))
+
+        # Its event info arrives after the stats
+        self.write_raw(root, {"events-info.csv": len(info) - 1}, mode="a")
+        self.run_pipeline(root)
+        self.assertIn(missing, set(training_rows(root / "clean/training_data.csv")["fight_id"]))
+        self.assertSameOutputs(root, self.full_rebuild())
+
+
+def training_rows(path: Path) -> pd.DataFrame:
+    rows = pd.read_csv(path)
+    return rows.sort_values(["fight_id", "fighter_id"]).reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
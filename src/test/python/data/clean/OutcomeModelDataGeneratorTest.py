@@ -0,0 +1,90 @@
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+from clean import OutcomeModelDataGenerator as generator
+
+FIXTURE_DIR = Path(__file__).resolve().parents[3] / "resources" / "clean"
+
+HOLM, ALVES, YAMAMOTO = "634e2fb70bde3fd5", "d317a5e2b3f88c5f", "9f488f520ed25bbf"
+# Fights with no training rows, only asked about: (fight_id, fighter_id, fighter, event_date)
+EXTRA_FIGHTS = [
+    # The day after, and two days after, Holm's fight on 2015-11-14
+    ("x-holm-1", HOLM, "Holly Holm", "2015-11-15"),
+    ("x-holm-2", HOLM, "Holly Holm", "2015-11-16"),
+    # As of 2014-12-31 and 2015-01-01, either side of MIN_YEAR
+    ("x-alves-1", ALVES, "Warlley Alves", "2015-01-01"),
+    ("x-alves-2", ALVES, "Warlley Alves", "2015-01-02"),
+    # After Yamamoto's two fights on the night of 1999-11-19
+    ("x-yamamoto", YAMAMOTO, "Kenichi Yamamoto", "2016-01-01"),
+]
+# Holm vs. Bueno Silva, a no contest
+CNC_FIGHT = "73370221b3fa3676"
+
+
+def fixture_inputs():
+    """
+    training-data.csv (see FighterVectorsTest) with its fights asked about in
+    file order, then EXTRA_FIGHTS.
+    """
+    training_data = pd.read_csv(FIXTURE_DIR / "training-data.csv")
+    extra = pd.DataFrame(EXTRA_FIGHTS, columns=["fight_id", "fighter_id", "fighter", "event_date"])
+    rows = pd.concat([training_data[extra.columns], extra], ignore_index=True)
+    fights = rows[["fight_id", "fighter_id", "fighter"]]
+
+    winners = training_data[training_data["outcome"] == 1].set_index("fight_id")["fighter"]
+    fight_events = rows.drop_duplicates("fight_id")[["fight_id", "event_date"]].copy()
+    fight_events["event_date"] = pd.to_datetime(fight_events["event_date"])
+    fight_events["winner_name"] = fight_events["fight_id"].map(winners).fillna("")
+    fight_events["method"] = "U-DEC"
+    fight_events.loc[fight_events["fight_id"] == CNC_FIGHT, "method"] = "CNC"
+    return fights, fight_events, training_data
+
+
+class OutcomeModelDataGeneratorTest(unittest.TestCase):
+    """
+    fight-vectors-dated.csv was written from fixture_inputs() by the per-row
+    loop build_fight_vectors replaced: latest_vectors(None, <day before>,
+    fighter_id=...) for each fight row, skipping fights before MIN_YEAR, no
+    contests and debuts.
+    """
+
+    def setUp(self):
+        self.vectors = generator.build_fight_vectors(*fixture_inputs())
+
+    def vector(self, fighter_id: str, as_of: str) -> pd.Series:
+        rows = self.vectors[(self.vectors["fighter_id"] == fighter_id) & (self.vectors["event_date"] == as_of)]
+        self.assertEqual(len(rows), 1)
+        return rows.iloc[0]
+
+    def test_matches_golden(self):
+        self.assertEqual(self.vectors.to_csv(index=False).splitlines(), (FIXTURE_DIR / "fight-vectors-dated.csv").read_text(encoding="utf-8").splitlines())
+
+    def test_fight_the_day_before_is_left_out(self):
+        before = self.vector(HOLM, "2015-11-14")
+        after = self.vector(HOLM, "2015-11-15")
+        self.assertEqual((before["total_fights"], after["total_fights"]), (2, 3))
+        self.assertEqual((before["current_streak"], after["current_streak"]), (2, 3))
+
+    def test_same_night_fights_both_count(self):
+        row = self.vector(YAMAMOTO, "2015-12-31")
+        self.assertEqual((row["total_fights"], row["current_streak"]), (3, -1))
+        self.assertAlmostEqual(row["win_rate"], 2 / 3)
+
+    def test_min_year_applies_to_the_day_before(self):
+        self.assertFalse((self.vectors["event_date"] < pd.Timestamp(generator.MIN_YEAR, 1, 1)).any())
+        self.assertEqual(self.vector(ALVES, "2015-01-01")["total_fights"], 2)
+        self.assertEqual(len(self.vectors[(self.vectors["fighter_id"] == ALVES) & (self.vectors["event_date"] == "2014-12-31")]), 0)
+
+    def test_no_contests_and_debuts_are_left_out(self):
+        # Holm's no contest on 2023-07-15 is not a row; Bueno Silva's only fight is that one
+        self.assertEqual(len(self.vectors[self.vectors["event_date"] == "2023-07-14"]), 0)
+        # Every fighter with a single training row only ever debuts
+        counts = pd.read_csv(FIXTURE_DIR / "training-data.csv").groupby("fighter_id").size()
+        self.assertFalse(self.vectors["fighter_id"].isin(counts[counts == 1].index).any())
+        self.assertTrue(self.vectors["total_fights"].ge(1).all())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import math
+import threading
+import unittest
+from unittest import mock
+
+import requests
+
+from clients import KalshiClient as kalshi
+from clients.KalshiClient import KalshiClient
+
+
+def market(ticker, fighter, yes="0.55", no="0.47"):
+    return {"ticker": ticker, "yes_sub_title": fighter, "yes_ask_dollars": yes, "no_ask_dollars": no}
+
+
+class FakeResponse:
+
+    def __init__(self, payload, status_code=200):
+        self.payload = payload
+        self.status_code = status_code
+
+    def json(self):
+        return self.payload
+
+
+class FakeSession:
+    """Serves one queued response per get and records the params of each call."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def get(self, url, params=None, timeout=None):
+        self.calls.append(dict(params))
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+class KalshiClientTest(unittest.TestCase):
+
+    def test_follows_cursor_to_last_page(self):
+        session = FakeSession([
+            FakeResponse({"markets": [market("KXUFCFIGHT-26APR04EWIEST-EWI", "Ewing")], "cursor": "c1"}),
+            FakeResponse({"markets": [market("KXUFCFIGHT-26APR04EWIEST-EST", "Estes")], "cursor": ""}),
+        ])
+        snapshot = KalshiClient(url="http://kalshi", session=session).getSnapshot()
+
+        self.assertEqual(list(snapshot.fighter), ["Ewing", "Estes"])
+        self.assertEqual(str(snapshot.fight_date[0]), "2026-04-04")
+        self.assertNotIn("cursor", session.calls[0])
+        self.assertEqual(session.calls[1]["cursor"], "c1")
+        self.assertEqual(session.calls[1]["limit"], kalshi.PAGE_LIMIT)
+
+    def test_unfinished_pagination_keeps_last_snapshot(self):
+        session = FakeSession([FakeResponse({"markets": [market("KXUFCFIGHT-26APR04EWIEST-EWI", "Ewing")]})])
+        client = KalshiClient(url="http://kalshi", session=session)
+        self.assertEqual(len(client.getSnapshot()), 1)
+
+        session.responses = [FakeResponse({"markets": [], "cursor": "more"}) for _ in range(3)]
+        client.invalidate()
+        with mock.patch.object(kalshi, "MAX_PAGES", 3):
+            snapshot = client.getSnapshot()
+        self.assertEqual(list(snapshot.fighter), ["Ewing"])
+        self.assertEqual(len(session.calls), 4)
+
+    def test_failed_pull_serves_last_snapshot_until_next_window(self):
+        session = FakeSession([
+            FakeResponse({"markets": [market("KXUFCFIGHT-26APR04EWIEST-EWI", "Ewing")]}),
+            requests.ConnectionError("down"),
+            FakeResponse({}, status_code=503),
+        ])
+        client = KalshiClient(url="http://kalshi", ttl=3600, session=session)
+        first = client.getSnapshot()
+
+        client.invalidate()
+        self.assertIs(client.getSnapshot(), first)
+        # The failure still starts a TTL window, so Kalshi is not asked again within it
+        self.assertIs(client.getSnapshot(), first)
+        self.assertEqual(len(session.calls), 2)
+
+        client.invalidate()
+        self.assertIs(client.getSnapshot(), first)
+        self.assertEqual(len(session.calls), 3)
+
+    def test_concurrent_callers_share_one_pull(self):
+        started, release = threading.Event(), threading.Event()
+        session = FakeSession([FakeResponse({"markets": [market("KXUFCFIGHT-26APR04EWIEST-EWI", "Ewing")]})])
+        get = session.get
+
+        def slow_get(*args, **kwargs):
+            started.set()
+            release.wait(5)
+            return get(*args, **kwargs)
+
+        session.get = slow_get
+        client = KalshiClient(url="http://kalshi", ttl=3600, session=session)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(client.getSnapshot())) for _ in range(4)]
+        threads[0].start()
+        started.wait(5)
+        for t in threads[1:]:
+            t.start()
+        release.set()
+        for t in threads:
+            t.join(5)
+
+        self.assertEqual(len(session.calls), 1)
+        self.assertEqual(len(results), 4)
+        self.assertTrue(all(r is results[0] for r in results))
+
+    def test_skips_unparseable_markets(self):
+        session = FakeSession([FakeResponse({"markets": [
+            market("KXUFCFIGHT-26APR04EWIEST-EWI", "Ewing", yes=None),
+            market("KXUFCFIGHT-NODATE-X", "Nobody"),
+            market("KXUFCFIGHT-26APR04EWIEST-EST", ""),
+        ]})])
+        snapshot = KalshiClient(url="http://kalshi", session=session).getSnapshot()
+        self.assertEqual(list(snapshot.ticker), ["KXUFCFIGHT-26APR04EWIEST-EWI"])
+        self.assertTrue(math.isnan(snapshot.yes_money[0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+from unittest.mock import patch
+
+import requests
+
+from scrapers.EventScraper import COMPLETED_EVENTS_URL, RECENT_EVENTS_URL, parse_completed_events, scrape_new_events
+
+ROW = """
+<tr class="b-statistics__table-row">
+  <td class="b-statistics__table-col">
+    <i class="b-statistics__table-content">
+      <a href="http://ufcstats.com/event-details/{id}" class="b-link b-link_style_black">
+        UFC {id}
+      </a>
+      <span class="b-statistics__date">
+        {date}
+      </span>
+    </i>
+  </td>
+  <td class="b-statistics__table-col b-statistics__table-col_style_big-top-padding">
+    Las Vegas, Nevada, USA
+  </td>
+</tr>"""
+
+
+def listing(*events) -> str:
+    rows = "".join(ROW.format(id=event_id, date=date) for event_id, date in events)
+    return f'<html><body><table class="b-statistics__table-events"><tbody>{rows}</tbody></table></body></html>'
+
+
+def response(html: str, x_cache: str = None) -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = 200
+    resp._content = html.encode("utf-8")
+    resp.encoding = "utf-8"
+    if x_cache:
+        resp.headers["X-Cache"] = x_cache
+    return resp
+
+
+RECENT = listing(("e4", "March 02, 2024"), ("e3", "February 03, 2024"), ("e2", "January 06, 2024"))
+FULL = listing(("e4", "March 02, 2024"), ("e3", "February 03, 2024"), ("e2", "January 06, 2024"), ("e1", "December 02, 2023"))
+
+
+@patch("scrapers.EventScraper.polite_delay")
+class EventScraperTest(unittest.TestCase):
+
+    def scrape(self, known, pages):
+        with patch("scrapers.EventScraper.get_html", side_effect=lambda session, url, revalidate=False: pages[url]) as get_html:
+            events = scrape_new_events(None, known)
+        return [e["event_id"] for e in events], [c.args[1] for c in get_html.call_args_list]
+
+    def test_parse(self, polite_delay):
+        events, reached = parse_completed_events(FULL)
+        self.assertFalse(reached)
+        self.assertEqual(events[0], {
+            "event_id": "e4",
+            "event_name": "UFC e4",
+            "event_date": "March 02, 2024",
+            "event_location": "Las Vegas, Nevada, USA",
+            "event_url": "http://ufcstats.com/event-details/e4",
+        })
+        events, reached = parse_completed_events(FULL, stop_at={"e2", "e1"})
+        self.assertTrue(reached)
+        self.assertEqual([e["event_id"] for e in events], ["e4", "e3"])
+
+    def test_new_events_above_newest_known(self, polite_delay):
+        self.assertEqual(self.scrape({"e3", "e2"}, {RECENT_EVENTS_URL: response(RECENT)}), (["e4"], [RECENT_EVENTS_URL]))
+
+    def test_revalidated_listing_is_still_parsed(self, polite_delay):
+        # A run that fetched this page but failed before saving e4 must not lose it
+        for x_cache in ("REVALIDATED", "UNCHANGED", "HIT"):
+            self.assertEqual(self.scrape({"e3"}, {RECENT_EVENTS_URL: response(RECENT, x_cache)}), (["e4"], [RECENT_EVENTS_URL]))
+
+    def test_falls_back_to_full_listing(self, polite_delay):
+        pages = {RECENT_EVENTS_URL: response(RECENT), COMPLETED_EVENTS_URL: response(FULL)}
+        self.assertEqual(self.scrape({"e1"}, pages), (["e4", "e3", "e2"], [RECENT_EVENTS_URL, COMPLETED_EVENTS_URL]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,176 @@
+import os
+import re
+import time
+import unittest
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from bs4 import BeautifulSoup
+
+from scrapers.FightDataScraper import parse_fight_totals
+from scrapers.FightPageParser import parse_fight_page
+
+FIXTURE_DIR = Path(__file__).resolve().parents[3] / "resources" / "ufcstats"
+FIXTURES = sorted(FIXTURE_DIR.glob("fight-details-*.html"))
+FIGHTER_ID_RE = re.compile(r"/fighter-details/([a-zA-Z0-9]+)")
+
+
+def clean_text(s: str) -> str:
+    return " ".join((s or "").split())
+
+def fighter_id_from_href(href: str) -> str:
+    m = FIGHTER_ID_RE.search(href or "")
+    return m.group(1) if m else ""
+
+def two_vals_from_td(td) -> Tuple[str, str]:
+    """
+    UFCStats totals tables store both fighters in the same <td>, as two <p> blocks:
+      first <p> = fighter A
+      second <p> = fighter B
+    """
+    ps = td.select("p.b-fight-details__table-text")
+    vals = [clean_text(p.get_text(" ", strip=True)) for p in ps]
+    if len(vals) >= 2:
+        return vals[0], vals[1]
+    if len(vals) == 1:
+        return vals[0], ""
+    return "", ""
+
+def find_table_by_headers(soup: BeautifulSoup, must_have: List[str]):
+    """
+    Find the first <table> whose <thead> contains all strings in must_have.
+    This targets the TOP-LEVEL totals tables (not the per-round 'js-fight-table' tables).
+    """
+    for table in soup.find_all("table"):
+        thead = table.find("thead")
+        if not thead:
+            continue
+        header_text = clean_text(thead.get_text(" ", strip=True)).lower()
+        if all(x.lower() in header_text for x in must_have):
+            return table
+    return None
+
+
+def parse_fight_totals_bs4(html: str, fight_id: str, url: str = "") -> List[Dict]:
+    """
+    The BeautifulSoup parser parse_fight_totals replaced, kept here as the
+    reference the lxml engine is tested and benchmarked against.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+
+    # 1) Totals (overall) table
+    totals_table = find_table_by_headers(
+        soup,
+        must_have=["Fighter", "KD", "Sig. str.", "Total str.", "Td", "Ctrl"]
+    )
+    if not totals_table:
+        raise RuntimeError(f"Could not find Totals table on {url}")
+
+    # 2) Significant strikes breakdown totals table
+    sig_table = find_table_by_headers(
+        soup,
+        must_have=["Fighter", "Head", "Body", "Leg", "Distance", "Clinch", "Ground"]
+    )
+    if not sig_table:
+        raise RuntimeError(f"Could not find Significant Strikes totals table on {url}")
+
+    # ---- Extract fighter names + ids from the Totals table fighter cell ----
+    totals_row = totals_table.select_one("tbody tr")
+    if not totals_row:
+        raise RuntimeError(f"Totals table missing tbody row on {url}")
+
+    totals_tds = totals_row.find_all("td", recursive=False)
+    fighter_td = totals_tds[0]
+
+    fighter_links = fighter_td.select("a[href*='fighter-details']")
+    if len(fighter_links) < 2:
+        raise RuntimeError(f"Could not find two fighter links in Totals table on {url}")
+
+    f1_name = clean_text(fighter_links[0].get_text(strip=True))
+    f2_name = clean_text(fighter_links[1].get_text(strip=True))
+    f1_id = fighter_id_from_href(fighter_links[0].get("href", ""))
+    f2_id = fighter_id_from_href(fighter_links[1].get("href", ""))
+
+    rows = [
+        {"fight_id": fight_id, "fighter_id": f1_id, "fighter": f1_name},
+        {"fight_id": fight_id, "fighter_id": f2_id, "fighter": f2_name},
+    ]
+
+    # Totals table column order (matches UFCStats HTML structure shown):
+    # Fighter | KD | Sig Str | Sig Str % | Total Str | Td | Td % | Sub Att | Rev | Ctrl
+    totals_cols = {
+        "kd": 1,
+        "sig_str": 2,
+        "sig_str_pct": 3,
+        "total_str": 4,
+        "td": 5,
+        "td_pct": 6,
+        "sub_att": 7,
+        "rev": 8,
+        "ctrl": 9,
+    }
+
+    for key, idx in totals_cols.items():
+        v1, v2 = two_vals_from_td(totals_tds[idx])
+        rows[0][key] = v1
+        rows[1][key] = v2
+
+    # Sig strikes totals table column order:
+    # Fighter | Sig Str | Sig Str % | Head | Body | Leg | Distance | Clinch | Ground
+    sig_row = sig_table.select_one("tbody tr")
+    if not sig_row:
+        raise RuntimeError(f"Sig strikes table missing tbody row on {url}")
+
+    sig_tds = sig_row.find_all("td", recursive=False)
+    sig_cols = {
+        "head": 3,
+        "body": 4,
+        "leg": 5,
+        "distance": 6,
+        "clinch": 7,
+        "ground": 8,
+    }
+
+    for key, idx in sig_cols.items():
+        v1, v2 = two_vals_from_td(sig_tds[idx])
+        rows[0][key] = v1
+        rows[1][key] = v2
+
+    return rows
+
+
+class FightDataScraperTest(unittest.TestCase):
+
+    def test_lxml_engine_matches_bs4_parser(self):
+        self.assertTrue(FIXTURES)
+        for path in FIXTURES:
+            html = path.read_text(encoding="utf-8")
+            with self.subTest(fixture=path.name):
+                self.assertEqual(parse_fight_totals(html, "f1", str(path)), parse_fight_totals_bs4(html, "f1", str(path)))
+
+    def test_rounds(self):
+        html = (FIXTURE_DIR / "fight-details-5-rounds.html").read_text(encoding="utf-8")
+        page = parse_fight_page(html, "f1")
+        self.assertEqual([(r["round"], r["fighter"]) for r in page.rounds[:2]], [(1, "Movsar Evloev"), (1, "Aljamain Sterling")])
+        self.assertEqual(sorted({r["round"] for r in page.rounds}), [1, 2, 3, 4, 5])
+        for row in page.rounds:
+            self.assertTrue(set(page.totals[0]) - {"round"} <= set(row))
+
+    def test_missing_tables(self):
+        with self.assertRaises(RuntimeError):
+            parse_fight_page("<html><body><p>No stats yet</p></body></html>", "f1")
+
+    @unittest.skipUnless(os.getenv("RUN_BENCHMARKS"), "set RUN_BENCHMARKS=1 to time the parsers")
+    def test_benchmark(self):
+        html = FIXTURES[-1].read_text(encoding="utf-8")
+        timings = {}
+        for name, parse in (("bs4", parse_fight_totals_bs4), ("lxml", parse_fight_totals)):
+            start = time.perf_counter()
+            for _ in range(20):
+                parse(html, "f1")
+            timings[name] = (time.perf_counter() - start) / 20
+        self.assertLess(timings["lxml"], timings["bs4"], timings)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,151 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+import requests
+
+from scrapers import ScraperUtil
+from scrapers.FetchEngine import FetchEngine
+from scrapers.HtmlCache import DEFAULT_TTL, HOUR, HtmlCache
+from scrapers.ScraperUtil import get_html, needs_network
+
+EVENT_URL = "http://ufcstats.test/event-details/e1"
+FIGHT_URL = "http://ufcstats.test/fight-details/f1"
+
+
+def response(status: int, body: bytes = b"", headers: dict = None) -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = status
+    resp._content = body
+    resp.headers.update(headers or {})
+    return resp
+
+
+class RecordingSession:
+    """Answers every get() with `resp` and records the request headers."""
+
+    def __init__(self, resp: requests.Response):
+        self.resp = resp
+        self.headers = []
+
+    def get(self, url, timeout=None, headers=None):
+        self.headers.append(headers)
+        return self.resp
+
+
+class HtmlCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = HtmlCache(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def age(self, url: str, seconds: float) -> None:
+        entry = self.cache.entry(url)
+        self.cache._index[url] = entry._replace(fetched_at=entry.fetched_at - seconds)
+
+    def test_freshness_follows_ttl_policy(self):
+        self.assertFalse(self.cache.is_fresh(EVENT_URL))
+        self.cache.put(EVENT_URL, b"<html>card</html>")
+        self.assertTrue(self.cache.is_fresh(EVENT_URL))
+        self.age(EVENT_URL, 6 * HOUR - 60)
+        self.assertTrue(self.cache.is_fresh(EVENT_URL))
+        self.age(EVENT_URL, 120)
+        self.assertFalse(self.cache.is_fresh(EVENT_URL))
+        self.assertEqual(self.cache.read(EVENT_URL), b"<html>card</html>")
+
+    def test_fight_pages_immutable_once_stats_posted(self):
+        self.cache.put(FIGHT_URL, b"<html>pending</html>")
+        self.age(FIGHT_URL, DEFAULT_TTL + 1)
+        self.assertFalse(self.cache.is_fresh(FIGHT_URL))
+        self.cache.put(FIGHT_URL, b"<html>Sig. str.</html>")
+        self.age(FIGHT_URL, 365 * 24 * HOUR)
+        self.assertTrue(self.cache.is_fresh(FIGHT_URL))
+
+    def test_index_survives_reload_and_torn_line(self):
+        self.cache.put(EVENT_URL, b"a", etag='"v1"')
+        self.cache.put(FIGHT_URL, b"b")
+        self.cache.invalidate(FIGHT_URL)
+        with open(os.path.join(self.tmp.name, "index.jsonl"), "a", encoding="utf-8") as f:
+            f.write('{"url": "http://ufcstats.test/event-det')
+
+        reloaded = HtmlCache(self.tmp.name)
+        self.assertEqual(reloaded.entry(EVENT_URL).etag, '"v1"')
+        self.assertEqual(reloaded.read(EVENT_URL), b"a")
+        self.assertIsNone(reloaded.entry(FIGHT_URL))
+
+    def test_identical_bodies_share_a_blob(self):
+        self.cache.put(EVENT_URL, b"same")
+        self.cache.put(FIGHT_URL, b"same")
+        blobs = [f for _, _, files in os.walk(os.path.join(self.tmp.name, "blobs")) for f in files]
+        self.assertEqual(len(blobs), 1)
+
+
+@patch.dict(os.environ, {"SCRAPE_CACHE": "on", "ENABLE_SCRAPING": "true"})
+class GetHtmlCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = HtmlCache(self.tmp.name)
+        patcher = patch.object(ScraperUtil, "_html_cache", self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_fresh_page_served_without_request(self):
+        self.cache.put(EVENT_URL, b"card")
+        session = RecordingSession(response(500))
+        resp = get_html(session, EVENT_URL)
+        self.assertEqual((resp.text, resp.headers["X-Cache"]), ("card", "HIT"))
+        self.assertEqual(session.headers, [])
+        self.assertFalse(needs_network(EVENT_URL))
+        self.assertTrue(needs_network(EVENT_URL, revalidate=True))
+
+    def test_conditional_headers(self):
+        session = RecordingSession(response(200, b"card"))
+        get_html(session, EVENT_URL)
+        self.assertIsNone(session.headers[-1])
+
+        self.cache.put(EVENT_URL, b"card", etag='"v1"', last_modified="Sat, 01 Feb 2025 00:00:00 GMT")
+        get_html(session, EVENT_URL, revalidate=True)
+        self.assertEqual(session.headers[-1], {"If-None-Match": '"v1"', "If-Modified-Since": "Sat, 01 Feb 2025 00:00:00 GMT"})
+
+    def test_not_modified_serves_cached_body_and_restarts_ttl(self):
+        self.cache.put(EVENT_URL, b"card", etag='"v1"')
+        stale = time.time() - 7 * HOUR
+        self.cache._index[EVENT_URL] = self.cache.entry(EVENT_URL)._replace(fetched_at=stale)
+
+        resp = get_html(RecordingSession(response(304)), EVENT_URL)
+        self.assertEqual((resp.status_code, resp.text, resp.headers["X-Cache"]), (200, "card", "REVALIDATED"))
+        self.assertGreater(self.cache.entry(EVENT_URL).fetched_at, stale)
+        self.assertTrue(self.cache.is_fresh(EVENT_URL))
+
+    def test_changed_and_unchanged_bodies(self):
+        self.cache.put(EVENT_URL, b"card")
+        resp = get_html(RecordingSession(response(200, b"card", {"ETag": '"v2"'})), EVENT_URL, revalidate=True)
+        self.assertEqual(resp.headers["X-Cache"], "UNCHANGED")
+        self.assertEqual(self.cache.entry(EVENT_URL).etag, '"v2"')
+
+        resp = get_html(RecordingSession(response(200, b"new card")), EVENT_URL, revalidate=True)
+        self.assertNotIn("X-Cache", resp.headers)
+        self.assertEqual(self.cache.read(EVENT_URL), b"new card")
+
+    def test_fetch_engine_revalidates_fresh_pages(self):
+        self.cache.put(EVENT_URL, b"card", etag='"v1"')
+        session = RecordingSession(response(304))
+        engine = FetchEngine(max_workers=1, rate_per_sec=1000)
+        with patch("scrapers.FetchEngine.get_session", return_value=session):
+            self.assertEqual(list(engine.map(["e1"], lambda key: EVENT_URL, lambda key, url, html: html)), [("e1", "card", None)])
+            self.assertEqual(session.headers, [])
+            self.assertEqual(list(engine.map(["e1"], lambda key: EVENT_URL, lambda key, url, html: html, revalidate=True)), [("e1", "card", None)])
+        self.assertEqual(session.headers, [{"If-None-Match": '"v1"'}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+import os
+import threading
+import time
+import unittest
+from email.utils import formatdate
+from unittest.mock import patch
+
+import requests
+
+from scrapers import ScraperUtil
+from scrapers.FetchEngine import FetchEngine
+from scrapers.ScraperUtil import BACKOFF_MAX, MAX_RETRIES, get_html, get_session, retry_delay
+
+
+def response(status: int, headers: dict = None, body: bytes = b"<html></html>") -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = status
+    resp._content = body
+    resp.headers.update(headers or {})
+    return resp
+
+
+class ScriptedSession:
+    """Answers get() with the next scripted response, raising it if it is an exception."""
+
+    def __init__(self, *script):
+        self.script = list(script)
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def get(self, url, timeout=None, headers=None):
+        with self._lock:
+            self.calls += 1
+            step = self.script.pop(0)
+        if isinstance(step, Exception):
+            raise step
+        return step
+
+
+@patch.dict(os.environ, {"SCRAPE_CACHE": "off", "ENABLE_SCRAPING": "true"})
+@patch("scrapers.ScraperUtil.time.sleep")
+class GetHtmlRetryTest(unittest.TestCase):
+
+    def test_retries_until_success(self, sleep):
+        session = ScriptedSession(response(503), requests.ConnectionError("reset"), response(200))
+        self.assertEqual(get_html(session, "http://ufcstats.test/a").status_code, 200)
+        self.assertEqual(session.calls, 3)
+        self.assertEqual(sleep.call_count, 2)
+
+    def test_gives_up_with_last_response(self, sleep):
+        session = ScriptedSession(*[response(502)] * (MAX_RETRIES + 1))
+        self.assertEqual(get_html(session, "http://ufcstats.test/a").status_code, 502)
+        self.assertEqual(session.calls, MAX_RETRIES + 1)
+
+    def test_any_request_error_is_retried(self, sleep):
+        session = ScriptedSession(requests.exceptions.ChunkedEncodingError("cut"), response(200))
+        self.assertEqual(get_html(session, "http://ufcstats.test/a").status_code, 200)
+        session = ScriptedSession(*[requests.Timeout("slow")] * (MAX_RETRIES + 1))
+        self.assertIsNone(get_html(session, "http://ufcstats.test/a"))
+
+    def test_client_errors_are_not_retried(self, sleep):
+        session = ScriptedSession(response(404))
+        self.assertEqual(get_html(session, "http://ufcstats.test/a").status_code, 404)
+        sleep.assert_not_called()
+
+    def test_no_retries(self, sleep):
+        session = ScriptedSession(response(429))
+        self.assertEqual(get_html(session, "http://ufcstats.test/a", retries=0).status_code, 429)
+        sleep.assert_not_called()
+
+    def test_sleeps_for_retry_after(self, sleep):
+        session = ScriptedSession(response(429, {"Retry-After": "7"}), response(200))
+        get_html(session, "http://ufcstats.test/a")
+        sleep.assert_called_once_with(7.0)
+
+
+class RetryDelayTest(unittest.TestCase):
+
+    def test_retry_after_seconds(self):
+        self.assertEqual(retry_delay(response(429, {"Retry-After": "3"}), 0), 3.0)
+        self.assertEqual(retry_delay(response(429, {"Retry-After": "-3"}), 0), 0.0)
+        self.assertEqual(retry_delay(response(429, {"Retry-After": "3600"}), 0), BACKOFF_MAX)
+
+    def test_retry_after_http_date(self):
+        delay = retry_delay(response(503, {"Retry-After": formatdate(time.time() + 30, usegmt=True)}), 0)
+        self.assertTrue(28 <= delay <= 30, delay)
+        self.assertEqual(retry_delay(response(503, {"Retry-After": formatdate(time.time() - 30, usegmt=True)}), 0), 0.0)
+
+    def test_backoff_without_retry_after(self):
+        for attempt, bound in ((0, 2.0), (2, 8.0), (10, BACKOFF_MAX)):
+            for resp in (None, response(503), response(503, {"Retry-After": "soon"})):
+                self.assertTrue(0 <= retry_delay(resp, attempt) <= bound)
+
+
+@patch.dict(os.environ, {"SCRAPE_CACHE": "off", "ENABLE_SCRAPING": "true"})
+@patch("scrapers.FetchEngine.time.sleep")
+class FetchEngineRetryTest(unittest.TestCase):
+
+    def fetch(self, session, engine):
+        with patch("scrapers.FetchEngine.get_session", return_value=session):
+            return list(engine.map(["a"], lambda key: f"http://ufcstats.test/{key}", lambda key, url, html: html))
+
+    def test_each_retry_is_rate_limited_and_reported(self, sleep):
+        engine = FetchEngine(max_workers=4, rate_per_sec=1000)
+        engine.concurrency.cooldown = 0
+        limit = engine.concurrency._limit
+        session = ScriptedSession(response(429, {"Retry-After": "1"}), response(503, {"Retry-After": "1"}), response(200, body=b"ok"))
+        with patch.object(engine, "_bucket", wraps=engine._bucket) as bucket:
+            self.assertEqual(self.fetch(session, engine), [("a", "ok", None)])
+        self.assertEqual(bucket.call_count, 3)
+        # Two overloads halve the limit twice before the success adds to it
+        self.assertAlmostEqual(engine.concurrency._limit, max(1, limit / 4) + 1)
+        # time.sleep is shared with the token bucket; the Retry-After waits are the 1s ones
+        self.assertEqual([c.args for c in sleep.call_args_list if c.args == (1.0,)], [(1.0,), (1.0,)])
+
+    def test_gives_up(self, sleep):
+        engine = FetchEngine(max_workers=2, rate_per_sec=1000)
+        session = ScriptedSession(*[requests.ConnectionError("down")] * (MAX_RETRIES + 1))
+        [(key, parsed, error)] = self.fetch(session, engine)
+        self.assertIsNone(parsed)
+        self.assertIsInstance(error, RuntimeError)
+        self.assertEqual(session.calls, MAX_RETRIES + 1)
+
+
+class SessionTest(unittest.TestCase):
+
+    def test_one_session_per_thread_sharing_one_pool(self):
+        sessions = []
+        thread = threading.Thread(target=lambda: sessions.append(get_session()))
+        thread.start()
+        thread.join()
+        self.assertIs(get_session(), get_session())
+        self.assertIsNot(sessions[0], get_session())
+        self.assertIs(sessions[0].get_adapter("http://ufcstats.com"), get_session().get_adapter("http://ufcstats.com"))
+        self.assertIs(get_session().get_adapter("http://ufcstats.com"), ScraperUtil._adapter)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from model.fight import OutcomeVectorBuilder as builder
+
+TODAY = pd.Timestamp("2026-01-01")
+
+
+def outcome_row(fight_id: str, fighter_id: str, seed: float, win: int, event_date: str = "2024-05-01", n_fights_norm: float = 0.5) -> dict:
+    row = {"fighter": fighter_id.upper(), "fighter_id": fighter_id, "fight_id": fight_id, "event_date": event_date}
+    row.update({col: seed + i / 10 for i, col in enumerate(builder.feature_cols)})
+    row["n_fights_norm"] = n_fights_norm
+    row["win"] = win
+    return row
+
+
+def outcome_vectors() -> pd.DataFrame:
+    # Rows in outcome_vectors_2 order: a fight's two rows need not be next to each other
+    return pd.DataFrame([
+        outcome_row("f2", "c", 3.0, 0),
+        outcome_row("f1", "a", 1.0, 1),
+        outcome_row("f2", "d", 4.0, 1),
+        outcome_row("f1", "b", 2.0, 0),
+        # Only one row
+        outcome_row("f3", "e", 5.0, 1),
+        # Too long ago
+        outcome_row("f4", "g", 6.0, 1, event_date="2014-05-01"),
+        outcome_row("f4", "h", 7.0, 0, event_date="2014-05-01"),
+        # One fighter with too little data leaves a single row
+        outcome_row("f5", "i", 8.0, 1),
+        outcome_row("f5", "j", 9.0, 0, n_fights_norm=0.1),
+    ])
+
+
+class OutcomeVectorBuilderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.matchups = builder.build_matchups(outcome_vectors(), today=TODAY)
+
+    def test_pairs_each_fight_once_in_fight_id_order(self):
+        self.assertEqual(self.matchups["fight_id"].tolist(), ["f1", "f2"])
+        self.assertEqual(self.matchups.columns[0], "fight_id")
+        self.assertEqual(self.matchups.columns[-1], "y")
+        self.assertEqual(len(self.matchups.columns), 2 + 4 * len(builder.feature_cols))
+
+    def test_fighter_a_is_the_fights_first_row(self):
+        f1, f2 = self.matchups.iloc[0], self.matchups.iloc[1]
+        self.assertEqual((f1["muay_thai_A"], f1["muay_thai_B"], f1["y"]), (1.0, 2.0, 1))
+        self.assertEqual((f2["muay_thai_A"], f2["muay_thai_B"], f2["y"]), (3.0, 4.0, 0))
+        self.assertAlmostEqual(f2["boxing_diff"], 3.1 - 4.1)
+        self.assertAlmostEqual(f2["boxing_inter"], 3.1 * 4.1)
+
+    def test_mirror_swaps_fighters(self):
+        mirrored = builder.mirror_matchups(self.matchups)
+        f2 = mirrored.iloc[1]
+        self.assertEqual((f2["muay_thai_A"], f2["muay_thai_B"], f2["y"]), (4.0, 3.0, 1))
+        self.assertAlmostEqual(f2["boxing_diff"], 4.1 - 3.1)
+        self.assertAlmostEqual(f2["boxing_inter"], 3.1 * 4.1)
+        pd.testing.assert_frame_equal(builder.mirror_matchups(mirrored), self.matchups)
+
+    def test_training_matrix_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            npy_path = str(Path(tmp) / "matchups.npy")
+            builder.save_training_matrix(self.matchups, npy_path)
+            matrix, columns = builder.load_training_matrix(npy_path)
+
+            self.assertEqual(columns, [c for c in self.matchups.columns if c != "fight_id"])
+            self.assertEqual(matrix.dtype, np.float32)
+            self.assertEqual(matrix.shape, (2, len(columns)))
+            np.testing.assert_array_equal(matrix, self.matchups[columns].to_numpy(dtype=np.float32))
+            del matrix
+
+    def test_build_writes_csv_and_matrix(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            outcome_vectors().assign(event_date=pd.Timestamp.today().strftime("%Y-%m-%d")).to_csv(root / "outcome.csv", index=False)
+            match_df = builder.build_outcome_training_vectors(str(root / "outcome.csv"), str(root / "training.csv"), str(root / "training.npy"))
+
+            self.assertEqual(match_df["fight_id"].tolist(), ["f1", "f2", "f4"])
+            pd.testing.assert_frame_equal(pd.read_csv(root / "training.csv"), match_df)
+            matrix, _ = builder.load_training_matrix(str(root / "training.npy"))
+            self.assertEqual(len(matrix), 3)
+            del matrix
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from cache.FightIndex import FightIndex
+from model.style import FightVectorCleaner as cleaner
+
+FIXTURE_DIR = Path(__file__).resolve().parents[3] / "resources" / "clean"
+
+
+class StubPredictor:
+    """Styles are the first four features, so each output row shows which input row it came from."""
+
+    def __init__(self):
+        self.batches = []
+
+    def predict_batch(self, features: np.ndarray) -> np.ndarray:
+        self.batches.append(features)
+        return np.asarray(features)[:, :4].astype(np.float32)
+
+
+def fight_vector(fighter_id: str, fighter: str, day_before: str, seed: float, total_fights: int = 3, win: bool = True) -> dict:
+    row = {"fighter": fighter, "fighter_id": fighter_id, "event_date": day_before, "weight_class": "Lightweight",
+           "win_rate": 0.5, "total_fights": total_fights, "current_streak": 1}
+    row.update({col: seed + i / 100 for i, col in enumerate(cleaner.feature_cols)})
+    row["win"] = win
+    return row
+
+
+class FightVectorCleanerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.index = FightIndex.from_csv(str(FIXTURE_DIR / "events.csv"), str(FIXTURE_DIR / "events-info.csv"), str(FIXTURE_DIR / "fights.csv"))
+        self.predictor = StubPredictor()
+
+    def test_styles_line_up_after_the_merge_and_found_filter(self):
+        fight_vectors = pd.DataFrame([
+            fight_vector("bc8f6b42767e28df", "Naoyuki Kotani", "2015-09-25", 1.0, win=False),
+            # No fight on this date, so the row is dropped after the styles are computed
+            fight_vector("bc8f6b42767e28df", "Naoyuki Kotani", "2015-09-26", 2.0),
+            fight_vector("633a45d131192ffe", "Kajan Johnson", "2015-09-25", 3.0, total_fights=12),
+            fight_vector("e13abac8089a801a", "Fighter E", "2020-02-07", 4.0),
+        ])
+        outcome = cleaner.buildOutcomeVectors(fight_vectors, predictor=self.predictor, index=self.index)
+
+        self.assertEqual(len(self.predictor.batches), 1)
+        self.assertEqual(len(self.predictor.batches[0]), 4)
+        self.assertEqual(outcome["fighter_id"].tolist(), ["bc8f6b42767e28df", "633a45d131192ffe", "e13abac8089a801a"])
+        self.assertEqual(outcome["fight_id"].tolist(), ["b82b243982fcb2ac", "b82b243982fcb2ac", "57961c6adebfb13d"])
+        self.assertEqual(outcome["event_date"].tolist(), ["2015-09-26", "2015-09-26", "2020-02-08"])
+        np.testing.assert_allclose(outcome["muay_thai"], [1.0, 3.0, 4.0], rtol=1e-6)
+        np.testing.assert_allclose(outcome["grappling"], [1.03, 3.03, 4.03], rtol=1e-6)
+        np.testing.assert_allclose(outcome["pace"], [2.01, 6.01, 8.01], rtol=1e-6)
+        self.assertEqual(outcome["n_fights_norm"].tolist(), [0.3, 1.0, 0.3])
+        self.assertEqual(outcome["win"].tolist(), [0, 1, 1])
+
+    def test_normalize_number_of_fights(self):
+        self.assertEqual(cleaner.normalizeNumberOfFights(4), 0.4)
+        self.assertEqual(cleaner.normalizeNumberOfFights("15"), 1.0)
+        self.assertEqual(cleaner.normalizeNumberOfFights(pd.Series([0, 10, 11])).tolist(), [0.0, 1.0, 1.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
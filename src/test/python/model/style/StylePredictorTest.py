@@ -0,0 +1,36 @@
+import importlib.util
+import unittest
+
+import numpy as np
+
+from model.style import FightVectorCleaner as cleaner
+
+HAS_MODEL_DEPS = all(importlib.util.find_spec(name) for name in ("torch", "joblib", "sklearn"))
+
+
+@unittest.skipUnless(HAS_MODEL_DEPS, "needs torch, joblib and scikit-learn")
+class StylePredictorTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        from style.StylePredictor import StylePredictor
+        cls.predictor = StylePredictor()
+
+    def test_predict_batch_matches_predict(self):
+        rng = np.random.default_rng(7)
+        features = rng.gamma(2.0, 1.0, size=(20, len(cleaner.feature_cols)))
+        # Several forward passes, the last one partial
+        self.predictor.BATCH_SIZE = 7
+        try:
+            batch = self.predictor.predict_batch(features)
+        finally:
+            del self.predictor.BATCH_SIZE
+
+        self.assertEqual(batch.shape, (20, 4))
+        for row, styles in zip(features, batch):
+            np.testing.assert_allclose(styles, self.predictor.predict(row.tolist())[0], rtol=1e-5, atol=1e-6)
+        self.assertEqual(self.predictor.predict_batch(features[:0]).shape, (0, 4))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from scripts.backfill import PROGRESS_FILE, Backfill, format_duration
+
+EVENTS = [
+    {"event_id": "e1", "event_name": "UFC 1", "event_date": "January 06, 2024", "event_location": "", "event_url": ""},
+    {"event_id": "e2", "event_name": "UFC 2", "event_date": "February 03, 2024", "event_location": "", "event_url": ""},
+    {"event_id": "e3", "event_name": "UFC 3", "event_date": "March 02, 2024", "event_location": "", "event_url": ""},
+    # Every bout on this card was cancelled, so its page has no fight ids
+    {"event_id": "e4", "event_name": "UFC 4", "event_date": "April 06, 2024", "event_location": "", "event_url": ""},
+    {"event_id": "e9", "event_name": "UFC 9", "event_date": "January 01, 2099", "event_location": "", "event_url": ""},
+]
+CARDS = {
+    "e1": ["f1", "f2"],
+    "e2": ["f3"],
+    "e3": ["f4", "f5"],
+    "e4": [],
+}
+
+
+class FakeScraper:
+    """Serves EVENTS and CARDS, records every id fetched, and can fail chosen fights."""
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.event_fetches = []
+        self.fight_fetches = []
+
+    def scrape_all_events(self):
+        return list(EVENTS)
+
+    def scrape_event_infos(self, event_ids):
+        self.event_fetches.extend(event_ids)
+        return {
+            e: [{"event_id": e, "fight_id": f, "winner_name": "A", "loser_name": "B"} for f in CARDS[e]]
+            + [{"event_id": e, "fight_id": "", "winner_name": "C", "loser_name": "D"}]
+            for e in event_ids
+        }
+
+    def scrape_fight_infos(self, fight_ids):
+        self.fight_fetches.extend(fight_ids)
+        return {
+            f: [] if f in self.failing else [{"fight_id": f, "fighter_id": f"{f}-a", "fighter": "A"},
+                                               {"fight_id": f, "fighter_id": f"{f}-b", "fighter": "B"}]
+            for f in fight_ids
+        }
+
+
+class BackfillTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.out_dir = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def run_backfill(self, scraper):
+        return Backfill(self.out_dir, shard_size=2, scraper=scraper).run()
+
+    def progress(self):
+        return json.loads((self.out_dir / PROGRESS_FILE).read_text(encoding="utf-8"))
+
+    def fight_rows(self):
+        return (self.out_dir / "fights.csv").read_text(encoding="utf-8").splitlines()[1:]
+
+    def test_full_run(self):
+        self.assertTrue(self.run_backfill(FakeScraper()))
+        progress = self.progress()
+        # e4 has no completed fights but its page was saved, so it is done too
+        self.assertEqual(progress["events_done"], ["e1", "e2", "e3", "e4"])
+        self.assertEqual(progress["fights_done"], ["f1", "f2", "f3", "f4", "f5"])
+        self.assertEqual(len(self.fight_rows()), 10)
+
+    def test_resume_fetches_only_unfinished_work(self):
+        first = FakeScraper(failing={"f4"})
+        self.assertFalse(self.run_backfill(first))
+        progress = self.progress()
+        self.assertEqual(progress["events_done"], ["e1", "e2", "e4"])
+        self.assertEqual(progress["failed"], {"f4": "no fight stats returned"})
+
+        second = FakeScraper()
+        self.assertTrue(self.run_backfill(second))
+        # e3's info is already on disk; only its missing fight is fetched
+        self.assertEqual(second.event_fetches, [])
+        self.assertEqual(second.fight_fetches, ["f4"])
+        self.assertEqual(self.progress()["events_done"], ["e1", "e2", "e3", "e4"])
+        self.assertEqual(self.progress()["failed"], {})
+        self.assertEqual(len(self.fight_rows()), 10)
+
+    def test_crash_before_checkpoint(self):
+        self.assertTrue(self.run_backfill(FakeScraper()))
+        # Rows written but the checkpoint lost: nothing is fetched or written twice
+        (self.out_dir / PROGRESS_FILE).unlink()
+        again = FakeScraper()
+        self.assertTrue(self.run_backfill(again))
+        self.assertEqual((again.event_fetches, again.fight_fetches), (["e4"], []))
+        self.assertEqual(len(self.fight_rows()), 10)
+        self.assertEqual(self.progress()["events_done"], ["e1", "e2", "e3", "e4"])
+
+    def test_format_duration(self):
+        self.assertEqual(format_duration(3725), "01:02:05")
+        self.assertEqual(format_duration(2 * 86400 + 3725), "2d 01:02:05")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+import unittest
+from pathlib import Path
+
+from scripts import standin_server as standin
+
+REPO_ROOT = Path(__file__).resolve().parents[4]
+
+# The scrapers read UFCSTATS_BASE_URL at import, so they run in a fresh interpreter
+SCRAPE = """
+import json, sys
+from scrapers.ScraperUtil import get_session
+from scrapers.EventScraper import scrape_completed_events
+from scrapers.EventInfoScraper import scrape_event_fights
+from scrapers.FightDataScraper import scrape_fight_totals_by_id
+
+session = get_session()
+fight = scrape_fight_totals_by_id(session, sys.argv[1])
+events = scrape_completed_events(session)
+fights = scrape_event_fights(session, sys.argv[2])
+print(json.dumps({
+    "fighters": [row["fighter"] for row in fight],
+    "events": [e["event_id"] for e in events],
+    "fight_ids": [row["fight_id"] for row in fights],
+}))
+"""
+
+
+class StandinServerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.world = standin.World(events=3, fights_per_event=2, upcoming=1, seed=7)
+        self.server = standin.make_server(self.world, "127.0.0.1", 0)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_fight_resolves_before_its_event_is_built(self):
+        world = standin.World(events=3, fights_per_event=2, upcoming=1, seed=7)
+        bout = self.world.bouts(self.world.events[-1].event_id)[1]
+        self.assertEqual(world.bout(bout.fight_id), bout)
+        self.assertIsNone(world.bout("0" * 16))
+
+    def test_scrapers_read_the_standin(self):
+        event = self.world.events[-1]
+        bout = self.world.bouts(event.event_id)[1]
+        env = dict(os.environ, UFCSTATS_BASE_URL=standin.StandinHandler.pages.base_url, PYTHONPATH=str(REPO_ROOT / "data"),
+                   SCRAPE_POLITE_DELAY="0", SCRAPE_CACHE="off")
+        out = subprocess.run([sys.executable, "-c", SCRAPE, bout.fight_id, event.event_id], env=env, cwd=str(REPO_ROOT),
+                             capture_output=True, text=True, timeout=60)
+        self.assertEqual(out.returncode, 0, out.stderr)
+        scraped = json.loads(out.stdout.strip().splitlines()[-1])
+
+        self.assertEqual(scraped["fighters"], [bout.fighter_a[1], bout.fighter_b[1]])
+        self.assertIn(event.event_id, scraped["events"])
+        self.assertEqual(scraped["fight_ids"], [b.fight_id for b in self.world.bouts(event.event_id)])
+
+
+if __name__ == "__main__":
+    unittest.main()